@@ -0,0 +1,76 @@
+import os
+
+import pandas as pd
+import streamlit as st
+
+from utils import admin, memo, workers
+from utils.assets import cache_stats
+from utils.timing import METRICS_PATH, prometheus_text, snapshot, write_prometheus
+
+st.set_page_config(page_title="🛠️ Admin - Rerun Timings", layout="wide")
+
+st.markdown("# 🛠️ Rerun Timings")
+
+# Admin only: the token comes from the server environment
+if not admin.configured_token():
+    st.info("🔒 Admin page disabled. Set `SUSTAINAPP_ADMIN_TOKEN` on the server to enable it.")
+    st.stop()
+
+if not admin.is_admin():
+    entered = st.text_input("🔑 Admin token", type="password")
+    if entered and admin.matches(entered):
+        st.session_state.admin_token = entered
+        st.rerun()
+    elif entered:
+        st.error("❌ Wrong token")
+    st.stop()
+st.session_state.admin_token = admin.given_token()
+
+rows = snapshot()
+if not rows:
+    st.info("📭 No reruns recorded in this process yet. Open a few pages first.")
+else:
+    st.markdown(f"Per-section render time over the last reruns of each section (process {os.getpid()}).")
+    df = pd.DataFrame(rows)
+    pages = ["All", *sorted(df["page"].unique())]
+    page = st.selectbox("📄 Page", pages)
+    if page != "All":
+        df = df[df["page"] == page]
+    st.dataframe(df.sort_values("p95_ms", ascending=False), use_container_width=True, hide_index=True)
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.download_button("⬇️ Prometheus metrics", prometheus_text(), file_name="metrics.prom", mime="text/plain")
+with col2:
+    if st.button("💾 Write metrics file now"):
+        write_prometheus()
+        st.success(f"✅ Written to `{METRICS_PATH}`")
+with col3:
+    stats = cache_stats()
+    st.metric("Image cache", f"{stats['bytes'] / 2**20:.1f} MiB", f"{stats['entries']} entries", delta_color="off")
+
+st.markdown("### ⚙️ Simulation Worker Pool")
+pool = workers.stats()
+cols = st.columns(5)
+cols[0].metric("Workers", pool["workers"])
+cols[1].metric("Running", pool["running"])
+cols[2].metric("Queued", pool["queued"], f"peak in flight {pool['peak_in_flight']}", delta_color="off")
+cols[3].metric("Jobs", f"{pool['completed']:,}", f"{pool['failed']:,} failed", delta_color="off")
+finished = pool["completed"] + pool["failed"]
+cols[4].metric(
+    "Coalesced requests", f"{pool['coalesced']:,}",
+    f"mean latency {pool['latency_seconds'] / finished * 1000:.0f} ms" if finished else None, delta_color="off",
+)
+
+st.markdown("### 💾 Simulation Result Cache")
+cache = memo.store().stats()
+lookups = cache["hits"] + cache["misses"]
+cols = st.columns(4)
+cols[0].metric("Entries", f"{cache['entries']:,}")
+cols[1].metric("Size", f"{cache['bytes'] / 2**20:.1f} MiB", f"of {cache['max_bytes'] / 2**20:,.0f} MiB", delta_color="off")
+cols[2].metric("Hit rate", f"{cache['hits'] / lookups:.0%}" if lookups else "–",
+               f"{cache['hits']:,} hits, {cache['misses']:,} misses", delta_color="off")
+cols[3].metric("Evictions", f"{cache['evictions']:,}")
+
+st.markdown("---")
+st.markdown("Add `?profile=1` to any page URL to profile that rerun and see its call tree.")
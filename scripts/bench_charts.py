@@ -0,0 +1,115 @@
+"""Measure chart payload size and downsampling cost for long time series.
+
+Usage:
+    python -m scripts.bench_charts [--points 800] [--json report.json] [--html bench.html]
+
+For each long series the tools chart (a year of hourly dispatch, a year of
+1-minute irradiance, 60 years of daily inflow) this serializes the frame
+Streamlit would send, as Arrow IPC like st.vega_lite_chart does, once with
+every point and once downsampled by utils.charts with LTTB and min-max,
+and reports bytes and server time. --html writes a page that draws each
+variant with vega-embed and prints its render time in the browser console
+and on the page, for measuring the client side.
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from utils import charts, dispatch, hydro, mppt
+
+
+def _arrow_bytes(frame):
+    sink = pa.BufferOutputStream()
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().size
+
+
+def _series():
+    result = dispatch.dispatch(dispatch.Mix(), hourly=True)
+    irradiance, _ = mppt.cached_year(0, 0.3, 20.0)
+    inflow = hydro.cached_inflow(60, 500.0, 0)
+    return {
+        "dispatch (8,760 h × 3)": (np.arange(dispatch.HOURS), {
+            "Load": result.hourly["load"][:, 0],
+            "Solar + wind": result.hourly["solar"][:, 0] + result.hourly["wind"][:, 0],
+            "Unmet": result.hourly["unmet"][:, 0],
+        }),
+        "irradiance (525,600 min)": (np.arange(irradiance.size) / mppt.MINUTES_PER_DAY,
+                                     {"Irradiance": irradiance.ravel()}),
+        "inflow (60 y daily)": (np.arange(len(inflow)) / 365.25, {"Inflow": inflow}),
+    }
+
+
+def _measure(x, series, method, points):
+    start = time.perf_counter()
+    if method == "raw":
+        frame = pd.DataFrame({
+            "x": np.tile(x, len(series)),
+            "series": np.repeat(list(series), len(x)),
+            "value": np.concatenate(list(series.values())),
+        })
+    else:
+        frame = charts.downsample(x, series, points, method)
+    seconds = time.perf_counter() - start
+    return frame, {"method": method, "points": len(frame), "bytes": _arrow_bytes(frame),
+                   "seconds": round(seconds, 6)}
+
+
+_HTML = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Chart render benchmark</title>
+<script src="https://cdn.jsdelivr.net/npm/vega@5"></script>
+<script src="https://cdn.jsdelivr.net/npm/vega-lite@5"></script>
+<script src="https://cdn.jsdelivr.net/npm/vega-embed@6"></script></head>
+<body><pre id="log"></pre><script>
+const cases = %s;
+(async () => {
+  for (const c of cases) {
+    const div = document.createElement("div");
+    document.body.appendChild(div);
+    const t0 = performance.now();
+    await vegaEmbed(div, {...c.spec, width: 800, data: {values: c.values}}, {renderer: "canvas"});
+    const line = `${c.name} ${c.method}: ${c.values.length} points, ${(performance.now() - t0).toFixed(1)} ms`;
+    console.log(line);
+    document.getElementById("log").textContent += line + "\\n";
+  }
+})();
+</script></body></html>
+"""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=charts.DEFAULT_POINTS, help="target points per series")
+    parser.add_argument("--json", help="also write the report to this file")
+    parser.add_argument("--html", help="write a browser render benchmark page to this file")
+    args = parser.parse_args(argv)
+
+    report, cases = [], []
+    for name, (x, series) in _series().items():
+        print(f"📈 {name}")
+        for method in ("raw", "lttb", "minmax"):
+            frame, row = _measure(x, series, method, args.points)
+            report.append({"series": name, **row})
+            print(f"   {method:<7} {row['points']:>9,} points  {row['bytes'] / 1024:>9,.1f} KiB  "
+                  f"{row['seconds'] * 1000:>7.1f} ms")
+            cases.append({"name": name, "method": method, "spec": charts.spec("x", "value"),
+                          "values": frame.astype({"x": float, "value": float}).to_dict("records")})
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    if args.html:
+        with open(args.html, "w", encoding="utf-8") as fh:
+            fh.write(_HTML % json.dumps(cases))
+        print(f"🌐 Open {args.html} in a browser for render times")
+
+
+if __name__ == "__main__":
+    main()
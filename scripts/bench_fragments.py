@@ -0,0 +1,151 @@
+"""Compare full-page reruns against fragment reruns for each system page.
+
+Usage:
+    python -m scripts.bench_fragments [--repeat 20] [--json out.json]
+
+Runs every page headless through Streamlit's AppTest runner, performs each
+interaction (select a component, change the assembly order, submit, ask
+for a hint) and measures the rerun wall time and the number of deltas the
+server would push over the websocket. Each interaction is timed twice: as a
+whole-script rerun, which is what every click cost before the sections
+became fragments, and as the fragment rerun the browser now requests.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+
+from streamlit.runtime.scriptrunner import ScriptRunnerEvent
+from streamlit.runtime.scriptrunner_utils.script_requests import RerunData, ScriptRequests
+from streamlit.testing.v1 import AppTest, app_test
+from streamlit.testing.v1.element_tree import parse_tree_from_messages
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner, require_widgets_deltas
+
+from utils.catalog import load_catalog
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _FragmentRunner(LocalScriptRunner):
+    """LocalScriptRunner that can target a single fragment, like the browser does."""
+
+    fragment_id = None
+    last = None
+
+    def run(self, widget_state=None, query_params=None, timeout=3, page_hash=""):
+        _FragmentRunner.last = self
+        rerun_data = RerunData(
+            widget_states=widget_state,
+            page_script_hash=page_hash,
+            fragment_id_queue=[self.fragment_id] if self.fragment_id else [],
+        )
+        # The base runner queues a full-app rerun on construction, which would
+        # swallow the fragment request; start from an empty request queue
+        self._requests = ScriptRequests()
+        self.request_rerun(rerun_data)
+        try:
+            if not self._script_thread:
+                self.start()
+            require_widgets_deltas(self, timeout)
+        finally:
+            self.join()
+        return parse_tree_from_messages(self.forward_msgs())
+
+
+app_test.LocalScriptRunner = _FragmentRunner
+
+
+def _fragment_ids(msgs):
+    """Map widget labels to the fragment that rendered them."""
+    ids = {}
+    for msg in msgs:
+        if msg.WhichOneof("type") != "delta" or not msg.delta.fragment_id:
+            continue
+        element = msg.delta.new_element
+        kind = element.WhichOneof("type")
+        label = getattr(getattr(element, kind), "label", None) if kind else None
+        if label:
+            ids[label] = msg.delta.fragment_id
+    return ids
+
+
+def _delta_count(runner):
+    """Count the deltas enqueued for the browser during the runner's last run."""
+    return sum(
+        1 for event, data in zip(runner.events, runner.event_data)
+        if event == ScriptRunnerEvent.ENQUEUE_FORWARD_MSG and data["forward_msg"].WhichOneof("type") == "delta"
+    )
+
+
+def _interactions(system):
+    wrong = list(system.correct_order[:3][::-1])
+    return {
+        "select component": ("🔍 Select Component for Detailed Analysis:",
+                             lambda at: at.selectbox[0].select(system.component_names[-1])),
+        "build order": (system.assembly.label, lambda at: at.multiselect[0].set_value(wrong)),
+        "submit": (system.assembly.submit_label, lambda at: _click(at, system.assembly.submit_label)),
+        "hint": (system.assembly.hint_label, lambda at: _click(at, system.assembly.hint_label)),
+    }
+
+
+def _click(at, label):
+    for button in at.button:
+        if button.label == label:
+            return button.click()
+    raise LookupError(label)
+
+
+def measure(system, interaction, label, act, scoped):
+    at = AppTest.from_file(os.path.join(ROOT, system.page_path), default_timeout=30)
+    _FragmentRunner.fragment_id = None
+    at.run()
+    fragment_id = _fragment_ids(_FragmentRunner.last.forward_msgs()).get(label)
+    if scoped and fragment_id is None:
+        raise LookupError(f"{system.key}/{interaction}: no fragment renders {label!r}")
+
+    act(at)
+    _FragmentRunner.fragment_id = fragment_id if scoped else None
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+    _FragmentRunner.fragment_id = None
+    if at.exception:
+        raise RuntimeError(f"{system.key}/{interaction}: {at.exception[0].value}")
+    return elapsed * 1000, _delta_count(_FragmentRunner.last)
+
+
+def run(repeat):
+    results = []
+    for system in load_catalog():
+        for interaction, (label, act) in _interactions(system).items():
+            row = {"page": system.page, "interaction": interaction}
+            for mode, scoped in (("full", False), ("fragment", True)):
+                samples = [measure(system, interaction, label, act, scoped) for _ in range(repeat)]
+                row[f"{mode}_ms"] = round(statistics.median(s[0] for s in samples), 2)
+                row[f"{mode}_deltas"] = samples[-1][1]
+            results.append(row)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="samples per interaction")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat)
+
+    print(f"{'page':<10} {'interaction':<17} {'full ms':>8} {'frag ms':>8} {'full Δ':>7} {'frag Δ':>7}")
+    for r in results:
+        print(f"{r['page']:<10} {r['interaction']:<17} {r['full_ms']:>8.2f} {r['fragment_ms']:>8.2f} "
+              f"{r['full_deltas']:>7} {r['fragment_deltas']:>7}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Build compressed, multi-resolution variants of the diagrams under images/.
+
+Usage:
+    python -m scripts.build_images [--avif] [--quality 80]
+
+Each PNG/JPEG is encoded as WebP (and optionally AVIF) at the fixed widths
+below, named by a hash of the source content, and written to static/images/
+together with a manifest.json. utils.assets reads the manifest and links the
+smallest WebP variant that fits the column being rendered, offering the AVIF
+one first in a <picture> when it was built.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+
+from PIL import Image, features
+
+from utils.assets import BUILD_DIR, COMPONENT_WIDTH, MANIFEST_PATH, OVERVIEW_WIDTH, ROOT
+
+SOURCE_DIR = os.path.join(ROOT, "images")
+SOURCE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+WIDTHS = sorted({320, COMPONENT_WIDTH, OVERVIEW_WIDTH, 1200, 1600})
+
+
+def content_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def find_sources(root=SOURCE_DIR):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.lower().endswith(SOURCE_EXTENSIONS):
+                yield os.path.join(dirpath, name)
+
+
+def target_widths(source_width):
+    widths = [w for w in WIDTHS if w < source_width]
+    # Always keep one variant at (up to) full resolution
+    widths.append(min(source_width, WIDTHS[-1]))
+    return sorted(set(widths))
+
+
+def build_image(path, formats, quality):
+    digest = content_hash(path)
+    stem = os.path.splitext(os.path.relpath(path, SOURCE_DIR))[0].replace(os.sep, "_")
+    variants = []
+
+    with Image.open(path) as src:
+        src.load()
+        img = src.convert("RGBA") if src.mode not in ("RGB", "RGBA") else src
+        for width in target_widths(img.width):
+            height = round(img.height * width / img.width)
+            resized = img if width == img.width else img.resize((width, height), Image.LANCZOS)
+            for fmt in formats:
+                file_name = f"{stem}.{digest}.{width}.{fmt}"
+                out_path = os.path.join(BUILD_DIR, file_name)
+                if not os.path.exists(out_path):
+                    resized.save(out_path, format=fmt.upper(), quality=quality)
+                variants.append({
+                    "file": file_name,
+                    "format": fmt,
+                    "width": width,
+                    "height": height,
+                    "bytes": os.path.getsize(out_path),
+                })
+
+    return {"hash": digest, "source_bytes": os.path.getsize(path), "variants": variants}
+
+
+def build_all(formats=("webp",), quality=80):
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    manifest = {}
+    for path in find_sources():
+        # Keyed like the pages refer to the sources: relative to the repo root
+        key = os.path.relpath(path, ROOT).replace(os.sep, "/")
+        manifest[key] = build_image(path, formats, quality)
+
+    # Drop variants of images that changed or were removed
+    keep = {v["file"] for entry in manifest.values() for v in entry["variants"]}
+    for name in os.listdir(BUILD_DIR):
+        if name != os.path.basename(MANIFEST_PATH) and name not in keep:
+            os.remove(os.path.join(BUILD_DIR, name))
+
+    tmp_path = MANIFEST_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_PATH)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--avif", action="store_true", help="also emit AVIF variants")
+    parser.add_argument("--quality", type=int, default=80, help="encoder quality (0-100)")
+    args = parser.parse_args(argv)
+
+    formats = ["webp"]
+    if args.avif:
+        if features.check("avif"):
+            formats.append("avif")
+        else:
+            print("⚠️ AVIF support not available in this Pillow build, skipping")
+
+    manifest = build_all(formats, args.quality)
+    source_total = sum(e["source_bytes"] for e in manifest.values())
+    built_total = sum(min(v["bytes"] for v in e["variants"]) for e in manifest.values() if e["variants"])
+    print(f"✅ Built {len(manifest)} images -> {MANIFEST_PATH}")
+    print(f"   Source: {source_total / 1024:.0f} KiB, smallest variants: {built_total / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Precompute the model lookup tables read by the interactive tools.
+
+Usage:
+    python -m scripts.build_tables [--only pv_iv] [--out data/tables] [--samples 20000]
+    python -m scripts.build_tables --check
+
+Each table in utils.tables.SPECS is evaluated over its grid with the model
+code itself, checked against the exact model at random points, and written
+as float32 .npy files plus a meta.json recording the axes, the model source
+hash and the measured error bounds over the queries the table answers (the
+pitch table leaves some cells to the solver). The server maps them
+read-only at startup; tables that are missing or older than their model are
+ignored and the tools solve exactly. --check only reports which tables are current.
+"""
+
+import argparse
+import json
+import time
+
+from utils import tables
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", action="append", choices=list(tables.SPECS), help="table to build (repeatable)")
+    parser.add_argument("--out", default=tables.TABLE_DIR, help="output directory")
+    parser.add_argument("--samples", type=int, default=tables.ERROR_SAMPLES, help="random points for the error check")
+    parser.add_argument("--check", action="store_true", help="report table status without building")
+    parser.add_argument("--json", help="also write the build report to this file")
+    args = parser.parse_args(argv)
+
+    names = args.only or list(tables.SPECS)
+    if args.check:
+        for name in names:
+            table = tables.load(name, args.out)
+            print(f"{'✅' if table else '❌'} {name}: {'current' if table else 'missing or stale'}")
+        return
+
+    report = []
+    start = time.perf_counter()
+    for name in names:
+        meta = tables.build(name, args.out, args.samples)
+        report.append(meta)
+        shape = " × ".join(str(axis[3]) for axis in meta["axes"])
+        print(f"📐 {name}: {shape} grid, {meta['bytes'] / 2**20:.1f} MiB in {meta['build_seconds']:.2f} s")
+        for field, error in meta["errors"].items():
+            print(f"   {field:<10} max |error| {error['max_abs']:.3g}  p99 {error['p99_abs']:.3g}  "
+                  f"(values up to {error['scale']:.3g}, served on {error['served']:.0%} of the grid)")
+    print(f"✅ {len(report)} tables written to {args.out} in {time.perf_counter() - start:.1f} s")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Grade a file of assembly submissions collected outside the app.
+
+Usage:
+    python -m scripts.grade_submissions submissions.jsonl -o scores.csv
+    python -m scripts.grade_submissions submissions.csv -o scores.csv --workers 8
+
+Input rows carry a student id, a system and the submitted order:
+
+- JSONL: {"student": "s01", "system": "solar", "order": ["...", "..."]}
+- CSV:   a header with student,system,order columns; the order is one field
+  with components separated by ``|`` (see --order-sep)
+
+The system may be given as its catalog key (solar), page (1_Solar) or name
+(Solar PV). Orders are graded with utils.grading against the same
+correct_order the pages use. The output has one row per student with the
+best score per system, total_score and systems_completed, like the home page.
+
+The input is read in blocks of lines and graded in a process pool, so
+memory stays flat however long the file is. CSV fields must not contain
+embedded newlines.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from utils.catalog import load_catalog
+from utils.grading import PAD, grade_indices
+
+BLOCK_LINES = 50_000
+
+_decode_json = json.JSONDecoder().decode
+
+
+def _system_lookup(catalog):
+    lookup = {}
+    for i, system in enumerate(catalog):
+        for alias in (system.key, system.page, system.name, system.title):
+            lookup[alias.lower()] = i
+    return lookup
+
+
+def _parse_row(line, fmt, columns, order_sep):
+    if fmt == "jsonl":
+        row = _decode_json(line)
+        return row["student"], row["system"], row["order"]
+    record = dict(zip(columns, next(csv.reader([line]))))
+    order = [part.strip() for part in record["order"].split(order_sep) if part.strip()]
+    return record["student"], record["system"], order
+
+
+def grade_block(lines, fmt, columns=None, order_sep="|"):
+    """Parse and grade one block of input lines.
+
+    Returns (students, system_index, score, errors) where errors is a list of
+    (line offset, message) for rows that could not be graded.
+    """
+    catalog = load_catalog()
+    lookup = _system_lookup(catalog)
+    indexes = [{name: i for i, name in enumerate(s.correct_order)} for s in catalog]
+    sizes = [len(s.correct_order) for s in catalog]
+
+    # Per system: student ids and a flat, PAD-filled list of index rows
+    per_system = [([], []) for _ in catalog]
+    pads = [[PAD] * n for n in sizes]
+    errors = []
+    for offset, line in enumerate(lines):
+        if not line.strip():
+            continue
+        try:
+            student, system, order = _parse_row(line, fmt, columns, order_sep)
+        except (ValueError, KeyError, TypeError, StopIteration) as exc:
+            errors.append((offset, f"unreadable row: {exc!r}"))
+            continue
+
+        sys_index = lookup.get(str(system).lower())
+        if sys_index is None:
+            errors.append((offset, f"unknown system {system!r}"))
+            continue
+        index = indexes[sys_index]
+        try:
+            encoded = [index[name] for name in order]
+        except (KeyError, TypeError):
+            errors.append((offset, f"unknown component in order for {system!r}"))
+            continue
+        if len(set(encoded)) != len(encoded):
+            errors.append((offset, "order repeats a component"))
+            continue
+        names, flat = per_system[sys_index]
+        names.append(str(student))
+        flat.extend(encoded)
+        flat.extend(pads[sys_index][len(encoded):])
+
+    students, systems, scores = [], [], []
+    for sys_index, (names, flat) in enumerate(per_system):
+        if not names:
+            continue
+        batch = np.array(flat, dtype=np.int32).reshape(len(names), sizes[sys_index])
+        students.extend(names)
+        systems.append(np.full(len(names), sys_index, dtype=np.int16))
+        scores.append(grade_indices(batch)["score"].astype(np.int16))
+
+    if scores:
+        return students, np.concatenate(systems), np.concatenate(scores), errors
+    return students, np.empty(0, np.int16), np.empty(0, np.int16), errors
+
+
+def read_blocks(fh, block_lines=BLOCK_LINES):
+    block = []
+    for line in fh:
+        block.append(line)
+        if len(block) >= block_lines:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def grade_file(path, fmt=None, order_sep="|", workers=None, block_lines=BLOCK_LINES, on_error=None):
+    """Stream ``path`` through a process pool; return {student: best score per system}."""
+    catalog = load_catalog()
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    workers = workers or os.cpu_count() or 1
+    best = {}
+    max_pending = workers * 2
+
+    with open(path, encoding="utf-8", newline="") as fh:
+        columns = None
+        if fmt == "csv":
+            columns = [c.strip() for c in next(csv.reader([fh.readline()]))]
+            missing = {"student", "system", "order"} - set(columns)
+            if missing:
+                raise ValueError(f"CSV header is missing column(s): {', '.join(sorted(missing))}")
+
+        def collect(future, first_line):
+            students, systems, scores, errors = future.result()
+            for student, sys_index, score in zip(students, systems.tolist(), scores.tolist()):
+                row = best.get(student)
+                if row is None:
+                    row = best[student] = [0] * len(catalog)
+                if score > row[sys_index]:
+                    row[sys_index] = score
+            if on_error is not None:
+                for offset, message in errors:
+                    on_error(first_line + offset, message)
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = []
+            line_no = 2 if fmt == "csv" else 1
+            for block in read_blocks(fh, block_lines):
+                pending.append((pool.submit(grade_block, block, fmt, columns, order_sep), line_no))
+                line_no += len(block)
+                # Bound the number of blocks in flight so memory stays flat
+                if len(pending) >= max_pending:
+                    collect(*pending.pop(0))
+            for future, first_line in pending:
+                collect(future, first_line)
+
+    return best
+
+
+def write_scores(best, out):
+    catalog = load_catalog()
+    writer = csv.writer(out)
+    writer.writerow(["student", *(f"{s.key}_score" for s in catalog), "total_score", "systems_completed"])
+    for student in sorted(best):
+        scores = best[student]
+        completed = sum(1 for score in scores if score == 100)
+        writer.writerow([student, *scores, sum(scores), completed])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="JSONL or CSV file of submissions")
+    parser.add_argument("-o", "--output", help="write per-student scores here (default: stdout)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="input format (default: from extension)")
+    parser.add_argument("--order-sep", default="|", help="component separator in CSV orders")
+    parser.add_argument("--workers", type=int, help="grading processes (default: CPU count)")
+    parser.add_argument("--block-lines", type=int, default=BLOCK_LINES, help="lines per work unit")
+    args = parser.parse_args(argv)
+
+    errors = 0
+
+    def report(line, message):
+        nonlocal errors
+        errors += 1
+        if errors <= 20:
+            print(f"⚠️ line {line}: {message}", file=sys.stderr)
+
+    best = grade_file(args.input, args.format, args.order_sep, args.workers, args.block_lines, report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as out:
+            write_scores(best, out)
+    else:
+        write_scores(best, sys.stdout)
+
+    print(f"✅ Graded {len(best)} students ({errors} rows skipped)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Parse measured solar, wind or inflow CSV files into the columnar cache.
+
+Usage:
+    python -m scripts.ingest tmy.csv --kind solar
+    python -m scripts.ingest logs/*.csv --kind wind [--unit speed=km/h] [--step-minutes 10] [--json out.json]
+
+Each file is parsed once in chunks, converted to SI units and cached as
+one .npy per column under utils.ingest.CACHE_DIR, keyed by the file's
+hash, so the pages map it instead of parsing it again. Files already in the
+cache are reported without parsing. --unit overrides the unit read from
+the header for one column and --step-minutes the sample interval.
+"""
+
+import argparse
+import json
+import time
+
+from utils import ingest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="+", help="CSV files to ingest")
+    parser.add_argument("--kind", required=True, choices=list(ingest.KINDS), help="what the files hold")
+    parser.add_argument("--unit", action="append", default=[], metavar="COLUMN=UNIT",
+                        help="unit of a column in the files (repeatable)")
+    parser.add_argument("--step-minutes", type=float, help="sample interval if the files have no timestamps")
+    parser.add_argument("--out", default=ingest.CACHE_DIR, help="cache directory")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    units = dict(item.split("=", 1) for item in args.unit) or None
+    report = []
+    for path in args.files:
+        start = time.perf_counter()
+        try:
+            data = ingest.ingest(path, args.kind, units, args.step_minutes, directory=args.out)
+        except (OSError, ValueError) as exc:
+            print(f"❌ {path}: {exc}")
+            continue
+        elapsed = time.perf_counter() - start
+        columns = ", ".join(f"{name} ({data.units[name]})" for name in data.columns)
+        print(f"📥 {path}: {data.rows:,} rows every {data.step_minutes:g} min, {columns} "
+              f"in {elapsed * 1000:.1f} ms (parse {data.source['parse_seconds'] * 1000:.0f} ms)")
+        report.append({"file": path, "path": data.path, "rows": data.rows, "step_minutes": data.step_minutes,
+                       "units": data.units, "seconds": round(elapsed, 6)})
+    print(f"✅ {len(report)} of {len(args.files)} files cached in {args.out}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
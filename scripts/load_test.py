@@ -0,0 +1,235 @@
+"""Load-test the app with many simulated student sessions.
+
+Usage:
+    python -m scripts.load_test --sessions 20 [--rounds 1] [--json report.json]
+
+Each simulated session opens the home page and then, for every system page,
+selects a component, builds an assembly order, submits it, asks for a hint,
+submits the correct order and follows the navigation button, the same flow
+a student clicks through. Sessions are driven by Streamlit's AppTest
+runner, so no browser or server is needed. AppTest swaps a process-wide
+runtime on every run, so concurrent sessions each get a worker process
+(warmed up with one unmeasured session); latency therefore includes the CPU
+contention of N students at once and the progress database sees concurrent
+writers.
+
+The report has rerun latency percentiles per interaction and overall, and
+the CPU time and RSS growth per session (measured inside the worker around
+each session) with their totals. With --json it is written as a
+machine-readable file that can be diffed between releases.
+
+Progress is written to a throwaway database unless SUSTAINAPP_PROGRESS_DB is
+already set, so a load test never touches data/progress.db.
+"""
+
+import os
+import tempfile
+
+if "SUSTAINAPP_PROGRESS_DB" not in os.environ:
+    os.environ["SUSTAINAPP_PROGRESS_DB"] = os.path.join(tempfile.mkdtemp(prefix="sustainapp-load-"), "progress.db")
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import streamlit
+from streamlit.testing.v1 import AppTest
+
+from utils import workers
+from utils.catalog import load_catalog
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PERCENTILES = (50, 90, 95, 99)
+
+
+def _rss_bytes():
+    """Current resident set size (Linux), falling back to the peak."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _click(at, label):
+    for button in at.button:
+        if button.label == label:
+            return button.click()
+    raise LookupError(label)
+
+
+class Session:
+    """One simulated student; records (interaction, ms) samples."""
+
+    def __init__(self, timeout):
+        self.uid = uuid.uuid4().hex
+        self.timeout = timeout
+        self.samples = []
+
+    def _run(self, interaction, at):
+        start = time.perf_counter()
+        at.run(timeout=self.timeout)
+        self.samples.append((interaction, (time.perf_counter() - start) * 1000))
+        if at.exception:
+            raise RuntimeError(f"{interaction}: {at.exception[0].value}")
+        return at
+
+    def play(self, catalog):
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=self.timeout)
+        at.query_params["uid"] = self.uid
+        self._run("open page", at)
+
+        # Open the first system, then follow the navigation buttons
+        at.switch_page(next(iter(catalog)).page_path)
+        self._run("open page", at)
+        for system in catalog:
+            assembly = system.assembly
+            at.selectbox[0].select(system.component_names[-1])
+            self._run("select component", at)
+            at.multiselect[0].set_value(list(system.correct_order[::-1]))
+            self._run("build order", at)
+            _click(at, assembly.submit_label)
+            self._run("submit", at)
+            _click(at, assembly.hint_label)
+            self._run("hint", at)
+            at.multiselect[0].set_value(list(system.correct_order))
+            _click(at, assembly.submit_label)
+            self._run("submit", at)
+
+            _, next_system = catalog.neighbours(system.key)
+            nav = f"➡️ Next: {next_system.nav_label}" if next_system else "🏠 Home - View Progress"
+            _click(at, nav)
+            self._run("navigate", at)
+            # AppTest doesn't remember st.switch_page for later reruns the way
+            # the browser URL does, so pin the page it navigated to
+            at.switch_page(next_system.page_path if next_system else "app.py")
+
+
+def _percentiles(values):
+    if not values:
+        return {}
+    arr = np.asarray(values)
+    stats = {f"p{p}": round(float(np.percentile(arr, p)), 4) for p in PERCENTILES}
+    stats["max"] = round(float(arr.max()), 4)
+    stats["mean"] = round(float(arr.mean()), 4)
+    stats["count"] = int(arr.size)
+    return stats
+
+
+def _warm_up(timeout):
+    # Pay for imports and caches before any session is measured
+    Session(timeout).play(load_catalog())
+
+
+def _play_session(rounds, timeout):
+    """Run one measured session in a worker process."""
+    player = Session(timeout)
+    rss_start, cpu_start = _rss_bytes(), _cpu_seconds()
+    error = None
+    try:
+        for _ in range(rounds):
+            player.play(load_catalog())
+    except Exception as exc:  # a failed session is reported, not fatal
+        error = f"{player.uid}: {exc!r}"
+    result = {
+        "samples": player.samples,
+        "cpu_seconds": _cpu_seconds() - cpu_start,
+        "rss_growth_bytes": _rss_bytes() - rss_start,
+        "error": error,
+    }
+    # The app's simulation pool would otherwise outlive the session, and its
+    # idle workers keep this worker process from exiting
+    workers.shutdown()
+    return result
+
+
+def run(sessions, rounds=1, workers=None, timeout=30):
+    catalog = load_catalog()
+    workers = min(workers or sessions, sessions)
+
+    # AppTest replaces __main__ in the workers, so hand them the functions by
+    # their importable module path even when this file runs as __main__
+    from scripts.load_test import _play_session, _warm_up
+
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=ctx, initializer=_warm_up, initargs=(timeout,)) as pool:
+        # Start every worker before the clock does
+        list(pool.map(time.sleep, [0] * workers))
+        wall_start = time.perf_counter()
+        results = list(pool.map(_play_session, [rounds] * sessions, [timeout] * sessions))
+        wall = time.perf_counter() - wall_start
+
+    by_interaction = {}
+    for result in results:
+        for interaction, ms in result["samples"]:
+            by_interaction.setdefault(interaction, []).append(ms)
+    every = [ms for samples in by_interaction.values() for ms in samples]
+    cpu = [r["cpu_seconds"] for r in results]
+    rss = [r["rss_growth_bytes"] for r in results]
+
+    return {
+        "config": {
+            "sessions": sessions,
+            "rounds": rounds,
+            "workers": workers,
+            "systems": [s.key for s in catalog],
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "cpus": os.cpu_count(),
+        },
+        "wall_seconds": round(wall, 3),
+        "reruns_per_second": round(len(every) / wall, 2) if wall else None,
+        "latency_ms": {"all": _percentiles(every), **{k: _percentiles(v) for k, v in by_interaction.items()}},
+        "cpu_seconds": round(sum(cpu), 3),
+        "cpu_seconds_per_session": _percentiles(cpu),
+        "rss_growth_bytes": int(sum(rss)),
+        "rss_growth_per_session_bytes": _percentiles(rss),
+        "errors": [r["error"] for r in results if r["error"]],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20, help="simulated students")
+    parser.add_argument("--rounds", type=int, default=1, help="times each student plays every page")
+    parser.add_argument("--workers", type=int, help="concurrent sessions (default: all of them)")
+    parser.add_argument("--timeout", type=float, default=30, help="seconds allowed per rerun")
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args(argv)
+
+    report = run(args.sessions, args.rounds, args.workers, args.timeout)
+
+    print(f"{'interaction':<17} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'max':>8} {'n':>6}")
+    for interaction, stats in report["latency_ms"].items():
+        print(f"{interaction:<17} {stats['p50']:>8.2f} {stats['p90']:>8.2f} {stats['p95']:>8.2f} "
+              f"{stats['p99']:>8.2f} {stats['max']:>8.2f} {stats['count']:>6}")
+    print(f"⏱️ {report['wall_seconds']} s wall, {report['reruns_per_second']} reruns/s")
+    print(f"🧮 CPU {report['cpu_seconds']} s (p50 {report['cpu_seconds_per_session']['p50']:.3f} s/session)")
+    print(f"💾 RSS +{report['rss_growth_bytes'] / 2**20:.1f} MiB "
+          f"(p50 {report['rss_growth_per_session_bytes']['p50'] / 2**10:.0f} KiB/session)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+    if report["errors"]:
+        for error in report["errors"][:20]:
+            print(f"⚠️ {error}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+import os
+import sys
+import tempfile
+
+# Caches and the progress database go to a scratch directory, set before utils is imported
+_scratch = tempfile.mkdtemp(prefix="sustainapp-tests-")
+os.environ.setdefault("SUSTAINAPP_CACHE_DIR", os.path.join(_scratch, "cache"))
+os.environ.setdefault("SUSTAINAPP_TABLE_DIR", os.path.join(_scratch, "tables"))
+os.environ.setdefault("SUSTAINAPP_PROGRESS_DB", os.path.join(_scratch, "progress.db"))
+os.environ.setdefault("SUSTAINAPP_WORKERS", "0")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
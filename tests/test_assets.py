@@ -0,0 +1,40 @@
+import json
+import os
+
+from utils import assets
+
+
+def _manifest(tmp_path, monkeypatch, formats):
+    variants = [
+        {"file": f"a.{width}.{fmt}", "format": fmt, "width": width, "height": width // 2,
+         "bytes": width * (1 if fmt == "avif" else 2)}
+        for width in (320, 600, 800) for fmt in formats
+    ]
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps({"images/a.png": {"hash": "x", "source_bytes": 1, "variants": variants}}))
+    monkeypatch.setattr(assets, "MANIFEST_PATH", str(path))
+    assets._cache.clear()
+
+
+def test_webp_is_linked_even_when_avif_is_smaller(tmp_path, monkeypatch):
+    _manifest(tmp_path, monkeypatch, ("webp", "avif"))
+    assert assets.pick_variant("images/a.png", 500)["file"] == "a.600.webp"
+    assert assets.pick_variant("images/a.png", 2000)["file"] == "a.800.webp"
+    assert assets.variant_url("images/a.png", 500, "avif").endswith("a.600.avif")
+
+    picture = assets.picture_html("images/a.png", "A <b> caption", 500)
+    assert picture.index('type="image/avif" srcset="/app/static/images/a.600.avif"') < picture.index(
+        'src="/app/static/images/a.600.webp"')
+    assert "A &lt;b&gt; caption" in picture
+
+
+def test_webp_only_builds_have_no_picture(tmp_path, monkeypatch):
+    _manifest(tmp_path, monkeypatch, ("webp",))
+    assert assets.picture_html("images/a.png", "caption", 500) is None
+    assert assets.pick_variant("images/a.png", 500, "avif") is None
+    assert assets.pick_variant("images/missing.png", 500) is None
+
+
+def test_build_dir_does_not_depend_on_the_working_directory():
+    assert os.path.isabs(assets.BUILD_DIR)
+    assert assets.BUILD_DIR == os.path.join(os.path.dirname(os.path.dirname(assets.__file__)), "static", "images")
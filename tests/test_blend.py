@@ -0,0 +1,87 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from utils import blend
+
+
+def random_library(size, seed=0):
+    """A synthetic library: perturbed copies of the defaults."""
+    rng = np.random.default_rng(seed)
+    base = blend.DEFAULT_LIBRARY
+    pick = rng.integers(0, len(base), size)
+
+    def jitter(values, scale):
+        return values[pick] * rng.lognormal(0.0, scale, size)
+
+    return blend.Library(
+        names=tuple(f"{base.names[i]} #{k}" for k, i in enumerate(pick)),
+        carbon=jitter(base.carbon, 0.15),
+        nitrogen=jitter(base.nitrogen, 0.15),
+        moisture=np.clip(jitter(base.moisture, 0.1), 0.05, 0.95),
+        ph=np.clip(base.ph[pick] + rng.normal(0, 0.3, size), 3.5, 9.0),
+        methane=jitter(base.methane, 0.2),
+        cost=base.cost[pick] + rng.normal(0, 5, size),
+        available=jitter(base.available, 0.3) / max(size / len(base), 1),
+    )
+
+
+def vertex_optimum(library, demand, methane_value):
+    """Brute-force LP optimum: the best feasible vertex, or None if there is none."""
+    n = len(library)
+    try:
+        problem = blend._problem(library, demand, methane_value)
+    except blend.Infeasible:
+        return None
+    rows, b = problem.a[1:, :n], problem.b[1:]
+    upper = problem.upper[:n]
+    # Inequalities g x <= h: blend constraints, then x >= 0 and x <= upper
+    g = np.vstack([rows, -np.eye(n), np.eye(n)])
+    h = np.concatenate([b, np.zeros(n), upper])
+    costs = library.cost - methane_value * library.methane
+    best = None
+    for active in itertools.combinations(range(len(g)), n - 1):
+        lhs = np.vstack([np.ones(n), g[list(active)]])
+        if abs(np.linalg.det(lhs)) < 1e-9:
+            continue
+        x = np.linalg.solve(lhs, np.concatenate([[demand], h[list(active)]]))
+        if np.all(g @ x <= h + 1e-6 * (1 + np.abs(h))):
+            value = costs @ x
+            best = value if best is None else min(best, value)
+    return best
+
+
+CASES = [(size, seed, demand) for size in (5, 6) for seed in range(8) for demand in (10.0, 50.0)]
+
+
+def test_cases_include_feasible_blends():
+    feasible = sum(vertex_optimum(random_library(size, seed), demand, 0.3) is not None
+                   for size, seed, demand in CASES)
+    assert 4 <= feasible < len(CASES)
+
+
+@pytest.mark.parametrize("size, seed, demand", CASES)
+def test_solve_matches_vertex_enumeration(size, seed, demand):
+    library = random_library(size, seed)
+    expected = vertex_optimum(library, demand, 0.3)
+    if expected is None:
+        with pytest.raises(blend.Infeasible):
+            blend.solve(library, demand)
+        return
+    result = blend.solve(library, demand)
+    assert result.cost - 0.3 * result.methane == pytest.approx(expected, rel=1e-6, abs=1e-6)
+    assert result.tonnes.sum() == pytest.approx(demand)
+    assert blend.CN_RANGE[0] - 1e-6 <= result.cn_ratio <= blend.CN_RANGE[1] + 1e-6
+
+
+def test_solve_batch_matches_solve():
+    library = random_library(40, seed=7)
+    demands = np.linspace(20, 0.8 * library.available.sum(), 9)
+    for demand, batched in zip(demands, blend.solve_batch(library, demands)):
+        try:
+            single = blend.solve(library, float(demand))
+        except blend.Infeasible:
+            assert batched is None
+            continue
+        assert batched.cost - 0.3 * batched.methane == pytest.approx(single.cost - 0.3 * single.methane, rel=1e-7)
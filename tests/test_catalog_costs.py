@@ -0,0 +1,50 @@
+import copy
+import tomllib
+
+import numpy as np
+import pytest
+
+from utils import catalog, dispatch, lcoe
+
+
+def _raw():
+    with open(catalog.CATALOG_PATH, "rb") as fh:
+        return tomllib.load(fh)
+
+
+def _with_new_system(raw):
+    extra = copy.deepcopy(raw["systems"][0])
+    extra.update(key="geothermal", page="9_Geothermal", name="Geothermal")
+    extra.pop("costs")
+    extra["summary"] = {**extra["summary"], "lcoe": "60-110"}
+    raw["systems"].append(extra)
+    return catalog.parse_catalog(raw)
+
+
+def test_catalog_costs_are_validated():
+    raw = _raw()
+    raw["systems"][0]["costs"]["capex"] = [1500, 1100, 900]
+    with pytest.raises(catalog.CatalogError, match="capex"):
+        catalog.parse_catalog(raw)
+
+
+def test_system_without_costs_uses_summary_lcoe(monkeypatch):
+    monkeypatch.setattr(lcoe, "load_catalog", lambda: _with_new_system(_raw()))
+    samples = lcoe.sample_lcoe("geothermal", draws=20_000)
+    assert samples.min() >= 60 and samples.max() <= 110
+    assert abs(np.median(samples) - 85) < 2
+    # Systems with a costs table are unaffected
+    assert lcoe.sample_lcoe("solar", draws=1000).mean() > 0
+
+
+def test_dispatch_costs_without_a_catalog_source(monkeypatch):
+    raw = _raw()
+    raw["systems"] = [s for s in raw["systems"] if s["key"] != "hydro"]
+    monkeypatch.setattr(dispatch, "load_catalog", lambda: catalog.parse_catalog(raw))
+    dispatch.catalog_costs.cache_clear()
+    try:
+        costs = dispatch.catalog_costs()
+    finally:
+        dispatch.catalog_costs.cache_clear()
+    assert set(costs) == set(dispatch.SOURCES)
+    assert costs["hydro"][0] > 0
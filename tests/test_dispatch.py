@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from utils import dispatch
+
+
+def _sequential(shift, capacity, initial):
+    out = np.empty_like(shift)
+    state = np.broadcast_to(np.asarray(initial, dtype=np.float64), shift.shape[1:]).copy()
+    for t in range(len(shift)):
+        state = np.clip(state + shift[t], 0, capacity)
+        out[t] = state
+    return out
+
+
+@pytest.mark.parametrize("hours, mixes, seed", [(1, 1, 0), (7, 3, 1), (168, 5, 2), (1000, 4, 3), (8760, 2, 4)])
+def test_clip_scan_matches_sequential(hours, mixes, seed):
+    rng = np.random.default_rng(seed)
+    capacity = rng.uniform(0, 100, mixes)
+    capacity[0] = 0.0  # no storage at all
+    shift = rng.normal(0, 30, (hours, mixes))
+    initial = rng.uniform(0, 1, mixes) * capacity
+    expected = _sequential(shift, capacity, initial)
+    assert np.allclose(dispatch.clip_scan(shift, capacity, initial), expected, rtol=0, atol=1e-9)
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from utils import grading
+
+STEPS = ["intake", "screen", "turbine", "generator", "transformer", "grid"]
+
+
+@pytest.mark.parametrize("shape", [(0, 0), (0, 6), (3, 0), (0,)])
+def test_empty_batches(shape):
+    result = grading.grade_indices(np.zeros(shape, dtype=np.int32))
+    rows = shape[0] if len(shape) == 2 else 1
+    assert set(result) == {"score", "submitted", "correct_positions", "lcs", "inversions", "first_misplaced"}
+    assert all(values.shape == (rows,) for values in result.values())
+    assert (result["score"] == 100).all() and (result["first_misplaced"] == -1).all()
+
+
+def test_empty_order_is_perfect():
+    assert grading.grade([], []).perfect
+
+
+def test_scores_rank_submissions_by_how_close_they_are():
+    orders = [
+        STEPS,
+        STEPS[:2] + [STEPS[3], STEPS[2]] + STEPS[4:],  # one adjacent swap
+        STEPS[:4],  # correct but unfinished
+        [STEPS[5]] + STEPS[:5],  # last step moved to the front
+        STEPS[::-1],
+    ]
+    result = grading.grade_indices(grading.encode_orders(orders, STEPS))
+    assert list(result["score"]) == sorted(result["score"], reverse=True)
+    assert result["score"][0] == 100 and result["score"][1] < 100
+    assert list(result["inversions"]) == [0, 1, 0, 5, 15]
+    assert list(result["first_misplaced"]) == [-1, 2, 4, 0, 0]
+
+    single = grading.grade(orders[1], STEPS)
+    assert single.score == result["score"][1] and single.first_misplaced == 2 and not single.perfect
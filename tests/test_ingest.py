@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from utils import ingest, mppt
+
+
+def _ingest(tmp_path, text, kind, **kwargs):
+    path = tmp_path / "data.csv"
+    path.write_text(text, encoding="utf-8")
+    return ingest.ingest(str(path), kind, directory=str(tmp_path / "cache"), **kwargs)
+
+
+def test_tmy_header_units_and_fahrenheit(tmp_path):
+    rows = "".join(f"01/01/1988,{h:02d}:00,{10 * h},1,{32 + 9 * h / 5:.1f}\n" for h in range(1, 25))
+    data = _ingest(tmp_path, '690150,"SITE",CA,-8.0\nDate (MM/DD/YYYY),Time (HH:MM),GHI (Wh/m^2),GHI source,'
+                             'Dry-bulb (F)\n' + rows, "solar")
+    assert data.rows == 24 and data.step_minutes == 60 and not data.source["step_inferred"]
+    assert data.units == {"irradiance": "wh/m2", "temp_c": "f"}
+    # Wh/m² per hour is the mean W/m² over the hour
+    assert np.allclose(data["irradiance"], 10 * np.arange(1, 25))
+    assert np.allclose(data["temp_c"], np.arange(1, 25), atol=1e-4)
+    assert not data["irradiance"].flags.writeable
+
+
+def test_wind_kmh_with_inferred_step(tmp_path):
+    rows = "".join(f"2020-01-01 00:{m:02d}:00;{36.0 + m}\n" for m in range(0, 60, 10))
+    data = _ingest(tmp_path, "# logger\nTimestamp;Wind speed [km/h]\n" + rows, "wind")
+    assert data.step_minutes == 10 and data.source["step_inferred"]
+    assert np.allclose(data["speed"], (36.0 + np.arange(0, 60, 10)) / 3.6)
+
+
+def test_headerless_inflow_uses_last_column(tmp_path):
+    data = _ingest(tmp_path, "".join(f"{i},{100 + i}\n" for i in range(10)), "inflow")
+    assert data.rows == 10 and data.units == {"flow": "m3/s"}
+    assert np.array_equal(data["flow"], 100 + np.arange(10))
+
+
+def test_unknown_unit_is_an_error(tmp_path):
+    with pytest.raises(ValueError, match="unknown unit"):
+        _ingest(tmp_path, "discharge (furlongs)\n1\n", "inflow")
+
+
+def test_timestamp_gap_keeps_later_samples_in_place(tmp_path):
+    days = [d for d in range(1, 11) if d not in (4, 5)]
+    text = "date time,flow\n" + "".join(f"2020-01-{d:02d} 00:00,{d}\n" for d in days)
+    text += "2020-01-03 00:00,99\n"  # out of order: dropped
+    data = _ingest(tmp_path, text, "inflow")
+    flow = np.asarray(data["flow"])
+    assert data.rows == 10 and data.source["missing"] == 2
+    assert np.isnan(flow[3:5]).all()
+    assert np.array_equal(flow[5:], np.arange(6, 11))
+    chunks = np.concatenate(list(ingest.column_chunks(data.path, "flow", 4, interpolate=True)))
+    assert np.allclose(chunks, np.arange(1, 11))
+
+
+def test_blank_values_without_timestamps_stay_as_gaps(tmp_path):
+    data = _ingest(tmp_path, "flow\n1\n\n,\nNaN\n4\nflow\n5\n", "inflow")
+    assert np.array_equal(np.isnan(data["flow"]), [False, True, True, False, False])
+
+
+def test_solar_gap_stays_dark_at_the_right_hour(tmp_path):
+    hours = [h for h in range(48) if not 30 <= h < 34]
+    text = "timestamp,ghi,temp_air\n" + "".join(
+        f"2020-01-{1 + h // 24:02d} {h % 24:02d}:00,{max(0, 1000 - 150 * abs(h % 24 - 12))},20\n" for h in hours
+    )
+    data = _ingest(tmp_path, text, "solar")
+    irradiance, temp_c = mppt.measured_year(data.path)
+    assert irradiance.shape == (2, 1440)
+    # Noon of the second day is still the peak; the missing morning is dark
+    assert abs(int(irradiance[1].argmax()) - 12 * 60) <= 60
+    assert irradiance[1, 7 * 60:9 * 60].max() == 0
+    assert np.allclose(temp_c[:, :1400], 20)
+
+
+def test_incomplete_target_is_replaced(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("flow\n1\n2\n", encoding="utf-8")
+    directory = tmp_path / "cache"
+    key = ingest.dataset_key(ingest.file_hash(str(path)), "inflow")
+    (directory / key).mkdir(parents=True)
+    (directory / key / "flow.npy").write_bytes(b"partial")
+    data = ingest.ingest(str(path), "inflow", directory=str(directory))
+    assert data is not None and np.array_equal(data["flow"], [1, 2])
@@ -0,0 +1,19 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_two_sessions_finish(tmp_path):
+    # Default worker config, so each session worker starts the app's simulation pool
+    env = {k: v for k, v in os.environ.items() if k != "SUSTAINAPP_WORKERS"}
+    env["SUSTAINAPP_PROGRESS_DB"] = str(tmp_path / "progress.db")
+    report = tmp_path / "report.json"
+    done = subprocess.run([sys.executable, "-m", "scripts.load_test", "--sessions", "2", "--json", str(report)],
+                          cwd=ROOT, env=env, capture_output=True, text=True, timeout=300)
+    assert done.returncode == 0, done.stderr
+    result = json.loads(report.read_text())
+    assert result["errors"] == [] and result["config"]["sessions"] == 2
+    assert result["latency_ms"]["submit"]["count"] == 2 * 2 * len(result["config"]["systems"])
@@ -0,0 +1,26 @@
+import numpy as np
+
+from utils import memo
+
+
+def test_counters_after_miss_store_hit(tmp_path, monkeypatch):
+    store = memo.MemoStore(str(tmp_path))
+    monkeypatch.setattr(memo, "store", lambda directory=memo.CACHE_DIR: store)
+    calls = []
+
+    @memo.persistent()
+    def square(x):
+        calls.append(x)
+        return np.arange(x) ** 2
+
+    assert square.lookup(4) == (False, None)
+    first = square(4)
+    hit, second = square.lookup(4)
+    third = square(4)
+
+    assert calls == [4]
+    assert hit and np.array_equal(first, second) and np.array_equal(first, third)
+    assert not second.flags.writeable
+    stats = store.stats()
+    assert (stats["misses"], stats["stores"], stats["hits"]) == (1, 1, 2)
+    assert stats["entries"] == 1
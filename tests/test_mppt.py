@@ -0,0 +1,27 @@
+import numpy as np
+
+from utils import mppt, pv
+
+DUSK, DAWN = 720, 780
+
+
+def test_tracker_restarts_after_the_module_sleeps():
+    # Rows share the afternoon after an hour of darkness but not the morning before it
+    irradiance, temp_c = mppt.synthetic_year(seed=3, cloudiness=0.5, days=4)
+    irradiance[:, DUSK:DAWN] = 0.0
+    irradiance[:, DAWN:] = irradiance[0, DAWN:]
+    temp_c[:, DAWN:] = temp_c[0, DAWN:]
+    irradiance[-1, :DUSK] = 0.0
+
+    power = mppt._track(irradiance, temp_c, pv.DEFAULT_MODULE, 0.2)
+    assert power[:, 0, :DUSK].sum() > 0
+    for day in range(1, len(irradiance)):
+        np.testing.assert_array_equal(power[:, day, DAWN:], power[:, 0, DAWN:])
+
+
+def test_day_does_not_depend_on_the_batch():
+    irradiance, temp_c = mppt.synthetic_year(seed=1, days=3)
+    power = mppt._track(irradiance, temp_c, pv.DEFAULT_MODULE, 0.2)
+    for day in range(3):
+        trace, _ = mppt.day_trace(irradiance, temp_c, day)
+        np.testing.assert_array_equal(trace, power[:, day])
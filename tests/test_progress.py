@@ -0,0 +1,51 @@
+from utils.progress import ProgressStore
+
+
+class _HookedConnection:
+    """Runs ``hook`` after each query has read its rows, before returning them."""
+
+    def __init__(self, conn, hook):
+        self.conn = conn
+        self.hook = hook
+
+    def execute(self, *args):
+        rows = self.conn.execute(*args).fetchall()
+        self.hook()
+        return _Rows(rows)
+
+
+class _Rows:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchall(self):
+        return self.rows
+
+
+def _store(tmp_path):
+    # A long interval keeps the background thread out of the way; the tests flush by hand
+    return ProgressStore(str(tmp_path / "progress.db"), flush_interval=3600)
+
+
+def test_flush_during_a_read_does_not_hide_the_record(tmp_path):
+    store = _store(tmp_path)
+    store.record("u", "solar", 50, True)
+    store._read_conn = _HookedConnection(store._read_conn, store.flush)
+
+    assert store.load("u") == {"solar": (50, True)}
+    # Served from the cache now, and still current
+    assert store.load("u") == {"solar": (50, True)}
+    store._read_conn = store._read_conn.conn
+    store.close()
+
+
+def test_record_during_a_read_is_not_hidden_by_the_cache(tmp_path):
+    store = _store(tmp_path)
+    store.record("u", "solar", 50, False)
+    store.flush()
+    store._read_conn = _HookedConnection(store._read_conn, lambda: store.record("u", "wind", 30, True))
+
+    store.load("u")
+    store._read_conn = store._read_conn.conn
+    assert store.load("u") == {"solar": (50, False), "wind": (30, True)}
+    store.close()
@@ -0,0 +1,20 @@
+import numpy as np
+
+from utils import tables, wind
+
+
+def test_pitch_table_defers_to_the_solver_where_it_jumps(tmp_path):
+    meta = tables.build("wind_pitch", str(tmp_path), samples=5_000)
+    assert meta["errors"]["pitch"]["max_abs"] < 0.15
+    table = tables.load("wind_pitch", str(tmp_path))
+
+    points = tables._sample(tables.SPECS["wind_pitch"], 50_000, seed=1)
+    served = table.serves(*points)
+    assert 0.3 < served.mean() < 0.7
+    error = np.abs(table("pitch", *points) - wind.pitch_for_cp(*points))
+    assert error[served].max() < 0.15
+    assert error[~served].max() > 10
+
+    # Unreachable targets: above Cp(λ, 0), and on the rising side of Cp(β) at low λ
+    assert not table.serves(8.0, 0.49) and not table.serves(2.0, 0.03)
+    assert table.serves(6.0, 0.2)
@@ -0,0 +1,30 @@
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _profiled(query):
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=30)
+    for key, value in query.items():
+        at.query_params[key] = value
+    at.run()
+    assert not at.exception
+    return any(expander.label == "🔬 Rerun profile" for expander in at.expander)
+
+
+@pytest.mark.parametrize("token", [None, "s3cret"])
+def test_profile_parameter_is_ignored_for_visitors(monkeypatch, token):
+    if token:
+        monkeypatch.setenv("SUSTAINAPP_ADMIN_TOKEN", token)
+    else:
+        monkeypatch.delenv("SUSTAINAPP_ADMIN_TOKEN", raising=False)
+    assert not _profiled({"profile": "1"})
+    assert not _profiled({"profile": "1", "admin": "guess"})
+
+
+def test_admins_get_the_profile(monkeypatch):
+    monkeypatch.setenv("SUSTAINAPP_ADMIN_TOKEN", "s3cret")
+    assert _profiled({"profile": "1", "admin": "s3cret"})
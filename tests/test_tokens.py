@@ -0,0 +1,44 @@
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from utils import tokens
+from utils.catalog import load_catalog
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(autouse=True)
+def secret(monkeypatch):
+    monkeypatch.setattr(tokens, "_secret", b"test secret")
+
+
+def _progress(catalog):
+    return {system.key: (90, True) for system in catalog}
+
+
+def test_token_round_trips_for_its_user():
+    catalog = load_catalog()
+    token = tokens.encode_token(catalog, _progress(catalog), "alice")
+    assert tokens.decode_token(catalog, token, "alice") == _progress(catalog)
+
+
+def test_token_is_rejected_for_another_user():
+    catalog = load_catalog()
+    token = tokens.encode_token(catalog, _progress(catalog), "alice")
+    assert tokens.decode_token(catalog, token, "bob") is None
+    assert tokens.decode_token(catalog, token, "") is None
+
+
+@pytest.mark.parametrize("user_id, restored", [("carol", True), ("dave", False)])
+def test_only_the_owner_restores_from_a_link(user_id, restored):
+    catalog = load_catalog()
+    system = next(iter(catalog))
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=30)
+    at.session_state["user_id"] = user_id
+    at.query_params[tokens.QUERY_PARAM] = tokens.encode_token(catalog, _progress(catalog), "carol")
+    at.run()
+    assert not at.exception
+    assert at.session_state[f"{system.key}_score"] == (90 if restored else 0)
+    assert at.session_state[f"{system.key}_completed"] is restored
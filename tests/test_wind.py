@@ -0,0 +1,27 @@
+import json
+
+import numpy as np
+import pytest
+
+from scripts import wind_aep
+from utils import wind
+
+
+def test_fit_weibull_fits_the_sheared_series():
+    speeds = np.random.default_rng(0).weibull(2.0, 50_000) * 6.0
+    sheared = wind.shear(speeds, 50.0, 100.0, 0.2)
+    k, c = wind.fit_weibull(speeds, chunk=4096, measured_height=50.0, hub_height=100.0, alpha=0.2)
+    assert (k, c) == pytest.approx(wind.fit_weibull(sheared))
+    assert c == pytest.approx(wind.fit_weibull(speeds)[1] * 2 ** 0.2)
+
+
+def test_rated_speed_follows_turbine_overrides(tmp_path):
+    assert wind.rated_speed_for(wind.DEFAULT_TURBINE) == pytest.approx(wind.DEFAULT_TURBINE.rated_speed, abs=0.01)
+
+    series = tmp_path / "speeds.npy"
+    np.save(series, np.random.default_rng(1).weibull(2.0, 10_000) * 8.0)
+    report = tmp_path / "aep.json"
+    wind_aep.main([str(series), "--rated-kw", "3000", "--json", str(report)])
+    turbine = json.loads(report.read_text())["turbine"]
+    assert turbine["rated_kw"] == 3000
+    assert turbine["rated_speed"] == pytest.approx(12.0 * (3000 / 2400) ** (1 / 3), abs=0.01)
@@ -0,0 +1,25 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# A spawned process that uses the pool, as a load-test session worker does
+NESTED = """
+import functools, multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from utils import workers
+
+if __name__ == "__main__":
+    print(workers.run(abs, -1.5))
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        print(pool.submit(functools.partial(workers.run, abs, -2.5)).result())
+"""
+
+
+def test_processes_that_used_the_pool_exit():
+    env = {**os.environ, "SUSTAINAPP_WORKERS": "1", "PYTHONPATH": ROOT}
+    done = subprocess.run([sys.executable, "-c", NESTED], cwd=ROOT, env=env, capture_output=True, text=True,
+                          timeout=60)
+    assert done.returncode == 0, done.stderr
+    assert done.stdout.split() == ["1.5", "2.5"]
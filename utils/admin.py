@@ -0,0 +1,31 @@
+"""Admin access: the token check shared by the admin page and admin-only tools.
+
+The token comes from SUSTAINAPP_ADMIN_TOKEN in the server environment; with
+it unset nobody is an admin. A session proves itself once, with the
+``admin`` query parameter or the admin page's form, and the token is then
+kept in session state.
+"""
+
+import hmac
+import os
+
+import streamlit as st
+
+
+def configured_token():
+    """The server's admin token, or None when admin access is disabled."""
+    return os.environ.get("SUSTAINAPP_ADMIN_TOKEN") or None
+
+
+def matches(given):
+    token = configured_token()
+    return token is not None and hmac.compare_digest(given.encode(), token.encode())
+
+
+def given_token():
+    """The token this session presented, from session state or the URL."""
+    return st.session_state.get("admin_token") or st.query_params.get("admin") or ""
+
+
+def is_admin():
+    return matches(given_token())
@@ -0,0 +1,174 @@
+"""Shared image cache for the system and component diagrams.
+
+Streamlit re-executes a page script on every widget interaction, so opening
+and decoding the PNGs inline means disk I/O and decoding on every click. This
+module decodes each diagram once per process, keeps pre-sized variants for
+the column widths the pages use, and evicts least recently used entries once
+the cache goes over its memory cap. Entries are keyed on file mtime so an
+edited image is picked up on the next rerun.
+
+When ``scripts/build_images.py`` has been run, the compressed variant
+closest to the requested width is linked instead of the source PNG. WebP
+is linked by default, since every browser Streamlit supports decodes it;
+when AVIF was built too, both are offered in a <picture> element and the
+browser takes the AVIF only if it can decode it.
+"""
+
+import html
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+from PIL import Image
+
+# Target widths (px) for the two layouts the pages use: the 2:1 system
+# overview column and the 1:1 component diagram column
+OVERVIEW_WIDTH = 800
+COMPONENT_WIDTH = 600
+
+# Upper bound on decoded pixel data held in memory
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Written by scripts/build_images.py. Variants live under Streamlit's static
+# folder so the browser fetches them directly by their content-hashed name
+BUILD_DIR = os.path.join(ROOT, "static", "images")
+MANIFEST_PATH = os.path.join(BUILD_DIR, "manifest.json")
+STATIC_URL = "/app/static/images/"
+
+_cache = OrderedDict()
+_cache_bytes = 0
+_lock = threading.Lock()
+
+
+def _image_bytes(img):
+    return img.width * img.height * len(img.getbands())
+
+
+def _size(value):
+    if isinstance(value, Image.Image):
+        return _image_bytes(value)
+    return 0
+
+
+def _decode(path, width):
+    with Image.open(path) as src:
+        img = src.convert("RGBA") if src.mode in ("P", "LA") else src.copy()
+    if width and img.width > width:
+        height = round(img.height * width / img.width)
+        img = img.resize((width, height), Image.LANCZOS)
+    img.load()
+    return img
+
+
+def _read_manifest(path):
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def _evict():
+    global _cache_bytes
+    while _cache_bytes > MAX_CACHE_BYTES and len(_cache) > 1:
+        _, (_, value) = _cache.popitem(last=False)
+        _cache_bytes -= _size(value)
+
+
+def _cached(key, path, loader):
+    global _cache_bytes
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] == mtime:
+            _cache.move_to_end(key)
+            return entry[1]
+
+    value = loader()
+
+    with _lock:
+        old = _cache.pop(key, None)
+        if old is not None:
+            _cache_bytes -= _size(old[1])
+        _cache[key] = (mtime, value)
+        _cache_bytes += _size(value)
+        _evict()
+    return value
+
+
+def load_image(path, width=None):
+    """Return the decoded image at ``path`` resized to ``width``, or None if missing."""
+    return _cached(("image", path, width), path, lambda: _decode(path, width))
+
+
+def load_manifest():
+    return _cached(("manifest",), MANIFEST_PATH, lambda: _read_manifest(MANIFEST_PATH)) or {}
+
+
+def pick_variant(path, width, fmt="webp"):
+    """Return the smallest ``fmt`` variant of ``path`` at least ``width`` px wide.
+
+    Falls back to the widest variant when none is large enough, and to None
+    when the image has not been built in that format.
+    """
+    entry = load_manifest().get(path.replace(os.sep, "/"))
+    if not entry:
+        return None
+    variants = sorted((v for v in entry["variants"] if v["format"] == fmt), key=lambda v: v["width"])
+    if not variants:
+        return None
+    if width:
+        fitting = [v for v in variants if v["width"] >= width]
+        if fitting:
+            return fitting[0]
+    return variants[-1]
+
+
+def variant_url(path, width=None, fmt="webp"):
+    """Return the static URL of the best built variant, or None if unavailable."""
+    variant = pick_variant(path, width, fmt)
+    if variant is None:
+        return None
+    return STATIC_URL + variant["file"]
+
+
+def picture_html(path, caption, width=None):
+    """A <picture> offering the AVIF variant with the WebP one as fallback, or None."""
+    avif, webp = variant_url(path, width, "avif"), variant_url(path, width, "webp")
+    if avif is None or webp is None:
+        return None
+    caption = html.escape(caption)
+    return (
+        f'<figure style="margin:0"><picture><source type="image/avif" srcset="{avif}">'
+        f'<img src="{webp}" alt="{caption}" style="width:100%"></picture>'
+        f'<figcaption style="text-align:center;color:gray;font-size:0.875rem">{caption}</figcaption></figure>'
+    )
+
+
+def cache_stats():
+    with _lock:
+        return {"entries": len(_cache), "bytes": _cache_bytes, "max_bytes": MAX_CACHE_BYTES}
+
+
+def show_image(path, caption, missing_message, width=None):
+    """Render a cached diagram, falling back to the placeholder note.
+
+    Built variants are referenced by URL, so the browser downloads the
+    compressed file itself and can cache it across sessions by its hash.
+    """
+    try:
+        picture = picture_html(path, caption, width)
+        img = picture or variant_url(path, width) or load_image(path, width)
+    except Exception:
+        img = picture = None
+    if picture is not None:
+        st.markdown(picture, unsafe_allow_html=True)
+    elif img is None:
+        st.info(missing_message)
+    else:
+        st.image(img, caption=caption, use_container_width=True)
@@ -0,0 +1,246 @@
+"""Least-cost feedstock blending for anaerobic digestion.
+
+Chooses tonnes per day of each feedstock in a library so the blend meets
+the Feedstock Preparation spec (C/N 25-30:1, moisture 40-60%, pH 6.8-7.2)
+and the daily demand, at the lowest cost net of the methane it yields:
+
+    minimize    Σ (cost_i - methane_value · methane_i) x_i
+    subject to  Σ x_i = demand,  0 ≤ x_i ≤ available_i
+                25 Σ N_i x_i ≤ Σ C_i x_i ≤ 30 Σ N_i x_i
+                0.40 · demand ≤ Σ moisture_i x_i ≤ 0.60 · demand
+                6.8 · demand ≤ Σ pH_i x_i ≤ 7.2 · demand
+
+The ratio constraints are linear once multiplied out. pH is blended as a
+mass-weighted average, a linear approximation of the real buffer chemistry.
+
+The solver is a bounded-variable dual simplex. Every variable, slacks
+included, has finite bounds, so starting from the all-slack basis with each
+feedstock at whichever bound its cost prefers is dual feasible, and no
+phase 1 is needed. There are only a handful of constraint rows, so each
+iteration is one small dense solve plus one pass over the library, and
+hundreds of feedstocks solve in milliseconds. Demand only enters the
+right-hand side and the bounds, so an optimal basis stays dual feasible
+when it changes; solve_batch() warm-starts every scenario from the one
+before.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+CN_RANGE = (25.0, 30.0)
+MOISTURE_RANGE = (0.40, 0.60)
+PH_RANGE = (6.8, 7.2)
+TOL = 1e-9
+
+
+class Infeasible(ValueError):
+    """No blend meets the constraints with the feedstocks available."""
+
+
+@dataclass(frozen=True, slots=True)
+class Library:
+    """Feedstock properties as parallel arrays, per tonne as delivered."""
+
+    names: tuple
+    carbon: np.ndarray  # kg C per tonne
+    nitrogen: np.ndarray  # kg N per tonne
+    moisture: np.ndarray  # mass fraction
+    ph: np.ndarray
+    methane: np.ndarray  # m3 CH4 per tonne
+    cost: np.ndarray  # $ per tonne; negative for gate fees
+    available: np.ndarray  # tonnes per day
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_records(cls, records):
+        """Build from dicts (e.g. DataFrame.to_dict("records")) with the field names."""
+        columns = ("carbon", "nitrogen", "moisture", "ph", "methane", "cost", "available")
+        return cls(
+            names=tuple(str(r["name"]) for r in records),
+            **{c: np.array([float(r[c]) for r in records], dtype=np.float64) for c in columns},
+        )
+
+
+DEFAULT_LIBRARY = Library.from_records([
+    {"name": "Cattle manure", "carbon": 80, "nitrogen": 4.0, "moisture": 0.80, "ph": 7.4,
+     "methane": 25, "cost": 2, "available": 200},
+    {"name": "Pig slurry", "carbon": 40, "nitrogen": 4.0, "moisture": 0.90, "ph": 7.6,
+     "methane": 15, "cost": 1, "available": 150},
+    {"name": "Poultry litter", "carbon": 200, "nitrogen": 20.0, "moisture": 0.40, "ph": 7.8,
+     "methane": 90, "cost": 15, "available": 40},
+    {"name": "Food waste", "carbon": 120, "nitrogen": 7.0, "moisture": 0.75, "ph": 5.0,
+     "methane": 110, "cost": -30, "available": 60},
+    {"name": "Maize silage", "carbon": 150, "nitrogen": 4.0, "moisture": 0.67, "ph": 3.9,
+     "methane": 105, "cost": 35, "available": 120},
+    {"name": "Grass silage", "carbon": 155, "nitrogen": 6.5, "moisture": 0.65, "ph": 4.5,
+     "methane": 95, "cost": 30, "available": 80},
+    {"name": "Wheat straw", "carbon": 400, "nitrogen": 5.0, "moisture": 0.12, "ph": 7.0,
+     "methane": 180, "cost": 60, "available": 30},
+    {"name": "Sewage sludge", "carbon": 90, "nitrogen": 9.0, "moisture": 0.80, "ph": 7.0,
+     "methane": 40, "cost": -10, "available": 50},
+    {"name": "Fruit & veg waste", "carbon": 60, "nitrogen": 2.5, "moisture": 0.85, "ph": 4.5,
+     "methane": 60, "cost": -15, "available": 40},
+    {"name": "Crude glycerol", "carbon": 380, "nitrogen": 0.5, "moisture": 0.15, "ph": 6.5,
+     "methane": 400, "cost": 120, "available": 10},
+])
+
+
+@dataclass(frozen=True, slots=True)
+class Blend:
+    demand: float
+    tonnes: np.ndarray  # per feedstock, t/day
+    cost: float  # $/day
+    methane: float  # m3 CH4/day
+    cn_ratio: float
+    moisture: float
+    ph: float
+    iterations: int
+
+
+@dataclass(frozen=True, slots=True)
+class _Problem:
+    a: np.ndarray  # (rows, columns): feedstocks, then one slack per row
+    b: np.ndarray
+    c: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+
+
+def _problem(library, demand, methane_value, cn=CN_RANGE, moisture=MOISTURE_RANGE, ph=PH_RANGE):
+    lib = library
+    rows = np.array([
+        np.ones(len(lib)),  # Σx = demand (slack fixed at 0)
+        lib.carbon - cn[1] * lib.nitrogen,  # C/N ≤ max
+        cn[0] * lib.nitrogen - lib.carbon,  # C/N ≥ min
+        lib.moisture,  # ≤ max · demand
+        -lib.moisture,  # ≥ min · demand
+        lib.ph,
+        -lib.ph,
+    ])
+    b = np.array([demand, 0.0, 0.0, moisture[1] * demand, -moisture[0] * demand, ph[1] * demand, -ph[0] * demand])
+    x_upper = np.minimum(lib.available, demand)
+    if x_upper.sum() < demand * (1 - 1e-9):
+        raise Infeasible(f"only {lib.available.sum():,.1f} t/day available for a demand of {demand:,.1f}")
+    # Slacks are boxed too: nothing can push a row further than its full swing
+    slack_upper = np.abs(rows) @ x_upper + np.abs(b) + 1.0
+    slack_upper[0] = 0.0
+    m = len(rows)
+    return _Problem(
+        a=np.hstack([rows, np.eye(m)]),
+        b=b,
+        c=np.concatenate([lib.cost - methane_value * lib.methane, np.zeros(m)]),
+        lower=np.zeros(len(lib) + m),
+        upper=np.concatenate([x_upper, slack_upper]),
+    )
+
+
+def _dual_simplex(p, basis=None, at_upper=None, max_iter=None):
+    """Bounded dual simplex; returns (x, basis, at_upper, iterations)."""
+    m, n = p.a.shape
+    if basis is None:
+        basis = np.arange(n - m, n)
+    basis = basis.copy()
+    in_basis = np.zeros(n, dtype=bool)
+    in_basis[basis] = True
+    if at_upper is None:
+        at_upper = p.c < 0
+    at_upper = at_upper & ~in_basis
+    fixed = p.upper - p.lower <= TOL
+    max_iter = max_iter or 50 * (n + m)
+
+    for iteration in range(max_iter):
+        b_mat = p.a[:, basis]
+        x_n = np.where(at_upper, p.upper, p.lower)
+        x_n[in_basis] = 0.0
+        x_b = np.linalg.solve(b_mat, p.b - p.a @ x_n)
+        y = np.linalg.solve(b_mat.T, p.c[basis])
+        d = p.c - y @ p.a
+
+        # Dual feasibility is kept by construction; restore bound placement
+        # after warm starts where bounds moved or collapsed
+        at_upper = np.where(in_basis, False, np.where(d < -TOL, True, np.where(d > TOL, False, at_upper)))
+
+        low, high = p.lower[basis], p.upper[basis]
+        infeasibility = np.maximum(low - x_b, x_b - high)
+        r = int(infeasibility.argmax())
+        if infeasibility[r] <= 1e-7 * (1 + np.abs(x_b).max()):
+            x = np.where(at_upper, p.upper, p.lower)
+            x[basis] = x_b
+            return x, basis, at_upper, iteration
+
+        to_lower = x_b[r] < low[r]
+        sign = 1.0 if to_lower else -1.0
+        rho = np.linalg.solve(b_mat.T, np.eye(m)[r])
+        alpha = rho @ p.a
+        s_alpha = sign * alpha
+        candidates = ~in_basis & ~fixed & (
+            (~at_upper & (s_alpha < -TOL)) | (at_upper & (s_alpha > TOL))
+        )
+        if not candidates.any():
+            raise Infeasible("no blend meets the constraints with the feedstocks available")
+        ratio = np.full(n, np.inf)
+        ratio[candidates] = np.abs(d[candidates]) / np.abs(alpha[candidates])
+        best = ratio.min()
+        # Among ties take the largest pivot for numerical stability
+        ties = np.flatnonzero(ratio <= best + 1e-12)
+        q = int(ties[np.abs(alpha[ties]).argmax()])
+
+        leaving = basis[r]
+        in_basis[leaving] = False
+        at_upper[leaving] = not to_lower
+        basis[r] = q
+        in_basis[q] = True
+        at_upper[q] = False
+
+    raise RuntimeError("dual simplex did not converge")
+
+
+def _blend(library, demand, x, iterations):
+    tonnes = np.clip(x[:len(library)], 0.0, None)
+    carbon = float(library.carbon @ tonnes)
+    nitrogen = float(library.nitrogen @ tonnes)
+    total = float(tonnes.sum()) or 1.0
+    return Blend(
+        demand=demand,
+        tonnes=tonnes,
+        cost=float(library.cost @ tonnes),
+        methane=float(library.methane @ tonnes),
+        cn_ratio=carbon / nitrogen if nitrogen else float("inf"),
+        moisture=float(library.moisture @ tonnes) / total,
+        ph=float(library.ph @ tonnes) / total,
+        iterations=iterations,
+    )
+
+
+def solve(library, demand, methane_value=0.3, **ranges):
+    """Optimal blend for ``demand`` tonnes/day; raises Infeasible.
+
+    ``methane_value`` ($ per m3 CH4) trades cost against yield; keyword
+    ranges (cn, moisture, ph) override the Feedstock Preparation spec.
+    """
+    x, _, _, iterations = _dual_simplex(_problem(library, demand, methane_value, **ranges))
+    return _blend(library, demand, x, iterations)
+
+
+def solve_batch(library, demands, methane_value=0.3, **ranges):
+    """Blends for many demand scenarios, in input order; None where infeasible.
+
+    Scenarios are solved in ascending demand, each warm-started from the
+    previous optimal basis, which stays dual feasible because only the
+    right-hand side and the bounds change.
+    """
+    demands = np.asarray(demands, dtype=np.float64)
+    results = [None] * len(demands)
+    basis = at_upper = None
+    for k in np.argsort(demands, kind="stable"):
+        try:
+            problem = _problem(library, float(demands[k]), methane_value, **ranges)
+            x, basis, at_upper, iterations = _dual_simplex(problem, basis, at_upper)
+        except Infeasible:
+            # The last optimal basis is still the best start for the next one
+            continue
+        results[k] = _blend(library, float(demands[k]), x, iterations)
+    return results
@@ -0,0 +1,228 @@
+"""Energy system catalog loaded from data/systems.toml.
+
+The catalog is parsed and validated once per process into frozen, slotted
+dataclasses, so a page rerun only renders and never re-reads or re-checks
+the content.
+"""
+
+import os
+import re
+import tomllib
+from dataclasses import MISSING, dataclass
+from functools import lru_cache
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "systems.toml")
+
+
+class CatalogError(ValueError):
+    """Raised when data/systems.toml is missing fields or inconsistent."""
+
+
+@dataclass(frozen=True, slots=True)
+class Theme:
+    accent: str
+    header_end: str
+    light: str
+    card_end: str
+
+
+@dataclass(frozen=True, slots=True)
+class Summary:
+    system: str
+    typical_power: str
+    efficiency: str
+    capacity_factor: str
+    lcoe: str
+
+    def range(self, field):
+        """(low, high) of a numeric range field such as "15-25%" or "50-120"."""
+        numbers = re.findall(r"\d+(?:\.\d+)?", getattr(self, field))
+        if len(numbers) != 2:
+            raise CatalogError(f"summary.{field} of {self.system}: expected a 'low-high' range")
+        return float(numbers[0]), float(numbers[1])
+
+
+@dataclass(frozen=True, slots=True)
+class Costs:
+    """Triangular (low, mode, high) cost assumptions for the LCOE model."""
+
+    capex: tuple  # $ per kW installed
+    opex: tuple  # $ per kW per year, fixed O&M
+    lifetime: int  # years
+    fuel: tuple = (0.0, 0.0, 0.0)  # $ per MWh of fuel energy
+
+
+@dataclass(frozen=True, slots=True)
+class Component:
+    name: str
+    description: str
+    specs: str
+    function: str
+    image: str
+
+
+@dataclass(frozen=True, slots=True)
+class Analysis:
+    title: str
+    body: str
+
+
+@dataclass(frozen=True, slots=True)
+class Assembly:
+    heading: str
+    subheading: str
+    task: str
+    prompt: str
+    label: str
+    help: str
+    submit_label: str
+    hint_label: str
+    success: str
+    failure_hint: str
+    hint: str
+    order_preview: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class EnergySystem:
+    key: str
+    page: str
+    name: str
+    title: str
+    icon: str
+    label: str
+    nav_label: str
+    difficulty: str
+    difficulty_label: str
+    theme: Theme
+    summary: Summary
+    overview_image: str
+    overview_caption: str
+    specs: str
+    components: tuple
+    correct_order: tuple
+    assembly: Assembly
+    analysis: tuple
+    footer: str = ""
+    costs: Costs = None  # optional; utils.lcoe falls back to the summary LCOE range
+
+    @property
+    def page_path(self):
+        return f"pages/{self.page}.py"
+
+    @property
+    def component_names(self):
+        return tuple(c.name for c in self.components)
+
+    def component(self, name):
+        for c in self.components:
+            if c.name == name:
+                return c
+        raise KeyError(name)
+
+
+@dataclass(frozen=True, slots=True)
+class Catalog:
+    systems: tuple
+
+    def __len__(self):
+        return len(self.systems)
+
+    def __iter__(self):
+        return iter(self.systems)
+
+    def get(self, key):
+        for system in self.systems:
+            if system.key == key:
+                return system
+        raise KeyError(key)
+
+    def neighbours(self, key):
+        """Return the (previous, next) systems around ``key``; None at either end."""
+        keys = [s.key for s in self.systems]
+        i = keys.index(key)
+        prev = self.systems[i - 1] if i > 0 else None
+        nxt = self.systems[i + 1] if i + 1 < len(self.systems) else None
+        return prev, nxt
+
+    @property
+    def max_score(self):
+        return 100 * len(self.systems)
+
+
+def _build(cls, data, where):
+    if not isinstance(data, dict):
+        raise CatalogError(f"{where}: expected a table, got {type(data).__name__}")
+    fields = cls.__dataclass_fields__
+    unknown = set(data) - set(fields)
+    if unknown:
+        raise CatalogError(f"{where}: unknown field(s) {', '.join(sorted(unknown))}")
+    missing = [name for name, f in fields.items() if name not in data and f.default is MISSING]
+    if missing:
+        raise CatalogError(f"{where}: missing field(s) {', '.join(missing)}")
+    return cls(**data)
+
+
+def _parse_costs(data, where):
+    costs = _build(Costs, data, where)
+    triangles = {}
+    for field in ("capex", "opex", "fuel"):
+        value = getattr(costs, field)
+        try:
+            low, mode, high = (float(v) for v in value)
+        except (TypeError, ValueError):
+            raise CatalogError(f"{where}.{field}: expected [low, mode, high]") from None
+        if not 0 <= low <= mode <= high:
+            raise CatalogError(f"{where}.{field}: expected 0 <= low <= mode <= high")
+        triangles[field] = (low, mode, high)
+    if not isinstance(costs.lifetime, int) or costs.lifetime <= 0:
+        raise CatalogError(f"{where}.lifetime: expected a positive number of years")
+    return Costs(lifetime=costs.lifetime, **triangles)
+
+
+def _parse_system(raw, index):
+    raw = dict(raw)
+    where = f"systems.{raw.get('key', index)}"
+
+    try:
+        raw["theme"] = _build(Theme, raw["theme"], f"{where}.theme")
+        raw["summary"] = _build(Summary, raw["summary"], f"{where}.summary")
+        raw["assembly"] = _build(Assembly, raw["assembly"], f"{where}.assembly")
+        if "costs" in raw:
+            raw["costs"] = _parse_costs(raw["costs"], f"{where}.costs")
+        raw["components"] = tuple(
+            _build(Component, c, f"{where}.components[{i}]") for i, c in enumerate(raw["components"])
+        )
+        raw["analysis"] = tuple(
+            _build(Analysis, a, f"{where}.analysis[{i}]") for i, a in enumerate(raw.get("analysis", ()))
+        )
+    except KeyError as exc:
+        raise CatalogError(f"{where}: missing field {exc.args[0]}") from None
+    raw["correct_order"] = tuple(raw.get("correct_order", ()))
+    system = _build(EnergySystem, raw, where)
+
+    names = system.component_names
+    if len(set(names)) != len(names):
+        raise CatalogError(f"{where}: duplicate component names")
+    if sorted(system.correct_order) != sorted(names):
+        raise CatalogError(f"{where}: correct_order must list every component exactly once")
+    for field in ("efficiency", "capacity_factor", "lcoe"):
+        system.summary.range(field)
+    return system
+
+
+def parse_catalog(data):
+    systems = tuple(_parse_system(raw, i) for i, raw in enumerate(data.get("systems", ())))
+    if not systems:
+        raise CatalogError("catalog defines no systems")
+    for attr in ("key", "page"):
+        values = [getattr(s, attr) for s in systems]
+        if len(set(values)) != len(values):
+            raise CatalogError(f"duplicate system {attr} in catalog")
+    return Catalog(systems)
+
+
+@lru_cache(maxsize=None)
+def load_catalog(path=CATALOG_PATH):
+    with open(path, "rb") as fh:
+        return parse_catalog(tomllib.load(fh))
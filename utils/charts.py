@@ -0,0 +1,131 @@
+"""Downsampled line charts for long time series.
+
+A year of hourly dispatch is 8,760 points per series, a year of 1-minute
+irradiance 525,600, and Vega-Lite gets every one of them over the websocket
+and draws them into a chart a few hundred pixels wide. line_chart() reduces
+each series to about one point per pixel column before the data frame is
+serialized:
+
+    lttb     Largest-Triangle-Three-Buckets (Steinarsson 2013): one point
+             per bucket, the one forming the largest triangle with the point
+             kept before it and the mean of the next bucket. Keeps the
+             visual shape of smooth and noisy series alike.
+    minmax   the minimum and maximum of every bucket, so no peak or dip is
+             ever lost; twice the points, fully vectorized.
+
+The chart has a zoom range slider. Moving it reruns the tool's fragment,
+which slices the full-resolution arrays on the server and downsamples only
+that window, so zooming into a day of the year shows every minute.
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+DEFAULT_POINTS = 800  # about the pixel width of a wide column
+
+
+def minmax_indices(y, buckets):
+    """Indices of the first, last, minimum and maximum point of every bucket."""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= 2 * buckets:
+        return np.arange(n)
+    size = -(-n // buckets)
+    rows = -(-n // size)
+    low = np.full(rows * size, np.inf)
+    high = np.full(rows * size, -np.inf)
+    low[:n] = high[:n] = y
+    base = np.arange(rows) * size
+    picks = [[0, n - 1], base + low.reshape(rows, size).argmin(axis=1), base + high.reshape(rows, size).argmax(axis=1)]
+    return np.unique(np.concatenate(picks))
+
+
+def lttb_indices(x, y, threshold):
+    """Indices of ``threshold`` points chosen by Largest-Triangle-Three-Buckets."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if threshold < 3 or n <= 2 * threshold:
+        return np.arange(n)
+    # First and last points are kept; the rest split into threshold - 2 buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    cum_x = np.concatenate([[0.0], np.cumsum(x)])
+    cum_y = np.concatenate([[0.0], np.cumsum(y)])
+    out = np.empty(threshold, dtype=np.intp)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for k in range(threshold - 2):
+        lo, hi = edges[k], edges[k + 1]
+        if k + 2 < len(edges):
+            nlo, nhi = hi, edges[k + 2]
+            avg_x = (cum_x[nhi] - cum_x[nlo]) / (nhi - nlo)
+            avg_y = (cum_y[nhi] - cum_y[nlo]) / (nhi - nlo)
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        # Twice the triangle area (a, candidate, next-bucket mean)
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        out[k + 1] = a
+    return out
+
+
+def downsample(x, series, points=DEFAULT_POINTS, method="lttb", shared=False):
+    """Long-format frame (x, series, value) with about ``points`` points per series.
+
+    ``shared`` keeps the union of every series' picks for all of them, so
+    stacked areas line up on the same x values.
+    """
+    x = np.asarray(x)
+    if method == "minmax":
+        picks = {name: minmax_indices(y, max(points // 2, 1)) for name, y in series.items()}
+    elif method == "lttb":
+        picks = {name: lttb_indices(x, y, points) for name, y in series.items()}
+    else:
+        raise ValueError(f"unknown downsampling method {method!r}")
+    if shared:
+        union = np.unique(np.concatenate(list(picks.values())))
+        picks = dict.fromkeys(series, union)
+    return pd.DataFrame({
+        "x": np.concatenate([x[picks[name]] for name in series]),
+        "series": np.repeat(list(series), [len(picks[name]) for name in series]),
+        "value": np.concatenate([np.asarray(y)[picks[name]] for name, y in series.items()]),
+    })
+
+
+def window(x, lo, hi):
+    """Slice bounds of the sorted ``x`` covering [lo, hi]."""
+    return slice(int(np.searchsorted(x, lo, side="left")), int(np.searchsorted(x, hi, side="right")))
+
+
+def spec(x_title, y_title, stack=False, colors=None, height=280):
+    color = {"field": "series", "type": "nominal", "title": None}
+    if colors:
+        color["scale"] = {"domain": list(colors), "range": list(colors.values())}
+    return {
+        "mark": {"type": "area", "opacity": 0.85} if stack else {"type": "line", "strokeWidth": 1},
+        "encoding": {
+            "x": {"field": "x", "type": "quantitative", "title": x_title},
+            "y": {"field": "value", "type": "quantitative", "title": y_title, "stack": True if stack else None},
+            "color": color,
+        },
+        "height": height,
+    }
+
+
+def line_chart(x, series, key, x_title, y_title, points=DEFAULT_POINTS, method="lttb", stack=False,
+               colors=None, height=280):
+    """Chart ``series`` (name -> array over the sorted ``x``) downsampled, with a zoom slider.
+
+    Call inside a fragment so zooming reruns only the tool. Stacked charts
+    use shared picks so the areas line up.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    lo, hi = st.slider("🔍 Zoom", float(x[0]), float(x[-1]), (float(x[0]), float(x[-1])), key=f"{key}_zoom")
+    span = window(x, lo, hi)
+    if span.stop - span.start < 2:
+        span = slice(span.start, min(span.start + 2, len(x)))
+    data = downsample(x[span], {name: np.asarray(y)[span] for name, y in series.items()}, points, method, stack)
+    st.vega_lite_chart(data, spec(x_title, y_title, stack, colors, height), use_container_width=True)
+    total = (span.stop - span.start) * len(series)
+    st.caption(f"📉 {len(data):,} of {total:,} points drawn ({method}); zoom in for full resolution.")
@@ -0,0 +1,342 @@
+"""Hourly dispatch of a hybrid solar, wind, hydro, biomass and battery system.
+
+Solar and wind are taken as they come. Deficits are then covered in merit
+order: battery, then hydro from its reservoir, then biomass up to its
+capacity; what is left is unmet load. Surplus charges the battery and the
+rest is curtailed.
+
+Storage makes dispatch sequential, but every storage step here has the form
+
+    s ↦ clip(s + a_t, 0, capacity)
+
+where a_t depends only on the hour's net load, not on s. Battery a_t is
+charge or discharge capped at the power rating, and reservoir a_t is
+inflow minus the release wanted. Such clipped shifts compose into another
+clipped shift,
+
+    clip(clip(s + a, l₁, h₁) + b, l₂, h₂) = clip(s + a + b, clip(l₁ + b, l₂, h₂), clip(h₁ + b, l₂, h₂))
+
+so the state of charge over the year is a prefix scan. clip_scan() splits
+the 8760 hours into 94 blocks of 94 and composes the maps inside all blocks
+at once. It then chains the 94 block maps, and fills in the hours of all
+blocks at once. That is about 280 vectorized steps instead of 8760 Python
+iterations, with O(hours) work. The arrays are (hours, mixes), so batches
+of capacity mixes dispatch together. Costs come from the catalog's LCOE
+and capacity factor ranges.
+"""
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from utils import hydro, memo, wind, workers
+from utils.catalog import load_catalog
+
+HOURS = 8760
+BATTERY_EFFICIENCY = 0.90  # round trip
+BATTERY_COST_MWH_YEAR = 35_000.0  # $ per MWh of storage per year, annualized capex
+BATTERY_COST_MW_YEAR = 10_000.0  # $ per MW of converter per year
+HYDRO_NATURAL_CF = 0.50  # inflow energy as a share of hydro capacity
+BIOMASS_FIXED_SHARE = 0.4  # the rest of biomass LCOE is fuel, paid per MWh
+BATCH_CHUNK = 256  # mixes per scan; bounds memory at a few (8760, 256) arrays
+
+SOURCES = ("solar", "wind", "hydro", "biomass")  # what the model dispatches; other catalog systems are left out
+# (lcoe $/MWh, capacity factor %) ranges for a source the catalog no longer lists
+FALLBACK_RANGES = {
+    "solar": ((50.0, 120.0), (15.0, 25.0)),
+    "wind": ((30.0, 80.0), (25.0, 40.0)),
+    "hydro": ((20.0, 100.0), (40.0, 60.0)),
+    "biomass": ((60.0, 150.0), (70.0, 85.0)),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Profiles:
+    """Hourly shapes for one year: load peaks at 1, resources are per MW installed."""
+
+    load: np.ndarray
+    solar: np.ndarray  # MWh per MW per hour
+    wind: np.ndarray
+    hydro_inflow: np.ndarray  # reservoir inflow, MWh per MW of turbine per hour
+
+
+@dataclass(frozen=True, slots=True)
+class Mix:
+    solar_mw: float = 50.0
+    wind_mw: float = 120.0
+    hydro_mw: float = 50.0
+    biomass_mw: float = 25.0
+    battery_mw: float = 25.0
+    battery_mwh: float = 150.0
+    reservoir_hours: float = 500.0  # reservoir size in hours at full turbine output
+
+
+@dataclass(frozen=True, slots=True)
+class DispatchResult:
+    """Annual totals (MWh) per mix; ``hourly`` holds (hours, mixes) series if requested."""
+
+    load: np.ndarray
+    unmet: np.ndarray
+    curtailed: np.ndarray
+    generation: dict  # source -> MWh delivered to load
+    battery_losses: np.ndarray
+    cost: np.ndarray  # $ per year
+    hourly: dict = None
+
+    @property
+    def served(self):
+        return self.load - self.unmet
+
+    @property
+    def unmet_share(self):
+        return self.unmet / self.load
+
+    @property
+    def lcoe(self):
+        """Blended cost per MWh of load actually served ($/MWh)."""
+        return self.cost / np.maximum(self.served, 1e-9)
+
+
+@lru_cache(maxsize=1)
+def catalog_costs():
+    """(fixed $/MW-year, variable $/MWh) per source from the catalog mid-ranges.
+
+    A MW-year costs the mid LCOE times the energy it makes at the mid
+    capacity factor, so a plant run below its typical capacity factor costs
+    more per MWh. Biomass pays part of its LCOE per MWh as fuel. Sources
+    missing from the catalog use FALLBACK_RANGES.
+    """
+    catalog = {system.key: system.summary for system in load_catalog()}
+    costs = {}
+    for key in SOURCES:
+        if key in catalog:
+            lcoe_range, cf_range = catalog[key].range("lcoe"), catalog[key].range("capacity_factor")
+        else:
+            lcoe_range, cf_range = FALLBACK_RANGES[key]
+        lcoe = sum(lcoe_range) / 2
+        cf = sum(cf_range) / 200
+        fixed_share = BIOMASS_FIXED_SHARE if key == "biomass" else 1.0
+        costs[key] = (lcoe * cf * HOURS * fixed_share, lcoe * (1 - fixed_share))
+    return costs
+
+
+def _ar1(rng, n, phi):
+    noise = rng.standard_normal(n) * math.sqrt(1 - phi * phi)
+    out = np.empty(n)
+    out[0] = rng.standard_normal()
+    for k in range(1, n):
+        out[k] = phi * out[k - 1] + noise[k]
+    return out
+
+
+@lru_cache(maxsize=4)
+def profiles(seed=0, latitude=40.0, mean_wind=7.5):
+    """Synthetic hourly load, solar, wind and hydro inflow for one year."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(HOURS)
+    day, hour = t // 24, t % 24
+
+    # Load: morning and evening peaks on a seasonal base
+    load = (0.55 + 0.1 * np.cos(2 * np.pi * (day - 15) / 365)
+            + 0.2 * np.exp(-((hour - 8) / 2.5) ** 2) + 0.3 * np.exp(-((hour - 19) / 3) ** 2)
+            + 0.03 * _ar1(rng, HOURS, 0.9))
+    load /= load.max()
+
+    # Solar: clear sky from the sun's elevation times a daily clearness
+    lat = np.radians(latitude)
+    decl = np.radians(23.44) * np.sin(2 * np.pi * (284 + day + 1) / 365)
+    sin_elev = np.sin(lat) * np.sin(decl) + np.cos(lat) * np.cos(decl) * np.cos(np.radians((hour + 0.5 - 12) * 15))
+    clearness = np.repeat(np.clip(rng.beta(5, 1.5, 365), 0.15, 1.0), 24)
+    solar = np.clip(sin_elev, 0, None) ** 1.15 * clearness
+
+    # Wind: Rayleigh speeds from two AR(1) components, mildly seasonal
+    sigma = mean_wind / math.sqrt(math.pi / 2)
+    speed = sigma * np.sqrt(_ar1(rng, HOURS, 0.97) ** 2 + _ar1(rng, HOURS, 0.97) ** 2)
+    speed *= 1 + 0.15 * np.cos(2 * np.pi * (day - 15) / 365)
+    turbine = wind.DEFAULT_TURBINE
+    wind_pu = wind.power_at(speed, turbine) / turbine.rated_kw
+
+    inflow = hydro.synthetic_inflow(years=1, mean_flow=1.0, seed=seed)
+    hydro_inflow = np.repeat(inflow, 24)[:HOURS] * HYDRO_NATURAL_CF
+
+    arrays = [load, solar, wind_pu, hydro_inflow]
+    for array in arrays:
+        array.setflags(write=False)
+    return Profiles(*arrays)
+
+
+def clip_scan(shift, capacity, initial):
+    """States s_t = clip(s_{t-1} + shift_t, 0, capacity) for every t, by blocked scan.
+
+    ``shift`` is (hours, mixes); ``capacity`` and ``initial`` broadcast to (mixes,).
+    """
+    shift = np.asarray(shift, dtype=np.float64)
+    hours, n = shift.shape
+    cap = np.broadcast_to(np.asarray(capacity, dtype=np.float64), (n,))
+    block = max(math.isqrt(hours), 1)
+    blocks = -(-hours // block)
+    # Zero shifts are identity maps on [0, capacity], so padding is harmless
+    padded = np.zeros((blocks * block, n))
+    padded[:hours] = shift
+    steps = padded.reshape(blocks, block, n).transpose(1, 0, 2)  # (step in block, block, mix)
+
+    # 1. Compose the maps inside every block at once
+    add = steps[0].copy()
+    low = np.zeros((blocks, n))
+    high = np.broadcast_to(cap, (blocks, n)).copy()
+    for b in steps[1:]:
+        add += b
+        np.minimum(np.maximum(low + b, 0, out=low), cap, out=low)
+        np.minimum(np.maximum(high + b, 0, out=high), cap, out=high)
+
+    # 2. Chain the block maps to get the state entering each block
+    starts = np.empty((blocks, n))
+    state = np.broadcast_to(np.asarray(initial, dtype=np.float64), (n,)).copy()
+    for k in range(blocks):
+        starts[k] = state
+        state = np.minimum(np.maximum(state + add[k], low[k]), high[k])
+
+    # 3. Fill in the states inside every block at once
+    out = np.empty_like(steps)
+    state = starts
+    for j, b in enumerate(steps):
+        state = np.minimum(np.maximum(state + b, 0), cap)
+        out[j] = state
+    return out.transpose(1, 0, 2).reshape(-1, n)[:hours]
+
+
+def _column(values, n):
+    return np.broadcast_to(np.asarray(values, dtype=np.float64), (n,))
+
+
+def dispatch(mixes, peak_mw=100.0, profile=None, hourly=False):
+    """Dispatch one year for every mix.
+
+    ``mixes`` is a Mix or a dict of equal-length arrays with Mix field names
+    (missing fields take the Mix defaults).
+    """
+    profile = profile or profiles()
+    if isinstance(mixes, Mix):
+        mixes = {name: [getattr(mixes, name)] for name in Mix.__slots__}
+    n = max(len(np.atleast_1d(v)) for v in mixes.values())
+    mix = {name: _column(mixes.get(name, getattr(Mix(), name)), n) for name in Mix.__slots__}
+
+    load = peak_mw * profile.load[:, None]
+    solar = mix["solar_mw"] * profile.solar[:, None]
+    wind_mw = mix["wind_mw"] * profile.wind[:, None]
+    net = load - solar - wind_mw  # positive: deficit
+
+    # Battery: charge from surplus, discharge into deficit, both capped at its power
+    eta = math.sqrt(BATTERY_EFFICIENCY)
+    power, energy = mix["battery_mw"], mix["battery_mwh"]
+    shift = np.where(net < 0, eta * np.minimum(-net, power), -np.minimum(net, power) / eta)
+    soc = clip_scan(shift, energy, 0.5 * energy)
+    delta = np.diff(soc, axis=0, prepend=(0.5 * energy)[None, :])
+    charged = np.maximum(delta, 0) / eta
+    discharged = np.maximum(-delta, 0) * eta
+    residual = net + charged - discharged
+
+    # Hydro: release what is wanted, limited by the water in the reservoir
+    reservoir = mix["hydro_mw"] * mix["reservoir_hours"]
+    inflow = mix["hydro_mw"] * profile.hydro_inflow[:, None]
+    wanted = np.minimum(np.maximum(residual, 0), mix["hydro_mw"])
+    shift = inflow - wanted
+    level = clip_scan(shift, reservoir, 0.5 * reservoir)
+    before = np.concatenate([(0.5 * reservoir)[None, :], level[:-1]])
+    shortfall = np.maximum(-(before + shift), 0)
+    hydro_out = wanted - shortfall
+    residual = residual - hydro_out
+
+    biomass = np.minimum(np.maximum(residual, 0), mix["biomass_mw"])
+    residual = residual - biomass
+    unmet = np.maximum(residual, 0)
+    curtailed = np.maximum(-residual, 0)
+
+    # Curtailment is shared by solar and wind in proportion to their output
+    vre = solar + wind_mw
+    with np.errstate(invalid="ignore", divide="ignore"):
+        kept = np.where(vre > 0, 1 - curtailed / vre, 0.0)
+    generation = {
+        "solar": (solar * kept).sum(axis=0),
+        "wind": (wind_mw * kept).sum(axis=0),
+        "hydro": hydro_out.sum(axis=0),
+        "biomass": biomass.sum(axis=0),
+    }
+
+    costs = catalog_costs()
+    cost = mix["battery_mwh"] * BATTERY_COST_MWH_YEAR + mix["battery_mw"] * BATTERY_COST_MW_YEAR
+    for key in SOURCES:
+        fixed, variable = costs[key]
+        cost = cost + mix[f"{key}_mw"] * fixed + generation[key] * variable
+
+    series = None
+    if hourly:
+        series = {
+            "load": np.broadcast_to(load, (len(load), n)), "solar": solar * kept, "wind": wind_mw * kept,
+            "hydro": hydro_out, "biomass": biomass, "battery": discharged - charged,
+            "unmet": unmet, "curtailed": curtailed, "soc": soc, "reservoir": level,
+        }
+    return DispatchResult(
+        load=np.full(n, load.sum()),
+        unmet=unmet.sum(axis=0),
+        curtailed=curtailed.sum(axis=0),
+        generation=generation,
+        battery_losses=charged.sum(axis=0) - discharged.sum(axis=0),
+        cost=cost,
+        hourly=series,
+    )
+
+
+def dispatch_batch(mixes, peak_mw=100.0, profile=None, chunk=BATCH_CHUNK):
+    """dispatch() over many mixes in chunks, concatenating the annual totals."""
+    n = max(len(np.atleast_1d(v)) for v in mixes.values())
+    parts = []
+    for start in range(0, n, chunk):
+        part = {k: _column(v, n)[start:start + chunk] for k, v in mixes.items()}
+        parts.append(dispatch(part, peak_mw, profile))
+    return DispatchResult(
+        load=np.concatenate([p.load for p in parts]),
+        unmet=np.concatenate([p.unmet for p in parts]),
+        curtailed=np.concatenate([p.curtailed for p in parts]),
+        generation={k: np.concatenate([p.generation[k] for p in parts]) for k in SOURCES},
+        battery_losses=np.concatenate([p.battery_losses for p in parts]),
+        cost=np.concatenate([p.cost for p in parts]),
+    )
+
+
+def random_mixes(n, peak_mw=100.0, seed=0):
+    """Capacity mixes sampled uniformly around the load, in MW and MWh."""
+    rng = np.random.default_rng(seed)
+    return {
+        "solar_mw": rng.uniform(0, 3, n) * peak_mw,
+        "wind_mw": rng.uniform(0, 3, n) * peak_mw,
+        "hydro_mw": rng.uniform(0, 0.6, n) * peak_mw,
+        "biomass_mw": rng.uniform(0, 0.8, n) * peak_mw,
+        "battery_mw": rng.uniform(0, 0.8, n) * peak_mw,
+        "battery_mwh": rng.uniform(0, 6, n) * peak_mw,
+        "reservoir_hours": np.full(n, Mix().reservoir_hours),
+    }
+
+
+def cheapest(result, max_unmet=0.01):
+    """Index of the lowest-LCOE mix serving all but ``max_unmet`` of the load, or None."""
+    ok = result.unmet_share <= max_unmet
+    if not ok.any():
+        return None
+    return int(np.flatnonzero(ok)[result.lcoe[ok].argmin()])
+
+
+@memo.persistent()
+def search(n=2000, peak_mw=100.0, seed=0):
+    """(mixes, DispatchResult) for ``n`` random mixes."""
+    mixes = random_mixes(n, peak_mw, seed)
+    return mixes, dispatch_batch(mixes, peak_mw)
+
+
+@lru_cache(maxsize=4)
+def cached_search(n=2000, peak_mw=100.0, seed=0):
+    """search() from the disk cache, else in the shared worker pool; kept for repeat views."""
+    hit, found = search.lookup(n, peak_mw, seed)
+    return found if hit else workers.run(search, n, peak_mw, seed)
@@ -0,0 +1,209 @@
+"""Partial-credit grading for the assembly challenges.
+
+Submissions are graded as index arrays: each submitted component is replaced
+by its position in the correct order, so a perfect answer is 0..n-1. A 2-D
+array grades a whole batch of submissions at once (one per row, padded with
+-1 on the right when shorter than n), and a single submission is just a batch
+of one, so the app and the offline grader share the same code path.
+
+The score combines three measures:
+
+- per-position correctness: steps placed exactly where they belong
+- longest common subsequence with the correct order (the longest run of
+  steps in the right relative order, not necessarily adjacent)
+- Kendall tau distance: the number of pairs of submitted steps that are in
+  the wrong relative order, counted with a bottom-up merge sort
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+PAD = -1
+
+POSITION_WEIGHT = 0.4
+LCS_WEIGHT = 0.3
+ORDER_WEIGHT = 0.3
+
+
+@dataclass(frozen=True, slots=True)
+class GradeResult:
+    score: int
+    total: int
+    submitted: int
+    correct_positions: int
+    lcs: int
+    inversions: int
+    first_misplaced: int | None  # 0-based step, None when the order is perfect
+
+    @property
+    def perfect(self):
+        return self.score == 100
+
+
+def encode_order(user_order, correct_order):
+    """Map component names to their index in ``correct_order``."""
+    index = {name: i for i, name in enumerate(correct_order)}
+    seen = set()
+    encoded = []
+    for name in user_order:
+        if name not in index:
+            raise ValueError(f"unknown component: {name!r}")
+        if name in seen:
+            raise ValueError(f"component listed twice: {name!r}")
+        seen.add(name)
+        encoded.append(index[name])
+    return encoded
+
+
+def encode_orders(orders, correct_order):
+    """Encode many submissions into a padded (batch, n) index array."""
+    n = len(correct_order)
+    out = np.full((len(orders), n), PAD, dtype=np.int32)
+    for row, order in enumerate(orders):
+        encoded = encode_order(order, correct_order)
+        out[row, :len(encoded)] = encoded
+    return out
+
+
+def _as_batch(indices):
+    arr = np.asarray(indices, dtype=np.int32)
+    if arr.ndim == 1:
+        arr = arr[None, :]
+    if arr.ndim != 2:
+        raise ValueError("expected a 1-D submission or a 2-D batch of submissions")
+    return arr
+
+
+def longest_increasing(batch):
+    """Length of the longest strictly increasing subsequence of each row.
+
+    Against the correct order 0..n-1 this is the LCS. Patience sorting: the
+    ``tails`` array keeps the smallest tail of an increasing run of each
+    length, and each column is placed with one binary search per row.
+    """
+    rows, n = batch.shape
+    tails = np.full((rows, n + 1), np.iinfo(np.int32).max, dtype=np.int64)
+    lengths = np.zeros(rows, dtype=np.int64)
+    row_ids = np.arange(rows)
+    for j in range(n):
+        x = batch[:, j]
+        valid = x != PAD
+        # tails rows are sorted, so the insertion point is a count
+        pos = (tails < x[:, None]).sum(axis=1)
+        tails[row_ids[valid], pos[valid]] = x[valid]
+        lengths = np.maximum(lengths, np.where(valid, pos + 1, 0))
+    return lengths
+
+
+def count_inversions(batch):
+    """Number of out-of-order pairs in each row (Kendall tau distance).
+
+    Bottom-up merge sort over the whole batch: at each width the two sorted
+    halves of every block are compared with a single searchsorted call by
+    offsetting each block into its own value range, then merged. Padding
+    sorts after every real step and never counts as an inversion.
+    """
+    rows, n = batch.shape
+    width = 1
+    while width < n:
+        width *= 2
+    size = max(width, 1)
+
+    # Padding becomes increasing values above n so it stays in place
+    values = np.empty((rows, size), dtype=np.int64)
+    values[:, :n] = batch
+    values[:, n:] = PAD
+    pad_mask = values == PAD
+    values[pad_mask] = (n + np.nonzero(pad_mask)[1]).astype(np.int64)
+
+    span = 2 * size + 1
+    inversions = np.zeros(rows, dtype=np.int64)
+    run = 1
+    while run < size:
+        blocks = values.reshape(rows, size // (2 * run), 2, run)
+        left = blocks[:, :, 0, :]
+        right = blocks[:, :, 1, :]
+        block_ids = np.arange(rows * (size // (2 * run)), dtype=np.int64).reshape(rows, -1, 1)
+        offset = block_ids * span
+        left_keys = (left + offset).ravel()
+        right_keys = (right + offset).ravel()
+        # Elements of the left half that are <= each right element
+        placed = np.searchsorted(left_keys, right_keys, side="right").reshape(right.shape)
+        placed -= (block_ids * run).astype(placed.dtype)
+        inversions += (run - placed).sum(axis=(1, 2))
+        values = np.sort(blocks.reshape(rows, -1, 2 * run), axis=2).reshape(rows, size)
+        run *= 2
+    return inversions
+
+
+def grade_indices(indices):
+    """Grade one submission or a batch of index arrays.
+
+    Returns a dict of 1-D arrays (one entry per submission): ``score`` out of
+    100, ``correct_positions``, ``lcs``, ``inversions``, ``submitted`` and
+    ``first_misplaced`` (-1 for a perfect order).
+    """
+    batch = _as_batch(indices)
+    rows, n = batch.shape
+    if not rows or not n:
+        # No submissions, or an empty order that every submission gets right
+        zeros = np.zeros(rows, dtype=np.int64)
+        return {
+            "score": np.full(rows, 100, dtype=np.int64),
+            "submitted": zeros,
+            "correct_positions": zeros,
+            "lcs": zeros,
+            "inversions": zeros,
+            "first_misplaced": np.full(rows, -1, dtype=np.int64),
+        }
+    target = np.arange(n, dtype=np.int32)
+
+    submitted = (batch != PAD).sum(axis=1)
+    matches = batch == target
+    correct_positions = matches.sum(axis=1)
+    lcs = longest_increasing(batch)
+    inversions = count_inversions(batch)
+
+    wrong = ~matches
+    first_misplaced = np.where(wrong.any(axis=1), wrong.argmax(axis=1), -1)
+
+    pairs = submitted * (submitted - 1) // 2
+    order_similarity = np.where(pairs > 0, 1 - inversions / np.maximum(pairs, 1), 1.0)
+    coverage = submitted / n if n else np.ones(rows)
+
+    raw = (
+        POSITION_WEIGHT * correct_positions / max(n, 1)
+        + LCS_WEIGHT * lcs / max(n, 1)
+        + ORDER_WEIGHT * order_similarity * coverage
+    )
+    score = np.floor(raw * 100 + 1e-9).astype(np.int64)
+    # Only an exact answer earns full marks
+    score = np.where(first_misplaced == -1, 100, np.minimum(score, 99))
+
+    return {
+        "score": score,
+        "submitted": submitted,
+        "correct_positions": correct_positions,
+        "lcs": lcs,
+        "inversions": inversions,
+        "first_misplaced": first_misplaced,
+    }
+
+
+def grade(user_order, correct_order):
+    """Grade a single submission of component names."""
+    indices = np.full(len(correct_order), PAD, dtype=np.int32)
+    encoded = encode_order(user_order, correct_order)
+    indices[:len(encoded)] = encoded
+    result = grade_indices(indices)
+    first = int(result["first_misplaced"][0])
+    return GradeResult(
+        score=int(result["score"][0]),
+        total=len(correct_order),
+        submitted=int(result["submitted"][0]),
+        correct_positions=int(result["correct_positions"][0]),
+        lcs=int(result["lcs"][0]),
+        inversions=int(result["inversions"][0]),
+        first_misplaced=None if first == -1 else first,
+    )
@@ -0,0 +1,467 @@
+"""Measured resource data: CSV ingestion into a memory-mapped columnar cache.
+
+The simulators take three kinds of measured input:
+
+    solar    TMY-style irradiance files (TMY3, NSRDB, PVGIS, logger exports):
+             irradiance in W/m², optional air temperature in °C
+    wind     wind speed logs: speed in m/s
+    inflow   river flow records: flow in m³/s
+
+A file is parsed once. The header row is found among the first HEADER_SCAN
+lines by matching column names against known aliases (``GHI (W/m^2)``,
+``Dry-bulb (C)``, ``Wind speed [km/h]``, ``Discharge (cfs)``, ...), and the
+unit in brackets picks the conversion to SI. A file without a recognizable
+header uses its last column, in SI units. The rows are then read
+CHUNK_ROWS at a time by pandas' C parser, and the converted float32 values
+are appended to one spool file per column, so memory stays at one chunk
+however large the file.
+
+Gaps stay in place as NaN rows, so a missing hour never shifts the
+samples after it. With a timestamp column every row is placed on the grid
+of the sample interval (given, or inferred from the first STEP_SAMPLE
+timestamps): missing intervals become NaN rows, and duplicate or
+out-of-order timestamps are dropped. Without one, empty and "NaN" values
+are kept as NaN rows. Rows with text in a value column (repeated headers,
+footers) or an unreadable timestamp are dropped. Consumers fill the NaNs as
+suits them: the MPPT year takes missing irradiance as 0 W/m², hydro
+interpolates inflow (column_chunks(interpolate=True)), and wind AEP skips
+missing samples.
+
+Each column ends up as a packed .npy file in
+
+    CACHE_DIR/ingest/<kind>-<key>/<column>.npy + meta.json
+
+where the key hashes the file's SHA-256, the kind, the unit overrides and
+the parser VERSION. Later loads of the same bytes, from any session or
+process, skip the parse: open_dataset() maps the arrays read-only, which
+takes microseconds and shares their pages between processes. The least
+recently used datasets are deleted once the directory passes MAX_BYTES.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import warnings
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+from utils import memo
+
+CACHE_DIR = os.path.join(memo.CACHE_DIR, "ingest")
+MAX_BYTES = int(os.environ.get("SUSTAINAPP_INGEST_BYTES", 2 << 30))
+VERSION = 2  # bump when parsing or units change to invalidate the cache
+CHUNK_ROWS = 1 << 16
+HEADER_SCAN = 50
+STEP_SAMPLE = 1000  # timestamps read to infer the sample interval
+DELIMITERS = ",;\t|"  # first wins a tie
+MAX_GAP_ROWS = 1 << 24  # a longer gap is a broken timestamp, not missing data
+
+# Column -> (names it goes by, required); names are compared after normalize()
+KINDS = {
+    "solar": {
+        "irradiance": (("ghi", "global horizontal irradiance", "global horizontal", "irradiance", "g(h)",
+                        "g(i)", "poa", "poa irradiance", "solar radiation", "radiation"), True),
+        "temp_c": (("temp air", "air temperature", "temperature", "dry bulb", "dry bulb temperature", "t2m",
+                    "tamb", "ambient temperature", "temp"), False),
+    },
+    "wind": {
+        "speed": (("wind speed", "windspeed", "wind", "ws", "wspd", "speed", "ws10m", "ws50m", "ws100m"), True),
+    },
+    "inflow": {
+        "flow": (("flow", "discharge", "inflow", "streamflow", "q"), True),
+    },
+}
+TIME_NAMES = ("timestamp", "datetime", "date time", "time", "time utc", "time(utc)")
+DEFAULT_STEP = {"solar": 60.0, "wind": 10.0, "inflow": 1440.0}  # minutes
+
+# unit -> (scale, offset) to SI; irradiance energies are per sample interval
+UNITS = {
+    "irradiance": {"w/m2": (1.0, 0.0), "kw/m2": (1000.0, 0.0)},
+    "temp_c": {"c": (1.0, 0.0), "degc": (1.0, 0.0), "°c": (1.0, 0.0),
+               "f": (5 / 9, -160 / 9), "degf": (5 / 9, -160 / 9), "°f": (5 / 9, -160 / 9), "k": (1.0, -273.15)},
+    "speed": {"m/s": (1.0, 0.0), "ms-1": (1.0, 0.0), "km/h": (1 / 3.6, 0.0), "kmh": (1 / 3.6, 0.0),
+              "kph": (1 / 3.6, 0.0), "mph": (0.44704, 0.0), "kn": (0.514444, 0.0), "kt": (0.514444, 0.0),
+              "kts": (0.514444, 0.0), "knots": (0.514444, 0.0)},
+    "flow": {"m3/s": (1.0, 0.0), "cumecs": (1.0, 0.0), "cms": (1.0, 0.0), "l/s": (1e-3, 0.0),
+             "cfs": (0.0283168466, 0.0), "ft3/s": (0.0283168466, 0.0), "ml/d": (1000 / 86400, 0.0),
+             "m3/d": (1 / 86400, 0.0)},
+}
+ENERGY_UNITS = {"wh/m2": 3600.0, "kwh/m2": 3.6e6, "mj/m2": 1e6, "j/cm2": 1e4}  # J/m² per unit
+SI_UNITS = {"irradiance": "w/m2", "temp_c": "c", "speed": "m/s", "flow": "m3/s"}
+
+_UNIT_SUFFIX = re.compile(r"^(.*?)\s*[\(\[]([^\)\]]*)[\)\]]\s*$")
+
+
+@dataclass(frozen=True, slots=True)
+class Dataset:
+    path: str
+    kind: str
+    rows: int
+    step_minutes: float
+    columns: dict  # column -> read-only memmap, SI units
+    units: dict  # column -> unit in the source file
+    source: dict  # file name, header, whether the step came from timestamps, missing rows, parse time
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+
+def normalize(name):
+    name = name.strip().strip('"').lower().replace("_", " ").replace("-", " ")
+    return " ".join(name.split())
+
+
+def normalize_unit(unit):
+    unit = unit.strip().lower().replace(" ", "").replace("²", "2").replace("³", "3").replace("^", "")
+    return unit.replace("·", "").replace("*", "")
+
+
+def file_hash(path, block=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(block), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def dataset_key(digest, kind, units=None, step_minutes=None):
+    options = json.dumps({"version": VERSION, "kind": kind, "units": units or {}, "step": step_minutes},
+                         sort_keys=True)
+    return f"{kind}-{hashlib.sha256(f'{digest}:{options}'.encode()).hexdigest()[:24]}"
+
+
+def _match(cell, names):
+    """(matched, unit or None) for one header cell against a column's names."""
+    full = normalize(cell)
+    if full in names:
+        return True, None
+    split = _UNIT_SUFFIX.match(cell.strip())
+    if split and normalize(split.group(1)) in names:
+        return True, normalize_unit(split.group(2))
+    return False, None
+
+
+def find_header(rows, kind):
+    """(row index, {column: (field index, unit)}, time index) of the header, or (None, {}, None)."""
+    for r, row in enumerate(rows):
+        found = {}
+        for column, (names, _) in KINDS[kind].items():
+            for i, cell in enumerate(row):
+                matched, unit = _match(cell, names)
+                if matched and i not in {f for f, _ in found.values()}:
+                    found[column] = (i, unit)
+                    break
+        if all(column in found for column, (_, required) in KINDS[kind].items() if required):
+            time_index = next((i for i, cell in enumerate(row) if normalize(cell) in TIME_NAMES), None)
+            return r, found, time_index
+    return None, {}, None
+
+
+def conversion(column, unit, step_minutes):
+    """(scale, offset) taking ``unit`` to the column's SI unit."""
+    if unit is None or unit == SI_UNITS[column]:
+        return 1.0, 0.0
+    table = UNITS[column]
+    if unit in table:
+        return table[unit]
+    if column == "irradiance" and unit in ENERGY_UNITS:
+        # Energy per interval -> mean power over the interval
+        return ENERGY_UNITS[unit] / (step_minutes * 60), 0.0
+    raise ValueError(f"unknown unit {unit!r} for {column}; expected one of {sorted(table)}")
+
+
+def _sniff(path):
+    with open(path, newline="", encoding="utf-8-sig", errors="replace") as fh:
+        head = [line for _, line in zip(range(HEADER_SCAN), fh)]
+    try:
+        delimiter = csv.Sniffer().sniff("".join(head), delimiters=DELIMITERS).delimiter
+    except csv.Error:
+        # Short or ragged samples: the candidate found on the most lines
+        delimiter = max(DELIMITERS, key=lambda d: sum(d in line for line in head))
+    return delimiter, list(csv.reader(io.StringIO("".join(head)), delimiter=delimiter))
+
+
+def _headerless(rows, kind):
+    """Use the last column of the first numeric row, in SI units."""
+    required = [column for column, (_, needed) in KINDS[kind].items() if needed]
+    for r, row in enumerate(rows):
+        try:
+            float(row[-1])
+        except (ValueError, IndexError):
+            continue
+        if len(required) == 1:
+            return r - 1, {required[0]: (len(row) - 1, None)}
+    expected = ", ".join(KINDS[kind][required[0]][0][:3])
+    raise ValueError(f"no {kind} header found (expected a column such as {expected})")
+
+
+def _time_format(values):
+    first = pd.Series(values).dropna()
+    return (guess_datetime_format(str(first.iloc[0])) if len(first) else None) or "mixed"
+
+
+def _times(values, fmt):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        return pd.to_datetime(pd.Series(values), errors="coerce", format=fmt)
+
+
+def _infer_step(times):
+    steps = np.diff(times.dropna().to_numpy()).astype("timedelta64[s]").astype(np.float64) / 60
+    steps = steps[steps > 0]
+    return float(np.median(steps)) if steps.size else None
+
+
+def _numeric(frame, index):
+    """(float64 values, junk mask) of one column read as text: junk is text that is not a number."""
+    text = frame[index]
+    values = pd.to_numeric(text, errors="coerce").to_numpy(np.float64)
+    return values, text.notna().to_numpy() & np.isnan(values)
+
+
+def parse(path, kind, out_dir, units=None, step_minutes=None, chunk_rows=CHUNK_ROWS):
+    """Stream a CSV file into one .npy per column in ``out_dir``; returns meta."""
+    if kind not in KINDS:
+        raise ValueError(f"unknown kind {kind!r}; expected one of {sorted(KINDS)}")
+    start = time.perf_counter()
+    delimiter, rows = _sniff(path)
+    header_row, found, time_index = find_header(rows, kind)
+    if header_row is None:
+        header_row, found = _headerless(rows, kind)
+    columns = list(found)
+    source_units = {column: (units or {}).get(column, unit) for column, (_, unit) in found.items()}
+    source_units = {column: normalize_unit(u) if u else None for column, u in source_units.items()}
+    indices = [found[column][0] for column in columns]
+    if time_index is not None:
+        indices.append(time_index)
+
+    # Text, so a blank value (a gap) can be told from text (a repeated header)
+    reader = pd.read_csv(
+        path, sep=delimiter, header=None, skiprows=header_row + 1, usecols=indices, chunksize=chunk_rows,
+        dtype=str, skipinitialspace=True, on_bad_lines="skip", encoding="utf-8-sig", encoding_errors="replace",
+        engine="c", low_memory=True,
+    )
+    spools = {column: open(os.path.join(out_dir, f".{column}.f32"), "wb") for column in columns}
+    convert, rows_total, missing, inferred = None, 0, 0, False
+    fmt = origin = None
+    gridded = False
+    last = -1  # grid slot of the last row written
+    try:
+        for frame in reader:
+            if convert is None:
+                if time_index is not None:
+                    fmt = _time_format(frame[time_index].iloc[:STEP_SAMPLE])
+                    sample = _times(frame[time_index].iloc[:STEP_SAMPLE], fmt)
+                    if step_minutes is None:
+                        step_minutes = _infer_step(sample)
+                        inferred = step_minutes is not None
+                    # Unreadable timestamps: keep the rows in file order instead
+                    gridded = step_minutes is not None and bool(sample.notna().any())
+                step_minutes = step_minutes or DEFAULT_STEP[kind]
+                convert = {column: conversion(column, source_units[column], step_minutes) for column in columns}
+            values, junk = {}, np.zeros(len(frame), dtype=bool)
+            for column in columns:
+                values[column], bad = _numeric(frame, found[column][0])
+                junk |= bad
+            keep = ~junk
+            if time_index is not None and gridded:
+                times = _times(frame[time_index], fmt)
+                keep &= times.notna().to_numpy()
+                if origin is None and keep.any():
+                    origin = times[keep].iloc[0]
+                slots = np.zeros(len(frame), dtype=np.int64)
+                minutes = (times[keep] - origin).dt.total_seconds().to_numpy() / 60
+                slots[keep] = np.rint(minutes / step_minutes).astype(np.int64)
+                # Only rows past every earlier row: drops duplicates and out-of-order stamps
+                kept = np.flatnonzero(keep)
+                before = np.maximum.accumulate(np.concatenate([[last], slots[kept]]))[:-1]
+                kept = kept[slots[kept] > before]
+                span = int(slots[kept[-1]] - last) if kept.size else 0
+                if span - kept.size > MAX_GAP_ROWS:
+                    raise ValueError(f"timestamps jump by {span - kept.size:,} intervals; check the time column")
+                place = slots[kept] - last - 1
+                last += span
+            else:
+                kept = np.flatnonzero(keep)
+                span, place = kept.size, np.arange(kept.size)
+            empty = np.ones(span, dtype=bool)
+            for column, v in values.items():
+                scale, offset = convert[column]
+                out = np.full(span, np.nan)
+                out[place] = v[kept] * scale + offset
+                if column == "irradiance":
+                    out = np.maximum(out, 0.0)  # night-time sensor offsets; NaN stays NaN
+                empty &= np.isnan(out)
+                spools[column].write(out.astype(np.float32).tobytes())
+            rows_total += span
+            missing += int(empty.sum())
+    finally:
+        for fh in spools.values():
+            fh.close()
+
+    size = 0
+    for column in columns:
+        spool = os.path.join(out_dir, f".{column}.f32")
+        raw = np.memmap(spool, dtype=np.float32, mode="r") if rows_total else np.zeros(0, np.float32)
+        packed = np.lib.format.open_memmap(os.path.join(out_dir, f"{column}.npy"), "w+", np.float32, (rows_total,))
+        for lo in range(0, rows_total, chunk_rows):
+            packed[lo:lo + chunk_rows] = raw[lo:lo + chunk_rows]
+        packed.flush()
+        size += packed.nbytes
+        del raw, packed
+        os.unlink(spool)
+    return {
+        "kind": kind,
+        "rows": rows_total,
+        "step_minutes": step_minutes or DEFAULT_STEP[kind],
+        "step_inferred": inferred,
+        "missing": missing,
+        "columns": columns,
+        "units": {column: u or SI_UNITS[column] for column, u in source_units.items()},
+        "header": rows[header_row] if header_row >= 0 else None,
+        "bytes": size,
+        "parse_seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+@lru_cache(maxsize=32)
+def open_dataset(path):
+    """The Dataset in ``path``, memory-mapped read-only; None if it is not complete."""
+    try:
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as fh:
+            meta = json.load(fh)
+        columns = {column: np.load(os.path.join(path, f"{column}.npy"), mmap_mode="r")
+                   for column in meta["columns"]}
+    except (OSError, ValueError, KeyError):
+        return None
+    return Dataset(path, meta["kind"], meta["rows"], meta["step_minutes"], columns, meta["units"],
+                   {k: meta.get(k) for k in ("file", "header", "step_inferred", "missing", "parse_seconds")})
+
+
+def ingest(path, kind, units=None, step_minutes=None, digest=None, name=None, directory=CACHE_DIR):
+    """The Dataset for a CSV file, parsed on the first call for its contents.
+
+    ``units`` overrides the unit read from the header per column (e.g.
+    {"speed": "km/h"}) and ``step_minutes`` the sample interval, otherwise
+    inferred from a timestamp column or DEFAULT_STEP. ``digest`` is the
+    file's SHA-256 if the caller already has it.
+    """
+    key = dataset_key(digest or file_hash(path), kind, units, step_minutes)
+    target = os.path.join(directory, key)
+    meta_path = os.path.join(target, "meta.json")
+    if os.path.exists(meta_path):
+        try:
+            os.utime(meta_path)  # recency for pruning
+        except OSError:
+            pass
+        dataset = open_dataset(target)
+        if dataset is not None:
+            return dataset
+
+    os.makedirs(directory, exist_ok=True)
+    work = tempfile.mkdtemp(prefix=f".{key}.", dir=directory)
+    try:
+        meta = parse(path, kind, work, units, step_minutes)
+        meta["file"] = name or os.path.basename(path)
+        # meta.json last, then one rename: readers see a whole dataset or none
+        with open(os.path.join(work, "meta.json"), "w", encoding="utf-8") as fh:
+            json.dump(meta, fh, indent=2)
+        _publish(work, target)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    open_dataset.cache_clear()
+    dataset = open_dataset(target)
+    if dataset is None:
+        raise OSError(f"could not open the cached dataset in {target}")
+    prune(directory)
+    return dataset
+
+
+def _publish(work, target):
+    """Rename ``work`` to ``target``, replacing an incomplete ``target`` left by a crash."""
+    try:
+        os.rename(work, target)
+        return
+    except OSError:
+        pass
+    open_dataset.cache_clear()
+    if open_dataset(target) is not None:
+        return  # another process finished the same file first
+    shutil.rmtree(target, ignore_errors=True)
+    os.rename(work, target)
+
+
+def ingest_upload(upload, kind, units=None, step_minutes=None, directory=CACHE_DIR):
+    """ingest() for a file-like upload, hashed while it is spooled to disk."""
+    digest = hashlib.sha256()
+    with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp:
+        for block in iter(lambda: upload.read(1 << 20), b""):
+            digest.update(block)
+            tmp.write(block)
+    try:
+        return ingest(tmp.name, kind, units, step_minutes, digest.hexdigest(),
+                      getattr(upload, "name", None), directory)
+    finally:
+        os.unlink(tmp.name)
+
+
+def _nearest_valid(values, index, direction, block=1 << 16):
+    """(index, value) of the nearest finite value from ``index`` on in ``direction``, or None."""
+    while 0 <= index < len(values):
+        lo, hi = (index, min(index + block, len(values))) if direction > 0 else (max(index - block + 1, 0), index + 1)
+        found = np.flatnonzero(np.isfinite(values[lo:hi]))
+        if found.size:
+            i = lo + int(found[0] if direction > 0 else found[-1])
+            return i, float(values[i])
+        index = hi if direction > 0 else lo - 1
+    return None
+
+
+def column_chunks(path, column, chunk, interpolate=False):
+    """Float64 chunks of one column of a cached dataset; picklable for the worker pool.
+
+    ``interpolate`` fills gaps linearly between the valid values around them,
+    across chunk boundaries; gaps at either end take the nearest value.
+    """
+    values = open_dataset(path)[column]
+    for start in range(0, len(values), chunk):
+        block = np.asarray(values[start:start + chunk], dtype=np.float64)
+        bad = np.isnan(block)
+        if interpolate and bad.any():
+            index = np.arange(start, start + len(block))
+            known = [p for p in (_nearest_valid(values, start - 1, -1),) if p]
+            known += zip(index[~bad], block[~bad])
+            known += [p for p in (_nearest_valid(values, start + len(block), 1),) if p]
+            if known:
+                xs, ys = zip(*known)
+                block[bad] = np.interp(index[bad], xs, ys)
+        yield block
+
+
+def prune(directory=CACHE_DIR, max_bytes=MAX_BYTES):
+    """Delete the least recently used datasets until the total fits ``max_bytes``."""
+    entries = []
+    for entry in os.scandir(directory):
+        meta = os.path.join(entry.path, "meta.json")
+        if entry.name.startswith(".") or not os.path.exists(meta):
+            continue
+        size = sum(f.stat().st_size for f in os.scandir(entry.path))
+        entries.append((os.stat(meta).st_mtime, size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        # Processes that mapped the files keep their mappings after the delete
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+    open_dataset.cache_clear()
@@ -0,0 +1,115 @@
+"""Monte Carlo levelized cost of electricity for each catalog system.
+
+LCOE per MWh is the annualized capital cost plus fixed O&M, spread over
+the energy one kW makes in a year, plus fuel for plants that burn it:
+
+    LCOE = (capex · CRF(r, n) + opex) · 1000 / (8760 · CF) + fuel / η
+    CRF(r, n) = r / (1 - (1 + r)⁻ⁿ)
+
+Capacity factor and conversion efficiency are drawn uniformly from the
+catalog summary ranges ("15-25%"). Capex, opex, fuel and the discount rate
+are triangular around the typical values in the system's catalog ``costs``
+table. A system without one gets a triangle over its summary LCOE range,
+peaking at the middle, so a system added only to data/systems.toml still
+has percentiles. Draws are made in
+chunks, so 10⁶ samples per system need only a few MB of working memory.
+Each system keeps its LCOE samples as float32, and the percentiles are read
+off those samples. distribution() is memoized per (system, draws, seed) in
+memory and in the disk cache, so a restarted server does not resample.
+"""
+
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from utils import memo
+from utils.catalog import load_catalog
+
+DRAWS = 1_000_000
+CHUNK = 1 << 17
+PERCENTILES = (10, 50, 90)
+DISCOUNT_RATE = (0.04, 0.07, 0.10)  # (low, mode, high), real
+
+
+@dataclass(frozen=True, slots=True)
+class LcoeDistribution:
+    system: str
+    draws: int
+    mean: float  # $/MWh
+    percentiles: dict  # percentile -> $/MWh
+    catalog_range: tuple  # (low, high) $/MWh from the catalog
+
+    @property
+    def p10(self):
+        return self.percentiles[10]
+
+    @property
+    def p50(self):
+        return self.percentiles[50]
+
+    @property
+    def p90(self):
+        return self.percentiles[90]
+
+
+def capital_recovery_factor(rate, years):
+    rate = np.asarray(rate, dtype=np.float64)
+    return rate / (1 - (1 + rate) ** -years)
+
+
+def _triangular(rng, spec, n):
+    low, mode, high = spec
+    if high <= low:
+        return np.full(n, float(low))
+    return rng.triangular(low, mode, high, n)
+
+
+def _uniform_percent(rng, bounds, n):
+    return rng.uniform(bounds[0] / 100, bounds[1] / 100, n)
+
+
+def sample_lcoe(key, draws=DRAWS, seed=0, chunk=CHUNK):
+    """``draws`` LCOE samples ($/MWh, float32) for the catalog system ``key``."""
+    system = load_catalog().get(key)
+    summary, costs = system.summary, system.costs
+    cf_range = summary.range("capacity_factor")
+    eta_range = summary.range("efficiency")
+    low, high = summary.range("lcoe")
+    # Seeded per system so adding a system does not reshuffle the others
+    rng = np.random.default_rng([seed, zlib.crc32(key.encode())])
+    out = np.empty(draws, dtype=np.float32)
+    for start in range(0, draws, chunk):
+        n = min(chunk, draws - start)
+        if costs is None:
+            out[start:start + n] = _triangular(rng, (low, (low + high) / 2, high), n)
+            continue
+        crf = capital_recovery_factor(_triangular(rng, DISCOUNT_RATE, n), costs.lifetime)
+        annual = _triangular(rng, costs.capex, n) * crf + _triangular(rng, costs.opex, n)
+        mwh_per_kw = 8.76 * _uniform_percent(rng, cf_range, n)
+        lcoe = annual / mwh_per_kw
+        if costs.fuel[2] > 0:
+            lcoe += _triangular(rng, costs.fuel, n) / _uniform_percent(rng, eta_range, n)
+        out[start:start + n] = lcoe
+    return out
+
+
+@lru_cache(maxsize=16)
+def distribution(key, draws=DRAWS, seed=0):
+    system = load_catalog().get(key)
+    return _distribution(key, system.summary, system.costs, draws, seed)
+
+
+# summary and costs are only there to key the disk cache on the catalog inputs
+@memo.persistent()
+def _distribution(key, summary, costs, draws, seed):
+    samples = sample_lcoe(key, draws, seed)
+    values = np.percentile(samples, PERCENTILES)
+    return LcoeDistribution(
+        system=key,
+        draws=draws,
+        mean=float(samples.mean(dtype=np.float64)),
+        percentiles={p: float(v) for p, v in zip(PERCENTILES, values)},
+        catalog_range=summary.range("lcoe"),
+    )
@@ -0,0 +1,297 @@
+"""Disk-persistent memoization for the energy models, shared across processes.
+
+In-process caches (lru_cache, the module LRUs) are lost when the server
+restarts, and every worker process of utils.workers warms its own copy. A
+MemoStore keeps results in CACHE_DIR instead, shared by every process on the
+host:
+
+    memo.sqlite        index in WAL mode: key, pickled skeleton, sizes, last use
+    memo/<key>.bin     the NumPy array data, 64-byte aligned
+
+Values are pickled with protocol 5 and contiguous arrays are taken out of
+band, so only their buffers go to the .bin file. A hit memory-maps that file
+and unpickles the skeleton onto slices of the map, giving read-only arrays
+backed by the page cache with no copy. A result read by ten processes is
+held in RAM once.
+
+Keys hash the function's qualified name, its version and source, and the
+canonicalized arguments (the same canonical form utils.workers uses to
+coalesce requests). Entries are evicted least recently used first once
+their total size passes the byte budget. Hit, miss, store and eviction
+counters are added up in memory and written to the database with the next
+store, recency update or stats() call (at least every FLUSH_INTERVAL while
+there are hits), so stats() covers every process without a write per
+lookup. Any disk or database error counts as a miss: the cache can only
+cost a recompute, never a failure.
+"""
+
+import functools
+import hashlib
+import inspect
+import mmap
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from utils import workers
+
+CACHE_DIR = os.environ.get(
+    "SUSTAINAPP_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "cache"),
+)
+MAX_BYTES = int(os.environ.get("SUSTAINAPP_MEMO_BYTES", 1 << 30))
+ALIGN = 64
+TOUCH_INTERVAL = 1.0  # seconds; hits on a fresher entry skip the write
+FLUSH_INTERVAL = 5.0  # seconds; pending counters written at least this often
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key      TEXT PRIMARY KEY,
+    name     TEXT NOT NULL,
+    skeleton BLOB NOT NULL,
+    spans    TEXT NOT NULL,
+    bytes    INTEGER NOT NULL,
+    created  REAL NOT NULL,
+    used     REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_used ON entries (used);
+CREATE TABLE IF NOT EXISTS counters (
+    name  TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+_COUNT = "INSERT INTO counters (name, value) VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET value = value + excluded.value"
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _dump(value):
+    """(skeleton pickle, [array buffers]) with contiguous arrays out of band."""
+    buffers = []
+    skeleton = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+    return skeleton, [b.raw() for b in buffers]
+
+
+class MemoStore:
+    """One cache directory; safe to share between threads and processes."""
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.directory = directory
+        self.blob_dir = os.path.join(directory, "memo")
+        self.max_bytes = max_bytes
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self._conn = _connect(os.path.join(directory, "memo.sqlite"))
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._flushed = time.monotonic()
+
+    def _blob_path(self, key):
+        return os.path.join(self.blob_dir, f"{key}.bin")
+
+    def _count(self, name, n=1):
+        self._pending[name] += n
+
+    def _flush(self):
+        """Write the pending counters; call inside a transaction, under the lock."""
+        if self._pending:
+            self._conn.executemany(_COUNT, list(self._pending.items()))
+            self._pending.clear()
+        self._flushed = time.monotonic()
+
+    @contextmanager
+    def _transaction(self, mode=""):
+        self._conn.execute(f"BEGIN {mode}")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def get(self, key, count_miss=True):
+        """(True, value) on a hit, (False, None) on a miss.
+
+        ``count_miss=False`` leaves the miss to be counted by whoever then
+        computes and looks the value up again (see persistent().lookup).
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT skeleton, spans, used FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    if count_miss:
+                        self._count("misses")
+                    return False, None
+                self._count("hits")
+                now = time.time()
+                touch = now - row[2] > TOUCH_INTERVAL
+                if touch or time.monotonic() - self._flushed > FLUSH_INTERVAL:
+                    with self._transaction():
+                        if touch:
+                            self._conn.execute("UPDATE entries SET used = ? WHERE key = ?", (now, key))
+                        self._flush()
+            skeleton, spans = row[0], [tuple(map(int, s.split(":"))) for s in row[1].split(",") if s]
+            buffers = [memoryview(b"")] * len(spans)
+            if any(size for _, size in spans):
+                with open(self._blob_path(key), "rb") as fh:
+                    view = memoryview(mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ))
+                buffers = [view[start:start + size] for start, size in spans]
+            return True, pickle.loads(skeleton, buffers=buffers)
+        except (sqlite3.Error, OSError, ValueError, pickle.UnpicklingError):
+            return False, None
+
+    def put(self, key, value, name=""):
+        """Store ``value``; unpicklable values and disk errors are skipped."""
+        try:
+            skeleton, buffers = _dump(value)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return False
+        spans, offset = [], 0
+        path = self._blob_path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            if buffers:
+                with open(tmp, "wb") as fh:
+                    for raw in buffers:
+                        pad = -offset % ALIGN
+                        fh.write(b"\0" * pad)
+                        offset += pad
+                        fh.write(raw)
+                        spans.append(f"{offset}:{raw.nbytes}")
+                        offset += raw.nbytes
+                os.replace(tmp, path)
+            size = len(skeleton) + offset
+            now = time.time()
+            with self._lock, self._transaction("IMMEDIATE"):
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, name, skeleton, ",".join(spans), size, now, now),
+                )
+                self._count("stores")
+                evicted = self._evict()
+                self._flush()
+        except (sqlite3.Error, OSError):
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            return False
+        for old in evicted:
+            # Processes that mapped the file keep their mapping after the unlink
+            try:
+                os.unlink(self._blob_path(old))
+            except OSError:
+                pass
+        return True
+
+    def _evict(self):
+        total = self._conn.execute("SELECT coalesce(sum(bytes), 0) FROM entries").fetchone()[0]
+        evicted = []
+        if total <= self.max_bytes:
+            return evicted
+        for key, size in self._conn.execute("SELECT key, bytes FROM entries ORDER BY used"):
+            if total <= self.max_bytes:
+                break
+            evicted.append(key)
+            total -= size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k in evicted])
+        self._count("evictions", len(evicted))
+        return evicted
+
+    def stats(self):
+        """Counters and size over every process sharing the directory."""
+        with self._lock:
+            if self._pending:
+                with self._transaction():
+                    self._flush()
+            counters = dict(self._conn.execute("SELECT name, value FROM counters"))
+            entries, size = self._conn.execute("SELECT count(*), coalesce(sum(bytes), 0) FROM entries").fetchone()
+        stats = {name: counters.get(name, 0) for name in ("hits", "misses", "stores", "evictions")}
+        return {**stats, "entries": entries, "bytes": size, "max_bytes": self.max_bytes}
+
+    def clear(self):
+        with self._lock:
+            keys = [k for (k,) in self._conn.execute("SELECT key FROM entries")]
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("DELETE FROM counters")
+            self._pending.clear()
+        for key in keys:
+            try:
+                os.unlink(self._blob_path(key))
+            except OSError:
+                pass
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def store(directory=CACHE_DIR):
+    """The MemoStore for ``directory``, opened once per process."""
+    with _stores_lock:
+        if directory not in _stores:
+            _stores[directory] = MemoStore(directory)
+        return _stores[directory]
+
+
+def _source_hash(fn):
+    try:
+        source = inspect.getsource(fn).encode()
+    except (OSError, TypeError):
+        source = fn.__code__.co_code
+    return hashlib.sha256(source).hexdigest()[:16]
+
+
+def make_key(name, version, *parts):
+    return hashlib.sha256(repr((name, version, *parts)).encode()).hexdigest()
+
+
+def persistent(version=1, ignore=()):
+    """Decorator: memoize a model function in the shared disk store.
+
+    ``version`` is part of the key, as is the function's source, so editing
+    the function invalidates its entries; bump ``version`` when something it
+    calls changes. Arguments named in ``ignore`` are left out of the key
+    (e.g. a data source already identified by another argument).
+    ``.lookup(*args)`` returns (hit, value) without computing, so a caller
+    can skip the worker pool on a hit. It counts hits only: on a miss the
+    caller goes on to call the function, whose own lookup counts the miss
+    once. The uncached function stays available as ``.uncached``.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        name = f"{fn.__module__}.{fn.__qualname__}"
+        code = _source_hash(fn)
+
+        def key_for(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = {k: v for k, v in bound.arguments.items() if k not in ignore}
+            return make_key(name, version, code, workers.request_key(fn, (), arguments))
+
+        def lookup(*args, **kwargs):
+            return store().get(key_for(*args, **kwargs), count_miss=False)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = key_for(*args, **kwargs)
+            hit, value = store().get(key)
+            if hit:
+                return value
+            value = fn(*args, **kwargs)
+            store().put(key, value, name)
+            return value
+
+        wrapper.uncached = fn
+        wrapper.key = key_for
+        wrapper.lookup = lookup
+        return wrapper
+    return decorator
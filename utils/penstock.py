@@ -0,0 +1,163 @@
+"""Penstock head loss and turbine selection over a whole design grid.
+
+Net head is the gross head minus the Darcy-Weisbach friction loss and the
+minor (entrance, bend and valve) losses:
+
+    h_f = f · (L / D) · V² / 2g,    h_m = K · V² / 2g
+
+with the friction factor from the Colebrook equation
+
+    1/√f = -2 log10(ε / 3.7D + 2.51 / (Re √f))
+
+solved by fixed-point iteration on x = 1/√f, started from the Swamee-Jain
+explicit estimate, over every grid point at once. f depends on diameter and
+flow but not on length, so it is solved on the (diameter, flow) plane and
+broadcast along the length axis: a 1000 × 100 × 10 grid costs 10⁵ Colebrook
+solves and one broadcast pass.
+
+The turbine type comes from the power specific speed of one unit,
+n_s = n √P / H^1.25 (rpm, kW, m): Pelton for low n_s, Francis in the middle,
+Kaplan for high n_s. Efficiencies are the Hydro page bands.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+RHO = 1000.0  # kg/m3
+G = 9.81  # m/s2
+NU = 1.0e-6  # m2/s, water at 20 C
+GRID_FREQUENCY = 50.0  # Hz
+
+ROUGHNESS = {"Steel": 0.045e-3, "Concrete": 1.0e-3}  # m
+
+# Type, upper specific speed limit (rpm, kW, m) and catalog efficiency band
+TURBINES = (
+    ("Pelton", 60.0, (0.85, 0.92)),
+    ("Francis", 340.0, (0.85, 0.95)),
+    ("Kaplan", np.inf, (0.90, 0.95)),
+)
+GENERATOR_EFFICIENCY = 0.97
+
+# Default sweep: the Penstock spec box (3-8 m) and the page flow range
+DIAMETERS = np.linspace(3.0, 8.0, 1000)
+FLOWS = np.linspace(100.0, 1000.0, 100)
+LENGTHS = np.linspace(200.0, 2000.0, 10)
+
+
+@dataclass(frozen=True, slots=True)
+class DesignGrid:
+    """Results shaped (diameters, flows, lengths); float32 to halve memory."""
+
+    diameters: np.ndarray
+    flows: np.ndarray
+    lengths: np.ndarray
+    velocity: np.ndarray  # (diameters, flows)
+    friction: np.ndarray  # (diameters, flows)
+    head_loss: np.ndarray  # m, friction + minor
+    net_head: np.ndarray  # m
+    power_mw: np.ndarray  # plant output with the selected turbines
+    specific_speed: np.ndarray
+    turbine: np.ndarray  # int8 index into TURBINES, -1 if no head is left
+
+
+def synchronous_speed(poles, frequency=GRID_FREQUENCY):
+    return 120.0 * frequency / poles
+
+
+def colebrook(reynolds, relative_roughness, tol=1e-10, max_iter=20):
+    """Darcy friction factor for turbulent flow, element-wise over arrays."""
+    re = np.asarray(reynolds, dtype=np.float64)
+    rr = np.asarray(relative_roughness, dtype=np.float64)
+    a = rr / 3.7
+    b = 2.51 / re
+    # Swamee-Jain start, then x = -2 log10(a + b x) converges in a few steps
+    x = -2 * np.log10(a + 5.74 / re ** 0.9)
+    for _ in range(max_iter):
+        x_new = -2 * np.log10(a + b * x)
+        done = np.max(np.abs(x_new - x)) < tol
+        x = x_new
+        if done:
+            break
+    return 1 / x ** 2
+
+
+def select_turbine(specific_speed):
+    """Index into TURBINES for each specific speed."""
+    limits = np.array([limit for _, limit, _ in TURBINES])
+    return np.searchsorted(limits, specific_speed, side="right").clip(0, len(TURBINES) - 1).astype(np.int8)
+
+
+def turbine_efficiency(index):
+    """Efficiency at the design point: the top of each type's catalog band."""
+    return np.array([band[1] for _, _, band in TURBINES])[index]
+
+
+def design_grid(gross_head, diameters=DIAMETERS, flows=FLOWS, lengths=LENGTHS, material="Steel",
+                minor_k=1.5, units=4, poles=28, friction_factor=colebrook):
+    """Net head, power and turbine type over every (diameter, flow, length).
+
+    ``friction_factor(Re, ε/D)`` defaults to the Colebrook solver; pass
+    utils.tables.friction_factor to read it from the precomputed table.
+    """
+    d = np.asarray(diameters, dtype=np.float64)[:, None]
+    q = np.asarray(flows, dtype=np.float64)[None, :]
+    length = np.asarray(lengths, dtype=np.float64)
+
+    area = np.pi * d ** 2 / 4
+    velocity = q / area
+    friction = friction_factor(velocity * d / NU, ROUGHNESS[material] / d)
+    dynamic = velocity ** 2 / (2 * G)
+
+    # Broadcast along length: (D, Q, 1) and (L,)
+    head_loss = (friction * dynamic / d)[..., None] * length + (minor_k * dynamic)[..., None]
+    net_head = np.maximum(gross_head - head_loss, 0.0)
+
+    # Specific speed of one unit at a nominal efficiency picks the type
+    q_unit = (q / units)[..., None]
+    nominal_kw = RHO * G * q_unit * net_head * 0.9 / 1000
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ns = synchronous_speed(poles) * np.sqrt(nominal_kw) / net_head ** 1.25
+    ns = np.nan_to_num(ns, nan=0.0, posinf=0.0)
+    # -1 where friction eats the whole head
+    turbine = np.where(net_head > 0, select_turbine(ns), -1).astype(np.int8)
+    eta = turbine_efficiency(np.maximum(turbine, 0)) * GENERATOR_EFFICIENCY
+    power = RHO * G * q[..., None] * net_head * eta / 1e6
+
+    return DesignGrid(
+        diameters=np.asarray(diameters, dtype=np.float64),
+        flows=np.asarray(flows, dtype=np.float64),
+        lengths=length,
+        velocity=velocity.astype(np.float32),
+        friction=friction.astype(np.float32),
+        head_loss=head_loss.astype(np.float32),
+        net_head=net_head.astype(np.float32),
+        power_mw=power.astype(np.float32),
+        specific_speed=ns.astype(np.float32),
+        turbine=turbine,
+    )
+
+
+def min_diameter(grid, gross_head, max_loss=0.05):
+    """Smallest diameter keeping head loss under ``max_loss`` of gross head.
+
+    Shaped (flows, lengths); NaN where even the largest diameter loses more.
+    """
+    ok = grid.head_loss <= max_loss * gross_head
+    first = ok.argmax(axis=0)
+    return np.where(ok.any(axis=0), grid.diameters[first], np.nan)
+
+
+def static_pressure_bar(gross_head):
+    return RHO * G * gross_head / 1e5
+
+
+@lru_cache(maxsize=4)
+def cached_grid(gross_head, material, minor_k, units, poles, friction_factor=colebrook):
+    grid = design_grid(gross_head, material=material, minor_k=minor_k, units=units, poles=poles,
+                       friction_factor=friction_factor)
+    for array in (grid.velocity, grid.friction, grid.head_loss, grid.net_head,
+                  grid.power_mw, grid.specific_speed, grid.turbine):
+        array.setflags(write=False)
+    return grid
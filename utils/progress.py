@@ -0,0 +1,269 @@
+"""Persistent assembly progress backed by SQLite.
+
+Progress used to live only in st.session_state, so it vanished when the
+websocket dropped or the server restarted. Each browser now carries a
+random user id in the ``uid`` query parameter and its best score and
+completion flag per system are kept in a SQLite database in WAL mode.
+
+Writes are write-behind: record() only updates an in-memory pending map and
+a background thread flushes it in one transaction, so a Submit click never
+waits on fsync. Reads merge the pending map, so they always see the latest
+record() even before it reaches disk, and are served from a small per-user
+cache. A read copies the pending map before it queries the database, so a
+flush committing in between moves rows from one to the other and never
+hides them; record() and each committed flush drop the affected cache
+entries, and a read that overlapped either does not cache its result.
+
+The database is local to one server; the signed token from utils.tokens
+carries the same progress in the URL so any other worker can restore it.
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import streamlit as st
+
+from utils.tokens import read_token, session_progress
+
+DB_PATH = os.environ.get(
+    "SUSTAINAPP_PROGRESS_DB",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "progress.db"),
+)
+
+FLUSH_INTERVAL = 0.5  # seconds between write-behind flushes
+CACHE_USERS = 256
+CACHE_TTL = 5.0  # seconds
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress (
+    user_id    TEXT NOT NULL,
+    system     TEXT NOT NULL,
+    score      INTEGER NOT NULL DEFAULT 0,
+    completed  INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (user_id, system)
+) WITHOUT ROWID
+"""
+
+_UPSERT = """
+INSERT INTO progress (user_id, system, score, completed, updated_at)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (user_id, system) DO UPDATE SET
+    score = max(score, excluded.score),
+    completed = max(completed, excluded.completed),
+    updated_at = excluded.updated_at
+"""
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class ProgressStore:
+    """Per-process progress repository with write-behind batching."""
+
+    def __init__(self, path=DB_PATH, flush_interval=FLUSH_INTERVAL):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.flush_interval = flush_interval
+
+        # One connection for readers (serialised by a lock) and one owned by
+        # the flush thread, shared by every session in this process
+        self._read_conn = _connect(path)
+        self._read_conn.execute(_SCHEMA)
+        self._write_conn = _connect(path)
+        self._read_lock = threading.Lock()
+
+        self._pending = {}
+        self._inflight = {}  # batch being committed, still visible to readers
+        self._pending_lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._generation = 0  # bumped under _cache_lock whenever cached results may be stale
+
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._flusher = threading.Thread(target=self._flush_loop, name="progress-flush", daemon=True)
+        self._flusher.start()
+
+    def record(self, user_id, system, score, completed):
+        """Queue a result; keeps the best score and any completion."""
+        key = (user_id, system)
+        with self._pending_lock:
+            old_score, old_completed = self._pending.get(key, (0, False))
+            self._pending[key] = (max(old_score, score), old_completed or completed)
+        with self._cache_lock:
+            self._cache.pop(user_id, None)
+            self._generation += 1
+        self._wake.set()
+
+    def load(self, user_id):
+        """Return {system: (score, completed)} for ``user_id``."""
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._cache.get(user_id)
+            if entry is not None and now - entry[0] < CACHE_TTL:
+                self._cache.move_to_end(user_id)
+                return dict(entry[1])
+            generation = self._generation
+
+        # Unflushed records first: a flush committing during the query below
+        # leaves them in this copy or puts them in the rows it returns
+        with self._pending_lock:
+            unflushed = [(key, value) for key, value in (*self._inflight.items(), *self._pending.items())
+                         if key[0] == user_id]
+
+        with self._read_lock:
+            rows = self._read_conn.execute(
+                "SELECT system, score, completed FROM progress WHERE user_id = ?", (user_id,)
+            ).fetchall()
+        result = {system: (score, bool(completed)) for system, score, completed in rows}
+
+        for (_, system), (score, completed) in unflushed:
+            old_score, old_completed = result.get(system, (0, False))
+            result[system] = (max(old_score, score), old_completed or completed)
+
+        with self._cache_lock:
+            if generation != self._generation:
+                return dict(result)
+            self._cache[user_id] = (now, result)
+            self._cache.move_to_end(user_id)
+            while len(self._cache) > CACHE_USERS:
+                self._cache.popitem(last=False)
+        return dict(result)
+
+    def flush(self):
+        """Write every pending record in a single transaction."""
+        with self._flush_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, {}
+                self._inflight = batch
+            if not batch:
+                return 0
+            now = time.time()
+            rows = [(uid, system, score, int(completed), now) for (uid, system), (score, completed) in batch.items()]
+            try:
+                with self._write_conn:
+                    self._write_conn.execute("BEGIN IMMEDIATE")
+                    self._write_conn.executemany(_UPSERT, rows)
+            except sqlite3.Error:
+                # Put the batch back so the next flush retries it
+                with self._pending_lock:
+                    for key, (score, completed) in batch.items():
+                        old_score, old_completed = self._pending.get(key, (0, False))
+                        self._pending[key] = (max(score, old_score), completed or old_completed)
+                raise
+            finally:
+                with self._pending_lock, self._cache_lock:
+                    self._inflight = {}
+                    for uid, _ in batch:
+                        self._cache.pop(uid, None)
+                    self._generation += 1
+            return len(rows)
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._wake.wait()
+            # Let more clicks accumulate so they share one commit
+            time.sleep(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error:
+                pass
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        self.flush()
+        self._read_conn.close()
+        self._write_conn.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ProgressStore()
+            atexit.register(_store.flush)
+        return _store
+
+
+def current_user_id():
+    """Return this browser's user id, creating one on first visit.
+
+    The id is kept in the ``uid`` query parameter so a reconnecting browser
+    finds its progress again, and in session state so it survives sidebar
+    navigation, which drops query parameters.
+    """
+    user_id = st.session_state.get("user_id") or st.query_params.get("uid") or uuid.uuid4().hex
+    st.session_state.user_id = user_id
+    if st.query_params.get("uid") != user_id:
+        st.query_params["uid"] = user_id
+    return user_id
+
+
+def _merge(*sources):
+    merged = {}
+    for source in sources:
+        for system, (score, completed) in (source or {}).items():
+            old_score, old_completed = merged.get(system, (0, False))
+            merged[system] = (max(old_score, score), old_completed or completed)
+    return merged
+
+
+def restore_progress(catalog):
+    """Fill session state from the signed URL token and the store once per session.
+
+    The token lets any worker restore progress without shared state; the
+    store covers links that lost their token. Whatever the token restores
+    is also written to this worker's store.
+    """
+    if st.session_state.get("progress_restored"):
+        return
+    user_id = current_user_id()
+    store = get_store()
+    # Signed for this user id, so a classmate's link restores nothing here
+    from_token = read_token(catalog, user_id) or {}
+    saved = _merge(store.load(user_id), from_token)
+    for system in catalog:
+        score, completed = saved.get(system.key, (0, False))
+        if system.key in from_token and (score or completed):
+            store.record(user_id, system.key, score, completed)
+        st.session_state[f"{system.key}_score"] = max(st.session_state[f"{system.key}_score"], score)
+        if completed:
+            st.session_state[f"{system.key}_completed"] = True
+            if system.page not in st.session_state.systems_completed:
+                st.session_state.systems_completed.append(system.page)
+    st.session_state.total_score = sum(st.session_state[f"{s.key}_score"] for s in catalog)
+    st.session_state.progress_restored = True
+
+
+def save_progress(system):
+    get_store().record(
+        current_user_id(),
+        system.key,
+        st.session_state[f"{system.key}_score"],
+        st.session_state[f"{system.key}_completed"],
+    )
+
+
+def progress_summary(catalog):
+    """Return (total_score, completed system pages) from the store and this session."""
+    saved = _merge(get_store().load(current_user_id()), session_progress(catalog))
+    total = sum(saved.get(s.key, (0, False))[0] for s in catalog)
+    completed = [s.page for s in catalog if saved.get(s.key, (0, False))[1]]
+    return total, completed
@@ -0,0 +1,188 @@
+"""Single-diode PV module model solved in closed form.
+
+    I = IL - I0 (exp((V + I Rs) / nVt) - 1) - (V + I Rs) / Rsh
+
+The equation is implicit in I, but it has an explicit solution through the
+Lambert W function (Jain & Kapoor 2004), so whole voltage arrays, and whole
+irradiance x temperature grids, are solved in one NumPy call instead of a
+Newton loop per point. The W argument overflows float64 for real modules,
+so it is evaluated in log space as the Wright omega function
+W(exp(x)) = omega(x), with Newton iterations from a close starting guess.
+
+Temperature and irradiance dependence follows the De Soto five-parameter
+model: the photocurrent scales with irradiance and the Isc temperature
+coefficient, the saturation current with T^3 and the band gap, and the shunt
+resistance inversely with irradiance.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+BOLTZMANN = 1.380649e-23
+CHARGE = 1.602176634e-19
+T_REF = 298.15  # K, standard test conditions
+G_REF = 1000.0  # W/m2
+
+# Quantization steps for the memoized curves, so slider drags hit the cache
+G_STEP = 10.0
+T_STEP = 0.5
+
+
+@dataclass(frozen=True, slots=True)
+class Module:
+    """Single-diode parameters at standard test conditions (STC)."""
+
+    name: str
+    il_ref: float  # photocurrent, A
+    i0_ref: float  # diode saturation current, A
+    rs: float  # series resistance, ohm
+    rsh_ref: float  # shunt resistance, ohm
+    n: float  # diode ideality factor
+    cells: int  # cells in series
+    alpha_isc: float  # Isc temperature coefficient, 1/K
+    eg: float = 1.121  # band gap, eV (silicon)
+
+
+# A typical 60-cell monocrystalline module (about 280 W at STC)
+DEFAULT_MODULE = Module(
+    name="60-cell mono-Si, 280 W",
+    il_ref=9.8,
+    i0_ref=1.7e-10,
+    rs=0.32,
+    rsh_ref=380.0,
+    n=1.0,
+    cells=60,
+    alpha_isc=0.0005,
+)
+
+
+def wright_omega(x, iterations=6):
+    """Wright omega function, omega(x) = W(exp(x)), for real ``x``.
+
+    Newton iterations on w + log(w) = x, started from x - log(x) above 1 and
+    log(1 + exp(x)) below; six steps reach float64 precision everywhere.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    w = np.where(x > 1, x - np.log(np.maximum(x, 1)), np.log1p(np.exp(np.minimum(x, 1))))
+    for _ in range(iterations):
+        w = w - (w + np.log(w) - x) * w / (1 + w)
+    return w
+
+
+def params(module, irradiance, temp_c):
+    """Return (il, i0, rs, rsh, nvt) at the given conditions, broadcast together."""
+    g = np.asarray(irradiance, dtype=np.float64)
+    tk = np.asarray(temp_c, dtype=np.float64) + 273.15
+    g, tk = np.broadcast_arrays(g, tk)
+
+    nvt = module.n * module.cells * BOLTZMANN * tk / CHARGE
+    il = module.il_ref * (g / G_REF) * (1 + module.alpha_isc * (tk - T_REF))
+    eg_j = module.eg * CHARGE
+    i0 = module.i0_ref * (tk / T_REF) ** 3 * np.exp(eg_j / BOLTZMANN * (1 / T_REF - 1 / tk))
+    rsh = module.rsh_ref * G_REF / np.maximum(g, 1e-3)
+    rs = np.full_like(g, module.rs)
+    return il, i0, rs, rsh, nvt
+
+
+def current(v, il, i0, rs, rsh, nvt):
+    """Terminal current at voltage ``v`` (explicit Lambert W solution)."""
+    v = np.asarray(v, dtype=np.float64)
+    denom = rs + rsh
+    log_arg = np.log(rs * i0 * rsh / (nvt * denom)) + rsh * (rs * (il + i0) + v) / (nvt * denom)
+    i = (rsh * (il + i0) - v) / denom - nvt / rs * wright_omega(log_arg)
+    return i
+
+
+def voltage(i, il, i0, rs, rsh, nvt):
+    """Terminal voltage at current ``i`` (explicit Lambert W solution)."""
+    i = np.asarray(i, dtype=np.float64)
+    log_arg = np.log(i0 * rsh / nvt) + rsh * (il + i0 - i) / nvt
+    return (il + i0 - i) * rsh - i * rs - nvt * wright_omega(log_arg)
+
+
+def key_points(il, i0, rs, rsh, nvt, iterations=48):
+    """Voc, Isc, Vmp, Imp, Pmp and fill factor for every parameter set.
+
+    The maximum power point is found by a golden-section search on [0, Voc]
+    run on all parameter sets at once; P(V) is unimodal for this model.
+    """
+    p = (il, i0, rs, rsh, nvt)
+    voc = np.maximum(voltage(0.0, *p), 0.0)
+    isc = current(0.0, *p)
+
+    ratio = (np.sqrt(5) - 1) / 2
+    lo = np.zeros_like(voc)
+    hi = voc.copy()
+    a = hi - ratio * (hi - lo)
+    b = lo + ratio * (hi - lo)
+    pa = a * current(a, *p)
+    pb = b * current(b, *p)
+    for _ in range(iterations):
+        left = pa > pb
+        hi = np.where(left, b, hi)
+        lo = np.where(left, lo, a)
+        b_new = np.where(left, a, lo + ratio * (hi - lo))
+        a_new = np.where(left, hi - ratio * (hi - lo), b)
+        new_v = np.where(left, a_new, b_new)
+        new_p = new_v * current(new_v, *p)
+        pa, pb = np.where(left, new_p, pb), np.where(left, pa, new_p)
+        a, b = a_new, b_new
+
+    vmp = (lo + hi) / 2
+    imp = current(vmp, *p)
+    pmp = vmp * imp
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ff = np.where(voc * isc > 0, pmp / (voc * isc), 0.0)
+    return {"voc": voc, "isc": isc, "vmp": vmp, "imp": imp, "pmp": pmp, "ff": ff}
+
+
+def iv_curve(module, irradiance, temp_c, points=200):
+    """Voltage and current arrays from 0 to Voc; (points,) or grid + (points,)."""
+    p = params(module, irradiance, temp_c)
+    voc = np.maximum(voltage(0.0, *p), 0.0)
+    v = voc[..., None] * np.linspace(0.0, 1.0, points)
+    i = current(v, *(x[..., None] for x in p))
+    return v, np.maximum(i, 0.0)
+
+
+def sweep(module, irradiances, temps_c):
+    """Key points over the irradiance x temperature grid, shape (len(G), len(T))."""
+    g, t = np.meshgrid(np.asarray(irradiances, float), np.asarray(temps_c, float), indexing="ij")
+    return key_points(*params(module, g, t))
+
+
+def quantize(irradiance, temp_c):
+    return round(irradiance / G_STEP) * G_STEP, round(temp_c / T_STEP) * T_STEP
+
+
+def _frozen(value):
+    value.setflags(write=False)
+    return value
+
+
+@lru_cache(maxsize=512)
+def _cached_curve(module, irradiance, temp_c, points):
+    v, i = iv_curve(module, irradiance, temp_c, points)
+    summary = {k: float(x) for k, x in key_points(*params(module, irradiance, temp_c)).items()}
+    return _frozen(v), _frozen(i), summary
+
+
+def cached_curve(irradiance, temp_c, module=DEFAULT_MODULE, points=200):
+    """Memoized (v, i, key points) for quantized conditions; arrays are read-only."""
+    g, t = quantize(irradiance, temp_c)
+    v, i, summary = _cached_curve(module, g, t, points)
+    return v, i, dict(summary)
+
+
+@lru_cache(maxsize=64)
+def _cached_sweep(module, irradiances, temps_c):
+    return {k: _frozen(v) for k, v in sweep(module, irradiances, temps_c).items()}
+
+
+def cached_sweep(irradiances, temps_c, module=DEFAULT_MODULE):
+    """Memoized sweep() over quantized grid values; arrays are read-only."""
+    g = tuple(round(x / G_STEP) * G_STEP for x in irradiances)
+    t = tuple(round(x / T_STEP) * T_STEP for x in temps_c)
+    return _cached_sweep(module, g, t)
@@ -0,0 +1,388 @@
+"""Generic page renderer for the energy systems in data/systems.toml.
+
+Every page under pages/ is a thin script that calls render_system_page()
+with its catalog key; all content comes from utils.catalog.
+
+The component explorer, the assembly challenge and the navigation row are
+fragments: interacting with a widget inside one reruns only that section
+instead of the whole page (CSS, overview image, spec box, deep dive).
+
+Every section is timed with utils.timing, fragment reruns included.
+"""
+
+from dataclasses import asdict
+from string import Template
+
+import streamlit as st
+
+from utils.assets import COMPONENT_WIDTH, OVERVIEW_WIDTH, show_image
+from utils.catalog import load_catalog
+from utils.grading import grade
+from utils.progress import current_user_id, restore_progress, save_progress
+from utils.timing import instrument_rerun, section, timed
+from utils.tokens import write_token
+
+PAGE_CSS = Template("""
+<style>
+    .system-header {
+        background: linear-gradient(90deg, $accent, $header_end);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+        font-size: 2.5rem;
+        font-weight: bold;
+        text-align: center;
+        margin: 20px 0;
+    }
+
+    .component-card {
+        background: linear-gradient(145deg, $light, $card_end);
+        padding: 20px;
+        border-radius: 15px;
+        box-shadow: 10px 10px 30px #d9d9d9, -10px -10px 30px #ffffff;
+        margin: 15px 0;
+        border-left: 5px solid $accent;
+    }
+
+    .assembly-area {
+        background: linear-gradient(45deg, #f8f9fa, #e9ecef);
+        padding: 25px;
+        border-radius: 20px;
+        border: 3px dashed $accent;
+        margin: 20px 0;
+    }
+
+    .correct-answer {
+        background: linear-gradient(90deg, #4CAF50, #45a049);
+        color: white;
+        padding: 15px;
+        border-radius: 10px;
+        margin: 15px 0;
+    }
+
+    .wrong-answer {
+        background: linear-gradient(90deg, #f44336, #d32f2f);
+        color: white;
+        padding: 15px;
+        border-radius: 10px;
+        margin: 15px 0;
+    }
+
+    .spec-box {
+        background: $light;
+        border: 2px solid $accent;
+        border-radius: 10px;
+        padding: 15px;
+        margin: 10px 0;
+    }
+
+    .completion-celebration {
+        background: linear-gradient(45deg, #FFD700, #FFA500);
+        color: black;
+        padding: 20px;
+        border-radius: 15px;
+        text-align: center;
+        margin: 20px 0;
+        font-weight: bold;
+    }
+</style>
+""")
+
+
+def init_progress_state(catalog):
+    """Make sure the progress keys exist, restoring saved progress on a new session."""
+    if "total_score" not in st.session_state:
+        st.session_state.total_score = 0
+    if "systems_completed" not in st.session_state:
+        st.session_state.systems_completed = []
+    for system in catalog:
+        if f"{system.key}_score" not in st.session_state:
+            st.session_state[f"{system.key}_score"] = 0
+        if f"{system.key}_completed" not in st.session_state:
+            st.session_state[f"{system.key}_completed"] = False
+    restore_progress(catalog)
+    write_token(catalog, current_user_id())
+
+
+def all_completed(catalog):
+    return len(st.session_state.systems_completed) >= len(catalog)
+
+
+@timed("header")
+def render_header(system):
+    st.markdown(f'<h1 class="system-header">{system.icon} {system.title}</h1>', unsafe_allow_html=True)
+
+    # Progress indicator
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(f"{system.label} System Score", f"{st.session_state[f'{system.key}_score']}/100", "Points")
+    with col2:
+        status = "✅ Completed" if st.session_state[f"{system.key}_completed"] else "🔄 In Progress"
+        st.metric("Status", status)
+    with col3:
+        st.metric("Difficulty", system.difficulty, system.difficulty_label)
+
+
+@timed("overview")
+def render_overview(system):
+    st.markdown("## 📊 System Overview")
+
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        show_image(
+            system.overview_image,
+            caption=system.overview_caption,
+            missing_message=f"📸 **Place your {system.key} system diagram here:** `{system.overview_image}`",
+            width=OVERVIEW_WIDTH,
+        )
+
+    with col2:
+        st.markdown('<div class="spec-box">', unsafe_allow_html=True)
+        st.markdown(system.specs)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+
+@st.fragment
+@timed("component explorer")
+def render_component_explorer(system):
+    st.markdown("---")
+    st.markdown("## 🧩 Component Analysis")
+
+    selected_component = st.selectbox(
+        "🔍 Select Component for Detailed Analysis:",
+        system.component_names,
+    )
+
+    component = system.component(selected_component)
+
+    col1, col2 = st.columns([1, 1])
+
+    with col1:
+        st.markdown('<div class="component-card">', unsafe_allow_html=True)
+        st.markdown(f"### {selected_component}")
+        st.markdown(f"**Description:** {component.description}")
+        st.markdown(f"**Technical Specs:** {component.specs}")
+        st.markdown(f"**Function:** {component.function}")
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    with col2:
+        show_image(
+            component.image,
+            caption=f"{selected_component} - Technical Diagram",
+            missing_message=f"📸 **Component image:** `{component.image}`",
+            width=COMPONENT_WIDTH,
+        )
+
+
+def render_celebration(catalog):
+    mastered = "  \n".join(f"✅ {s.title}" for s in catalog)
+    st.markdown('<div class="completion-celebration">', unsafe_allow_html=True)
+    st.markdown(f"""
+🏆 **CONGRATULATIONS! SUSTAINABLE ENERGY EXPERT ACHIEVED!** 🏆
+
+You have successfully mastered all {len(catalog)} renewable energy systems:
+{mastered}
+
+**Total Score: {st.session_state.total_score}/{catalog.max_score} Points**
+
+You now understand the complete spectrum of sustainable energy technologies
+and their electrical engineering principles. You're ready to contribute to
+the clean energy revolution! 🌍⚡
+""")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+def render_success(system, catalog):
+    st.markdown('<div class="correct-answer">', unsafe_allow_html=True)
+    st.markdown(system.assembly.success)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    st.balloons()
+
+    if all_completed(catalog):
+        render_celebration(catalog)
+
+
+def render_feedback(system, user_order, result):
+    assembly = system.assembly
+
+    shown = user_order
+    if assembly.order_preview:
+        shown = user_order[:assembly.order_preview]
+    more = "..." if len(shown) < len(user_order) else ""
+
+    step = result.first_misplaced
+    if step >= len(user_order):
+        misplaced = f"Step {step + 1} is missing"
+    else:
+        misplaced = f"Step {step + 1} (`{user_order[step]}`)"
+
+    st.markdown('<div class="wrong-answer">', unsafe_allow_html=True)
+    st.markdown(f"""
+❌ **Assembly needs adjustment!** Partial score: **{result.score}/100**
+
+**Your order:** {' → '.join(shown)}{more}
+
+**Correct positions:** {result.correct_positions}/{result.total}  
+**Longest sequence in correct order:** {result.lcs}/{result.total}  
+**Out-of-order pairs:** {result.inversions}  
+**First misplaced step:** {misplaced}
+
+{assembly.failure_hint}
+""")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+def submit_assembly(system, catalog, user_order):
+    """Grade a submission and record the best score for the system.
+
+    Returns True when the submission improved the stored progress, in which
+    case the caller reruns the whole page so the header, deep dive and
+    navigation pick it up.
+    """
+    result = grade(user_order, system.correct_order)
+    st.session_state[f"{system.key}_feedback"] = (list(user_order), result)
+
+    improved = result.score > st.session_state[f"{system.key}_score"]
+    if improved:
+        st.session_state[f"{system.key}_score"] = result.score
+        st.session_state.total_score = sum(st.session_state[f"{s.key}_score"] for s in catalog)
+
+    if result.perfect and not st.session_state[f"{system.key}_completed"]:
+        st.session_state[f"{system.key}_completed"] = True
+        if system.page not in st.session_state.systems_completed:
+            st.session_state.systems_completed.append(system.page)
+        improved = True
+
+    if improved:
+        save_progress(system)
+    return improved
+
+
+@st.fragment
+@timed("assembly")
+def render_assembly(system, catalog):
+    assembly = system.assembly
+
+    st.markdown("---")
+    st.markdown(f"## {assembly.heading}")
+
+    st.markdown('<div class="assembly-area">', unsafe_allow_html=True)
+    st.markdown(f"### {assembly.subheading}")
+    st.markdown(f"**Task:** {assembly.task}")
+
+    st.markdown(f"**{assembly.prompt}**")
+    user_order = st.multiselect(
+        assembly.label,
+        system.component_names,
+        help=assembly.help,
+    )
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        if st.button(assembly.submit_label, type="primary"):
+            if submit_assembly(system, catalog, user_order):
+                st.rerun()
+        feedback = st.session_state.pop(f"{system.key}_feedback", None)
+        if feedback is not None:
+            submitted, result = feedback
+            if result.perfect:
+                render_success(system, catalog)
+            else:
+                render_feedback(system, submitted, result)
+
+    with col2:
+        if st.button(assembly.hint_label):
+            st.info(assembly.hint)
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+@timed("analysis")
+def render_analysis(system):
+    # Technical deep dive, unlocked by completing the assembly
+    if not st.session_state[f"{system.key}_completed"] or not system.analysis:
+        return
+
+    st.markdown("---")
+    st.markdown("## 🔬 Advanced Engineering Analysis")
+
+    for section in system.analysis:
+        with st.expander(section.title):
+            st.markdown(section.body)
+
+
+def render_tools(system, tools):
+    if not tools:
+        return
+
+    st.markdown("---")
+    st.markdown("## 🧪 Engineering Tools")
+
+    for tool in tools:
+        tool(system)
+
+
+@st.fragment
+@timed("navigation")
+def render_navigation(system, catalog):
+    prev_system, next_system = catalog.neighbours(system.key)
+
+    st.markdown("---")
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        if prev_system is None:
+            if st.button("🏠 Home"):
+                st.switch_page("app.py")
+        elif st.button(f"⬅️ Back: {prev_system.nav_label}"):
+            st.switch_page(prev_system.page_path)
+
+    with col2:
+        if next_system is None:
+            if st.button("🏠 Home - View Progress"):
+                st.switch_page("app.py")
+        elif st.button(f"➡️ Next: {next_system.nav_label}"):
+            st.switch_page(next_system.page_path)
+
+    with col3:
+        if st.session_state[f"{system.key}_completed"]:
+            if all_completed(catalog):
+                st.success("🏆 ALL SYSTEMS MASTERED!")
+            else:
+                st.success(f"✅ {system.label} System Mastered!")
+        else:
+            st.info("🎯 Complete assembly to finish" if next_system is None else "🎯 Complete assembly to proceed")
+
+
+def render_system_page(key, tools=()):
+    """Render the page for catalog system ``key``.
+
+    ``tools`` are extra section renderers (see utils.tools) shown after the
+    deep dive; each is called with the EnergySystem.
+    """
+    catalog = load_catalog()
+    system = catalog.get(key)
+
+    st.set_page_config(page_title=f"{system.icon} {system.title}", layout="wide")
+
+    with instrument_rerun(system.page):
+        with section(system.page, "css"):
+            st.markdown(PAGE_CSS.substitute(asdict(system.theme)), unsafe_allow_html=True)
+
+        with section(system.page, "progress"):
+            init_progress_state(catalog)
+
+        render_header(system)
+        render_overview(system)
+        render_component_explorer(system)
+        render_assembly(system, catalog)
+        render_analysis(system)
+        render_tools(system, tools)
+        render_navigation(system, catalog)
+
+        # Footer
+        st.markdown("---")
+        if system.footer:
+            st.markdown(system.footer)
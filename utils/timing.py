@@ -0,0 +1,270 @@
+"""Per-section rerun timing and an on-demand sampling profiler.
+
+Each logical section of a page (CSS, header, overview image, component
+explorer, assembly, deep dive, navigation...) is timed with section() or the
+timed() decorator. Samples go into a fixed-size ring buffer per
+(page, section) shared by every session in the process, so p50/p95/p99 cover
+the most recent RING_SIZE reruns and memory stays bounded. The admin page
+shows them, and they are written in Prometheus text format to METRICS_PATH
+for a node_exporter textfile collector, together with the worker pool's
+queue depth and the disk result cache's counters.
+
+A full rerun opened with ``?profile=1`` by an admin (utils.admin) also runs
+under a sampling profiler that records the script thread's stack every
+PROFILE_INTERVAL seconds and renders the merged call tree at the bottom of
+the page. For anyone else the parameter is ignored: the profiler costs CPU
+on every sample and its call tree shows server paths.
+"""
+
+import functools
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import streamlit as st
+
+from utils import admin, memo, workers
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RING_SIZE = 2048
+QUANTILES = (0.5, 0.95, 0.99)
+METRICS_PATH = os.environ.get("SUSTAINAPP_METRICS_PATH", os.path.join(ROOT, "data", "metrics.prom"))
+METRICS_INTERVAL = 10.0  # seconds between Prometheus file rewrites
+PROFILE_INTERVAL = 0.001
+
+
+class _Ring:
+    __slots__ = ("samples", "next", "count", "total")
+
+    def __init__(self):
+        self.samples = np.zeros(RING_SIZE)
+        self.next = 0
+        self.count = 0  # every sample ever recorded, for the Prometheus counter
+        self.total = 0.0
+
+
+_rings = {}
+_lock = threading.Lock()
+_last_export = 0.0
+
+
+def record(page, name, seconds):
+    """Add one timing sample for ``name`` on ``page``."""
+    with _lock:
+        ring = _rings.get((page, name))
+        if ring is None:
+            ring = _rings[(page, name)] = _Ring()
+        ring.samples[ring.next] = seconds
+        ring.next = (ring.next + 1) % RING_SIZE
+        ring.count += 1
+        ring.total += seconds
+
+
+@contextmanager
+def section(page, name):
+    """Time the body as section ``name`` of ``page``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(page, name, time.perf_counter() - start)
+
+
+def timed(name):
+    """Decorator form of section() for ``render_*(system, ...)`` functions.
+
+    The page label comes from the first argument's ``page``. Put it under
+    @st.fragment so fragment-only reruns are timed too.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(system, *args, **kwargs):
+            with section(system.page, name):
+                return func(system, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def snapshot():
+    """Return one dict per (page, section) with quantiles in milliseconds."""
+    with _lock:
+        copies = [
+            (page, name, ring.samples[:min(ring.count, RING_SIZE)].copy(), ring.count, ring.total)
+            for (page, name), ring in _rings.items()
+        ]
+    rows = []
+    for page, name, window, count, total in sorted(copies, key=lambda c: (c[0], c[1])):
+        q = np.quantile(window, QUANTILES) * 1000
+        rows.append({
+            "page": page,
+            "section": name,
+            "p50_ms": round(float(q[0]), 3),
+            "p95_ms": round(float(q[1]), 3),
+            "p99_ms": round(float(q[2]), 3),
+            "max_ms": round(float(window.max()) * 1000, 3),
+            "window": len(window),
+            "count": count,
+            "total_s": round(total, 6),
+        })
+    return rows
+
+
+def prometheus_text():
+    """Render the timings in the Prometheus text exposition format."""
+    lines = [
+        "# HELP sustainapp_section_seconds Page section render time over the recent rerun window.",
+        "# TYPE sustainapp_section_seconds summary",
+    ]
+    for row in snapshot():
+        labels = f'page="{row["page"]}",section="{row["section"]}"'
+        for q, key in zip(QUANTILES, ("p50_ms", "p95_ms", "p99_ms")):
+            lines.append(f'sustainapp_section_seconds{{{labels},quantile="{q}"}} {row[key] / 1000:.6f}')
+        lines.append(f"sustainapp_section_seconds_sum{{{labels}}} {row['total_s']:.6f}")
+        lines.append(f"sustainapp_section_seconds_count{{{labels}}} {row['count']}")
+
+    pool = workers.stats()
+    for name in ("workers", "in_flight", "running", "queued", "peak_in_flight"):
+        lines.append(f"# TYPE sustainapp_pool_{name} gauge")
+        lines.append(f"sustainapp_pool_{name} {pool[name]}")
+    for name in ("submitted", "coalesced", "completed", "failed"):
+        lines.append(f"# TYPE sustainapp_pool_{name}_total counter")
+        lines.append(f"sustainapp_pool_{name}_total {pool[name]}")
+    lines.append("# TYPE sustainapp_pool_latency_seconds_total counter")
+    lines.append(f"sustainapp_pool_latency_seconds_total {pool['latency_seconds']:.6f}")
+
+    cache = memo.store().stats()
+    for name in ("hits", "misses", "stores", "evictions"):
+        lines.append(f"# TYPE sustainapp_memo_{name}_total counter")
+        lines.append(f"sustainapp_memo_{name}_total {cache[name]}")
+    for name in ("entries", "bytes", "max_bytes"):
+        lines.append(f"# TYPE sustainapp_memo_{name} gauge")
+        lines.append(f"sustainapp_memo_{name} {cache[name]}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path=METRICS_PATH):
+    """Atomically rewrite the Prometheus text file."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        fh.write(prometheus_text())
+    os.replace(tmp, path)
+
+
+def _maybe_export():
+    global _last_export
+    now = time.monotonic()
+    with _lock:
+        if now - _last_export < METRICS_INTERVAL:
+            return
+        _last_export = now
+    try:
+        write_prometheus()
+    except OSError:
+        pass
+
+
+class SamplingProfiler:
+    """Sample one thread's Python stack from a background thread."""
+
+    def __init__(self, thread_id, interval=PROFILE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.tree = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            ours = []
+            while frame is not None:
+                code = frame.f_code
+                filename = code.co_filename
+                ours.append(filename.startswith(ROOT))
+                if ours[-1]:
+                    filename = os.path.relpath(filename, ROOT)
+                else:
+                    filename = filename.rpartition("site-packages" + os.sep)[2]
+                stack.append(f"{code.co_name} ({filename}:{frame.f_lineno})")
+                frame = frame.f_back
+            # Start the tree at the page script, skipping Streamlit's runner
+            stack.reverse()
+            ours.reverse()
+            start = ours.index(True) if True in ours else 0
+            node = self.tree
+            for label in stack[start:]:
+                entry = node.setdefault(label, [0, {}])
+                entry[0] += 1
+                node = entry[1]
+            self.samples += 1
+
+    def render(self, min_share=0.01):
+        """Return the call tree as indented text, hiding tiny branches."""
+        lines = [f"{self.samples} samples every {self.interval * 1000:g} ms"]
+
+        def walk(node, depth):
+            for label, (count, children) in sorted(node.items(), key=lambda kv: -kv[1][0]):
+                if count < self.samples * min_share:
+                    continue
+                lines.append(f"{'  ' * depth}{count / self.samples:6.1%}  {label}")
+                walk(children, depth + 1)
+
+        if self.samples:
+            walk(self.tree, 0)
+        return "\n".join(lines)
+
+
+class RerunTimer:
+    """Times one whole rerun; see instrument_rerun()."""
+
+    def __init__(self, page):
+        self.page = page
+        self.profiler = None
+        if st.query_params.get("profile") == "1" and admin.is_admin():
+            self.profiler = SamplingProfiler(threading.get_ident())
+            self.profiler.start()
+        self.start = time.perf_counter()
+
+    def finish(self):
+        """Record the rerun and, when profiling, show the call tree."""
+        record(self.page, "total", time.perf_counter() - self.start)
+        if self.profiler is not None:
+            self.profiler.stop()
+            with st.expander("🔬 Rerun profile", expanded=True):
+                st.code(self.profiler.render(), language=None)
+        _maybe_export()
+
+
+def start_rerun(page):
+    """Start timing a script rerun; call finish() on the result at the end."""
+    return RerunTimer(page)
+
+
+@contextmanager
+def instrument_rerun(page):
+    """Time the body as a whole rerun, profiling it for an admin whose URL has ``?profile=1``."""
+    timer = start_rerun(page)
+    try:
+        yield
+    finally:
+        if timer.profiler is not None:
+            timer.profiler.stop()
+    # Not reached when the rerun is interrupted (st.rerun, st.switch_page)
+    timer.finish()
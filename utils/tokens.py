@@ -0,0 +1,134 @@
+"""Signed progress tokens carried in the URL.
+
+The completion flags and best scores for every system are packed into a
+short token kept in the ``p`` query parameter, so any server behind a load
+balancer can restore a student's progress from the request alone; no sticky
+sessions and no shared session memory are needed.
+
+Token layout, before URL-safe base64 without padding:
+
+    version (1 byte) | completed bitmask (1 bit per system) | score per system
+    (1 byte each, catalog order) | HMAC-SHA256 tag (first 12 bytes)
+
+The tag also covers the catalog keys, so a token from a different catalog
+fails verification instead of restoring scores onto the wrong systems, and
+the user id from the ``uid`` query parameter, so a classmate's token opened
+in another student's session fails too instead of copying their progress
+under that student's id. The id is signed but not carried in the token;
+the URL already holds it. All workers must share the secret: set
+SUSTAINAPP_TOKEN_SECRET. Without it a random secret is generated once into
+data/.token_secret, which is only shared by servers running from the same
+checkout.
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+
+import streamlit as st
+
+QUERY_PARAM = "p"
+VERSION = 2  # 2: the tag covers the user id
+TAG_BYTES = 12
+
+SECRET_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", ".token_secret"
+)
+
+_secret = None
+_secret_lock = threading.Lock()
+
+
+def _get_secret():
+    global _secret
+    with _secret_lock:
+        if _secret is None:
+            env = os.environ.get("SUSTAINAPP_TOKEN_SECRET")
+            if env:
+                _secret = env.encode()
+            else:
+                try:
+                    with open(SECRET_PATH, "rb") as fh:
+                        _secret = fh.read()
+                except FileNotFoundError:
+                    _secret = secrets.token_bytes(32)
+                    # O_EXCL so two workers starting together agree on one secret
+                    try:
+                        fd = os.open(SECRET_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+                    except FileExistsError:
+                        with open(SECRET_PATH, "rb") as fh:
+                            _secret = fh.read()
+                    else:
+                        with os.fdopen(fd, "wb") as fh:
+                            fh.write(_secret)
+        return _secret
+
+
+def _tag(catalog, user_id, payload):
+    keys = ",".join(s.key for s in catalog).encode()
+    message = keys + b"\0" + user_id.encode() + b"\0" + payload
+    return hmac.new(_get_secret(), message, hashlib.sha256).digest()[:TAG_BYTES]
+
+
+def encode_token(catalog, progress, user_id):
+    """Pack {key: (score, completed)} into a URL-safe token signed for ``user_id``."""
+    mask = 0
+    scores = bytearray()
+    for i, system in enumerate(catalog):
+        score, completed = progress.get(system.key, (0, False))
+        if completed:
+            mask |= 1 << i
+        scores.append(max(0, min(int(score), 100)))
+    payload = bytes([VERSION]) + mask.to_bytes((len(catalog) + 7) // 8, "little") + bytes(scores)
+    return base64.urlsafe_b64encode(payload + _tag(catalog, user_id, payload)).rstrip(b"=").decode("ascii")
+
+
+def decode_token(catalog, token, user_id):
+    """Return {key: (score, completed)}, or None if the token is invalid or not ``user_id``'s."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (binascii.Error, ValueError):
+        return None
+
+    mask_bytes = (len(catalog) + 7) // 8
+    if len(raw) != 1 + mask_bytes + len(catalog) + TAG_BYTES:
+        return None
+    payload, tag = raw[:-TAG_BYTES], raw[-TAG_BYTES:]
+    if payload[0] != VERSION or not hmac.compare_digest(tag, _tag(catalog, user_id, payload)):
+        return None
+
+    mask = int.from_bytes(payload[1:1 + mask_bytes], "little")
+    scores = payload[1 + mask_bytes:]
+    progress = {}
+    for i, system in enumerate(catalog):
+        if scores[i] > 100:
+            return None
+        progress[system.key] = (scores[i], bool(mask >> i & 1))
+    return progress
+
+
+def session_progress(catalog):
+    return {
+        s.key: (st.session_state[f"{s.key}_score"], st.session_state[f"{s.key}_completed"])
+        for s in catalog
+    }
+
+
+def read_token(catalog, user_id):
+    """Progress from this request's ``p`` query parameter, if it verifies for ``user_id``."""
+    token = st.query_params.get(QUERY_PARAM)
+    return decode_token(catalog, token, user_id) if token else None
+
+
+def write_token(catalog, user_id):
+    """Keep the ``p`` query parameter in step with session progress."""
+    progress = session_progress(catalog)
+    if not any(score or completed for score, completed in progress.values()):
+        return
+    token = encode_token(catalog, progress, user_id)
+    if st.query_params.get(QUERY_PARAM) != token:
+        st.query_params[QUERY_PARAM] = token
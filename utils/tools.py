@@ -0,0 +1,700 @@
+"""Interactive engineering tools shown on the system pages.
+
+Each tool is a fragment taking the EnergySystem, so dragging its sliders
+reruns only the tool. Pages pass their tools to render_system_page(), which
+shows them after the deep dive.
+"""
+
+import functools
+import os
+import tempfile
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils import blend, charts, digester, dispatch, hydro, ingest, mppt, penstock, pv, tables, wake, wind
+from utils.timing import section, timed
+
+
+def _line_spec(field, title, color):
+    return {
+        "mark": {"type": "line", "color": color},
+        "encoding": {
+            "x": {"field": "v", "type": "quantitative", "title": "Voltage (V)"},
+            "y": {"field": field, "type": "quantitative", "title": title},
+        },
+        "height": 260,
+    }
+
+
+@st.fragment
+@timed("iv tool")
+def render_iv_tool(system):
+    module = pv.DEFAULT_MODULE
+    st.markdown("### 📈 I-V and P-V Curves")
+    st.caption(f"Single-diode model of a {module.name} module, solved with the Lambert W function.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        irradiance = st.slider("☀️ Irradiance (W/m²)", 0, 1200, 1000, step=int(pv.G_STEP))
+    with col2:
+        temp_c = st.slider("🌡️ Cell temperature (°C)", -10.0, 75.0, 25.0, step=pv.T_STEP)
+
+    # Precomputed table when built (scripts/build_tables.py), else the solver
+    v, i, point = tables.pv_curve(irradiance, temp_c) or pv.cached_curve(irradiance, temp_c)
+
+    cols = st.columns(6)
+    cols[0].metric("Voc", f"{point['voc']:.2f} V")
+    cols[1].metric("Isc", f"{point['isc']:.2f} A")
+    cols[2].metric("Vmp", f"{point['vmp']:.2f} V")
+    cols[3].metric("Imp", f"{point['imp']:.2f} A")
+    cols[4].metric("Pmp", f"{point['pmp']:.1f} W")
+    cols[5].metric("Fill factor", f"{point['ff']:.3f}")
+
+    # Plain Vega-Lite specs: st.line_chart builds them through Altair, which
+    # costs far more than the solve itself on every slider move
+    curves = pd.DataFrame({"v": v, "i": i, "p": v * i})
+    col1, col2 = st.columns(2)
+    with col1:
+        st.vega_lite_chart(curves, _line_spec("i", "Current (A)", "#2196F3"), use_container_width=True)
+    with col2:
+        st.vega_lite_chart(curves, _line_spec("p", "Power (W)", "#FF9800"), use_container_width=True)
+
+    with st.expander("🗺️ Maximum power over irradiance and temperature"):
+        irradiances = np.arange(200, 1201, 200)
+        temps = np.arange(0, 76, 15)
+        grid = pv.cached_sweep(tuple(irradiances), tuple(temps))
+        table = pd.DataFrame(
+            np.round(grid["pmp"], 1),
+            index=pd.Index([f"{g} W/m²" for g in irradiances], name="Irradiance"),
+            columns=[f"{t} °C" for t in temps],
+        )
+        st.dataframe(table, use_container_width=True)
+
+
+@st.fragment
+@timed("mppt tool")
+def render_mppt_tool(system):
+    st.markdown("### 🎯 MPPT Algorithm Comparison")
+    st.caption(
+        "Each algorithm tracks the same module through a synthetic year of 1-minute "
+        "irradiance and temperature (525,600 steps)."
+    )
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        cloudiness = st.slider("☁️ Cloudiness", 0.0, 0.6, 0.3, step=0.05)
+    with col2:
+        latitude = st.slider("🧭 Latitude (°)", 0.0, 60.0, 40.0, step=5.0)
+    with col3:
+        step_v = st.select_slider("📏 Perturbation step (V)", [0.05, 0.1, 0.2, 0.5, 1.0], value=0.2)
+    uploaded = st.file_uploader(
+        "📂 Or use a measured year: TMY-style CSV with GHI and air temperature", type=["csv", "txt"],
+        key="mppt_upload",
+    )
+
+    dataset = None
+    if uploaded is not None:
+        try:
+            data = ingest.ingest_upload(uploaded, "solar")
+        except (OSError, ValueError) as exc:
+            st.error(f"❌ Could not read the file: {exc}")
+            return
+        if not data.rows:
+            st.error("❌ No numeric irradiance values found in the file.")
+            return
+        dataset = data.path
+        st.caption(f"{data.rows:,} samples every {data.step_minutes:g} min; cloudiness and latitude are not used.")
+
+    if not st.toggle("▶️ Run the year-long simulation", key="mppt_run"):
+        return
+
+    progress = st.progress(0.0, text="Simulating...")
+    results = mppt.year_results(
+        0, cloudiness, latitude, step_v,
+        on_progress=lambda fraction, _: progress.progress(fraction, text=f"Simulating... {fraction:.0%}"),
+        dataset=dataset,
+    )
+    progress.empty()
+
+    table = pd.DataFrame({
+        "Algorithm": [r.algorithm for r in results],
+        "Harvested (kWh)": [round(r.energy_kwh, 1) for r in results],
+        "Lost (kWh)": [round(r.lost_kwh, 2) for r in results],
+        "Tracking efficiency (%)": [round(r.efficiency * 100, 2) for r in results],
+        "Typical claim (%)": [mppt.CLAIMED_EFFICIENCY[r.algorithm] * 100 for r in results],
+    })
+    st.markdown(f"**Available energy:** {results[0].available_kwh:.1f} kWh per module per year")
+    st.dataframe(table, use_container_width=True, hide_index=True)
+
+    irradiance, _ = mppt.year_for(0, round(cloudiness, 3), round(latitude, 1), dataset)
+    minutes = np.arange(irradiance.size)
+    charts.line_chart(minutes / mppt.MINUTES_PER_DAY, {"Irradiance": irradiance.ravel()}, "mppt_year",
+                      "Day of year", "Irradiance (W/m²)", method="minmax", colors={"Irradiance": "#FFC107"})
+
+    days = irradiance.shape[0]
+    day = st.slider("📅 Day of year to inspect", 1, days, min(172, days)) - 1
+    power, available = mppt.cached_day_trace(
+        0, round(cloudiness, 3), round(latitude, 1), day, round(step_v, 3), dataset,
+    )
+    hours = np.arange(mppt.MINUTES_PER_DAY) / 60
+    trace = pd.DataFrame({"hour": hours, "MPP": available, **dict(zip(mppt.ALGORITHMS, power))})
+    trace = trace[available > 0].melt("hour", var_name="series", value_name="power")
+    st.vega_lite_chart(trace, {
+        "mark": {"type": "line", "strokeWidth": 1},
+        "encoding": {
+            "x": {"field": "hour", "type": "quantitative", "title": "Hour of day"},
+            "y": {"field": "power", "type": "quantitative", "title": "Power (W)"},
+            "color": {"field": "series", "type": "nominal", "title": None},
+        },
+        "height": 300,
+    }, use_container_width=True)
+
+
+@st.fragment
+@timed("wind tool")
+def render_wind_tool(system):
+    st.markdown("### 🌬️ Power Curve and Annual Energy")
+
+    base = wind.DEFAULT_TURBINE
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        rated_kw = st.slider("⚡ Rated power (kW)", 1500, 3000, int(base.rated_kw), step=100)
+        rotor = st.slider("🔄 Rotor diameter (m)", 60, 120, int(base.rotor_diameter), step=2)
+    with col2:
+        cut_in = st.slider("🟢 Cut-in speed (m/s)", 2.0, 5.0, base.cut_in, step=0.5)
+        cut_out = st.slider("🔴 Cut-out speed (m/s)", 20.0, 30.0, base.cut_out, step=1.0)
+    with col3:
+        k = st.slider("📐 Weibull shape k", 1.2, 3.5, 2.0, step=0.1)
+        c = st.slider("📏 Weibull scale c (m/s)", 4.0, 12.0, 8.0, step=0.25)
+
+    # Rated speed is where the rotor first reaches rated power
+    turbine = wind.Turbine(rated_kw=float(rated_kw), rotor_diameter=float(rotor), cut_in=cut_in, cut_out=cut_out)
+    turbine = replace(turbine, rated_speed=round(wind.rated_speed_for(turbine), 2))
+
+    aep, capacity_factor = wind.weibull_aep(k, c, turbine)
+    cols = st.columns(3)
+    cols[0].metric("Rated speed", f"{turbine.rated_speed:.1f} m/s")
+    cols[1].metric("AEP (Weibull)", f"{aep:,.0f} MWh")
+    cols[2].metric("Capacity factor", f"{capacity_factor:.1%}")
+
+    speeds = np.arange(0, 30.01, 0.1)
+    power, rotor_cp, pitch = wind.power_curve(speeds, turbine, tables.pitch_for_cp)
+    curve = pd.DataFrame({"speed": speeds, "power": power, "pitch": pitch})
+    tsr = np.linspace(1, 14, 131)
+    cp_curves = pd.DataFrame(
+        [(x, f"β = {b}°", y) for b in (0, 5, 10, 15, 20) for x, y in zip(tsr, wind.cp(tsr, b))],
+        columns=["tsr", "pitch", "cp"],
+    )
+    col1, col2 = st.columns(2)
+    with col1:
+        st.vega_lite_chart(curve, {
+            "layer": [
+                {"mark": {"type": "line", "color": "#2196F3"},
+                 "encoding": {"y": {"field": "power", "type": "quantitative", "title": "Power (kW)"}}},
+                {"mark": {"type": "line", "color": "#FF9800", "strokeDash": [4, 3]},
+                 "encoding": {"y": {"field": "pitch", "type": "quantitative", "title": "Pitch (°)"}}},
+            ],
+            "encoding": {"x": {"field": "speed", "type": "quantitative", "title": "Wind speed (m/s)"}},
+            "resolve": {"scale": {"y": "independent"}},
+            "height": 280,
+        }, use_container_width=True)
+    with col2:
+        st.vega_lite_chart(cp_curves, {
+            "mark": "line",
+            "encoding": {
+                "x": {"field": "tsr", "type": "quantitative", "title": "Tip speed ratio λ"},
+                "y": {"field": "cp", "type": "quantitative", "title": "Cp"},
+                "color": {"field": "pitch", "type": "nominal", "title": None},
+            },
+            "height": 280,
+        }, use_container_width=True)
+
+    with st.expander("📂 AEP from a measured wind speed series"):
+        uploaded = st.file_uploader(
+            "Wind speeds at hub height: CSV log, .npy array or raw float32 file",
+            type=["csv", "txt", "npy", "f32", "bin"],
+        )
+        step_minutes = st.number_input("⏱️ Sample interval (minutes)", 1.0, 60.0, 10.0, step=1.0)
+        if uploaded is not None:
+            tmp = None
+            try:
+                if uploaded.name.endswith((".csv", ".txt")):
+                    # Parsed once per file content; later runs map the cached column
+                    data = ingest.ingest_upload(uploaded, "wind")
+                    series = data["speed"]
+                    if data.source["step_inferred"]:
+                        step_minutes = data.step_minutes
+                else:
+                    suffix = ".npy" if uploaded.name.endswith(".npy") else ".f32"
+                    # Spool to disk so the series is read through a memory map
+                    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+                        for block in iter(lambda: uploaded.read(1 << 20), b""):
+                            tmp.write(block)
+                    series = wind.open_series(tmp.name)
+                stats = wind.series_aep(series, step_minutes, turbine)
+                fit_k, fit_c = wind.fit_weibull(series)
+                del series
+            except (OSError, ValueError) as exc:
+                st.error(f"❌ Could not read the series: {exc}")
+            else:
+                cols = st.columns(4)
+                cols[0].metric("Years of data", f"{stats['years']:.2f}")
+                cols[1].metric("Mean speed", f"{stats['mean_speed']:.2f} m/s")
+                cols[2].metric("AEP (series)", f"{stats['aep_mwh']:,.0f} MWh")
+                cols[3].metric("Capacity factor", f"{stats['capacity_factor']:.1%}")
+                st.caption(f"Fitted Weibull: k = {fit_k:.2f}, c = {fit_c:.2f} m/s")
+            finally:
+                if tmp is not None:
+                    os.unlink(tmp.name)
+
+
+@st.fragment
+@timed("farm tool")
+def render_farm_tool(system):
+    st.markdown("### 🗺️ Wind Farm Wake Losses")
+    st.caption("Jensen (Park) wake model over a 36-sector wind rose with 20 speed bins.")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        rows = st.slider("↕️ Rows", 1, 20, 5)
+        cols = st.slider("↔️ Turbines per row", 1, 25, 8)
+    with col2:
+        spacing_x = st.slider("📏 Spacing along rows (rotor diameters)", 3.0, 12.0, 7.0, step=0.5)
+        spacing_y = st.slider("📏 Spacing between rows (rotor diameters)", 3.0, 12.0, 5.0, step=0.5)
+    with col3:
+        prevailing = st.slider("🧭 Prevailing wind from (°)", 0, 350, 270, step=10)
+        site = st.radio("🌊 Site", ["Onshore", "Offshore"], horizontal=True)
+
+    decay = wake.DECAY_ONSHORE if site == "Onshore" else wake.DECAY_OFFSHORE
+    layout = wake.grid_layout(rows, cols, spacing_x, spacing_y)
+    rose = wake.weibull_rose(prevailing=prevailing)
+    result = wake.farm_aep(layout, rose, decay=decay)
+
+    metrics = st.columns(4)
+    metrics[0].metric("Turbines", f"{len(layout)}")
+    metrics[1].metric("Gross AEP", f"{result.gross_mwh / 1000:,.1f} GWh")
+    metrics[2].metric("Net AEP", f"{result.net_mwh / 1000:,.1f} GWh")
+    metrics[3].metric("Wake loss", f"{result.wake_loss:.1%}")
+
+    turbines = pd.DataFrame({
+        "x": layout[:, 0],
+        "y": layout[:, 1],
+        "efficiency": np.round(result.turbine_efficiency * 100, 1),
+    })
+    st.vega_lite_chart(turbines, {
+        "mark": {"type": "circle", "size": 80},
+        "encoding": {
+            "x": {"field": "x", "type": "quantitative", "title": "East (m)"},
+            "y": {"field": "y", "type": "quantitative", "title": "North (m)"},
+            "color": {"field": "efficiency", "type": "quantitative", "title": "Efficiency (%)",
+                      "scale": {"scheme": "redyellowgreen"}},
+            "tooltip": [{"field": "efficiency", "type": "quantitative"}],
+        },
+        "height": 320,
+    }, use_container_width=True)
+
+
+@st.fragment
+@timed("hydro tool")
+def render_hydro_tool(system):
+    st.markdown("### 🏞️ Reservoir Operation and Turbine Sizing")
+    st.caption("Daily water balance over the whole inflow record, simulated for every design flow at once.")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        capacity = st.slider("🪣 Reservoir capacity (hm³)", 200, 3000, 800, step=50)
+        guide = st.slider("📉 Guide level (share of active storage)", 0.1, 0.8, 0.4, step=0.05)
+    with col2:
+        head_max = st.slider("⬆️ Head at full reservoir (m)", 50, 200, 120, step=5)
+        drawdown = st.slider("⬇️ Head lost at dead storage (m)", 5, 80, 50, step=5)
+    with col3:
+        years = st.slider("📅 Synthetic record (years)", 10, 60, 30, step=5)
+        mean_flow = st.slider("🌊 Mean inflow (m³/s)", 100, 1000, 300, step=25)
+
+    reservoir = hydro.Reservoir(
+        capacity_hm3=float(capacity),
+        dead_storage_hm3=round(capacity * 0.2, 1),
+        head_max=float(head_max),
+        head_min=float(max(head_max - drawdown, 10)),
+        guide_level=guide,
+    )
+    uploaded = st.file_uploader(
+        "📂 Or use a daily inflow CSV (a flow/discharge column with units, or m³/s in the last column)",
+        type=["csv", "txt"],
+    )
+
+    if uploaded is None:
+        source = ("synthetic", years, mean_flow, 0)
+        result = hydro.cached_sweep(
+            source, functools.partial(hydro.synthetic_chunks, years, float(mean_flow), 0),
+            hydro.DESIGN_FLOWS, reservoir,
+        )
+    else:
+        # Parsed once per file content into a memory-mapped column
+        try:
+            data = ingest.ingest_upload(uploaded, "inflow")
+        except (OSError, ValueError) as exc:
+            st.error(f"❌ Could not read the file: {exc}")
+            return
+        chunks = functools.partial(ingest.column_chunks, data.path, "flow", hydro.CHUNK_DAYS, interpolate=True)
+        result = hydro.cached_sweep(os.path.basename(data.path), chunks, hydro.DESIGN_FLOWS, reservoir)
+        if not result.days:
+            st.error("❌ No numeric inflow values found in the file.")
+            return
+
+    choice = st.select_slider(
+        "🌀 Design flow (m³/s)", options=[int(q) for q in result.design_flow], value=int(result.design_flow[3]),
+    )
+    k = int(np.flatnonzero(result.design_flow == choice)[0])
+    metrics = st.columns(4)
+    metrics[0].metric("Installed capacity", f"{result.installed_mw[k]:,.0f} MW")
+    metrics[1].metric("Annual energy", f"{result.annual_gwh[k]:,.0f} GWh")
+    metrics[2].metric("Capacity factor", f"{result.capacity_factor[k]:.1%}")
+    metrics[3].metric("Spilled inflow", f"{result.spill_share[k]:.1%}")
+
+    sweep = pd.DataFrame({
+        "design": result.design_flow,
+        "energy": np.round(result.annual_gwh, 1),
+        "cf": np.round(result.capacity_factor * 100, 1),
+    })
+    fdc = pd.DataFrame({"exceedance": result.fdc_exceedance * 100, "flow": result.fdc_flow})
+    col1, col2 = st.columns(2)
+    with col1:
+        st.vega_lite_chart(sweep, {
+            "layer": [
+                {"mark": {"type": "line", "color": "#2196F3", "point": True},
+                 "encoding": {"y": {"field": "energy", "type": "quantitative", "title": "Annual energy (GWh)"}}},
+                {"mark": {"type": "line", "color": "#FF9800", "strokeDash": [4, 3]},
+                 "encoding": {"y": {"field": "cf", "type": "quantitative", "title": "Capacity factor (%)"}}},
+            ],
+            "encoding": {"x": {"field": "design", "type": "quantitative", "title": "Design flow (m³/s)"}},
+            "resolve": {"scale": {"y": "independent"}},
+            "height": 280,
+        }, use_container_width=True)
+    with col2:
+        st.vega_lite_chart(fdc, {
+            "mark": {"type": "line", "color": "#009688"},
+            "encoding": {
+                "x": {"field": "exceedance", "type": "quantitative", "title": "Time exceeded (%)"},
+                "y": {"field": "flow", "type": "quantitative", "title": "Inflow (m³/s)", "scale": {"type": "log"}},
+            },
+            "height": 280,
+        }, use_container_width=True)
+
+    if uploaded is None:
+        inflow = hydro.cached_inflow(years, float(mean_flow), 0)
+        charts.line_chart(np.arange(len(inflow)) / 365.25, {"Inflow": inflow}, "hydro_inflow",
+                          "Years", "Daily inflow (m³/s)", colors={"Inflow": "#1E88E5"}, height=220)
+
+    storage = pd.DataFrame({
+        "week": np.arange(len(result.weekly_storage)),
+        "storage": result.weekly_storage[:, k],
+    })
+    st.vega_lite_chart(storage, {
+        "mark": {"type": "area", "color": "#64B5F6", "opacity": 0.6},
+        "encoding": {
+            "x": {"field": "week", "type": "quantitative", "title": "Week"},
+            "y": {"field": "storage", "type": "quantitative", "title": "Storage (hm³)",
+                  "scale": {"domain": [0, reservoir.capacity_hm3]}},
+        },
+        "height": 220,
+    }, use_container_width=True)
+
+
+@st.fragment
+@timed("penstock tool")
+def render_penstock_tool(system):
+    st.markdown("### 🚰 Penstock and Turbine Selection")
+    st.caption("Darcy-Weisbach losses with the Colebrook friction factor over a 1000 × 100 × 10 "
+               "diameter × flow × length grid; turbine type from the unit specific speed.")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        gross_head = st.slider("⛰️ Gross head (m)", 50, 200, 120, step=5)
+        material = st.radio("🧱 Penstock material", list(penstock.ROUGHNESS), horizontal=True)
+    with col2:
+        units = st.slider("🔢 Turbine-generator units", 1, 8, 4)
+        speed = st.select_slider(
+            "🔁 Synchronous speed (rpm, 50 Hz)",
+            options=[round(penstock.synchronous_speed(p), 1) for p in range(60, 6, -4)], value=214.3,
+        )
+    with col3:
+        length = st.select_slider("📏 Penstock length (m)", options=[int(x) for x in penstock.LENGTHS], value=1000)
+        view = st.radio("🗺️ Heatmap", ["Power (MW)", "Head loss (%)", "Turbine type"], horizontal=True)
+
+    poles = int(round(120 * penstock.GRID_FREQUENCY / speed))
+    grid = penstock.cached_grid(float(gross_head), material, 1.5, units, poles, tables.friction_factor)
+    k = int(np.searchsorted(grid.lengths, length))
+
+    pressure = penstock.static_pressure_bar(gross_head)
+    limit = penstock.min_diameter(grid, gross_head)[:, k]
+    metrics = st.columns(3)
+    metrics[0].metric("Static pressure at turbine", f"{pressure:.1f} bar")
+    metrics[1].metric("Grid points evaluated", f"{grid.net_head.size:,}")
+    metrics[2].metric("Flows servable at < 5% loss", f"{np.isfinite(limit).mean():.0%}")
+    if not 5 <= pressure <= 20:
+        st.warning("⚠️ Static pressure is outside the 5-20 bar penstock rating.")
+
+    # Every 20th diameter and 2nd flow: 50 × 50 cells is plenty for a heatmap
+    d_idx, q_idx = np.arange(0, len(grid.diameters), 20), np.arange(0, len(grid.flows), 2)
+    dd, qq = np.meshgrid(grid.diameters[d_idx], grid.flows[q_idx], indexing="ij")
+    ii = np.ix_(d_idx, q_idx)
+    names = np.array([name for name, _, _ in penstock.TURBINES] + ["None"])
+    cells = pd.DataFrame({
+        "diameter": np.round(dd.ravel(), 2),
+        "flow": np.round(qq.ravel(), 0),
+        "power": np.round(grid.power_mw[ii][..., k].ravel(), 1),
+        "loss": np.round(grid.head_loss[ii][..., k].ravel() / gross_head * 100, 1).clip(max=100),
+        "turbine": names[grid.turbine[ii][..., k].ravel()],
+    })
+    field, kind, title = {
+        "Power (MW)": ("power", "quantitative", "Power (MW)"),
+        "Head loss (%)": ("loss", "quantitative", "Head loss (%)"),
+        "Turbine type": ("turbine", "nominal", "Turbine"),
+    }[view]
+    st.vega_lite_chart(cells, {
+        "mark": "rect",
+        "encoding": {
+            "x": {"field": "flow", "type": "ordinal", "title": "Flow (m³/s)",
+                  "axis": {"values": [int(q) for q in grid.flows[q_idx][::5].round()]}},
+            "y": {"field": "diameter", "type": "ordinal", "title": "Diameter (m)", "sort": "descending",
+                  "axis": {"values": [float(d) for d in grid.diameters[d_idx][::5].round(2)]}},
+            "color": {"field": field, "type": kind, "title": title},
+            "tooltip": [{"field": name, "type": "nominal" if name == "turbine" else "quantitative"}
+                        for name in ("diameter", "flow", "power", "loss", "turbine")],
+        },
+        "height": 360,
+    }, use_container_width=True)
+
+
+@st.fragment
+@timed("digester tool")
+def render_digester_tool(system):
+    st.markdown("### 🦠 Digester Kinetics")
+    st.caption("First-order hydrolysis feeding Haldane methanogenesis in a stirred digester, "
+               "from inoculation to steady state.")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        feedstock = st.selectbox("🌽 Feedstock", list(digester.FEEDSTOCKS))
+    with col2:
+        temperature = st.slider("🌡️ Temperature (°C)", 15, 65, 37)
+        hrt = st.slider("⏳ Retention time HRT (days)", 5, 40, 20)
+    with col3:
+        feed = st.slider("🚛 Slurry feed (tonnes/day)", 10, 500, 100, step=10)
+
+    scenario = digester.Scenario(feedstock, float(temperature), float(hrt), float(feed))
+    result = digester.sweep([scenario])[0]
+    eta_d = result.digester_efficiency
+
+    metrics = st.columns(4)
+    metrics[0].metric("Digester volume", f"{result.volume:,.0f} m³")
+    metrics[1].metric("Biogas", f"{result.steady(result.biogas):,.0f} m³/day")
+    metrics[2].metric("Electrical output", f"{result.steady(result.power_kw):,.0f} kW")
+    metrics[3].metric("Gas yield", f"{result.yield_per_tonne_vs:,.0f} m³/t VS")
+    st.caption(
+        f"ηoverall = ηdigester × ηengine × ηgenerator = {eta_d:.0%} × "
+        f"{digester.ENGINE_EFFICIENCY:.0%} × {digester.GENERATOR_EFFICIENCY:.0%} = {result.overall_efficiency:.1%}"
+    )
+    if result.steady(result.acids) > 2:
+        st.warning("⚠️ Acids are accumulating: methanogens are inhibited or washed out at this temperature and HRT.")
+
+    trace = pd.DataFrame({"day": result.time, "biogas": result.biogas, "power": result.power_kw})
+    st.vega_lite_chart(trace, {
+        "layer": [
+            {"mark": {"type": "line", "color": "#4CAF50"},
+             "encoding": {"y": {"field": "biogas", "type": "quantitative", "title": "Biogas (m³/day)"}}},
+            {"mark": {"type": "line", "color": "#FF9800", "strokeDash": [4, 3]},
+             "encoding": {"y": {"field": "power", "type": "quantitative", "title": "Electrical (kW)"}}},
+        ],
+        "encoding": {"x": {"field": "day", "type": "quantitative", "title": "Days since start-up"}},
+        "resolve": {"scale": {"y": "independent"}},
+        "height": 260,
+    }, use_container_width=True)
+
+    if not st.toggle("🧮 Sweep temperature × HRT for this feedstock"):
+        return
+    temperatures = np.arange(15, 66, 5)
+    hrts = np.arange(5, 41, 5)
+    scenarios = [digester.Scenario(feedstock, float(t), float(h), float(feed)) for t in temperatures for h in hrts]
+    bar = st.progress(0.0, text="Simulating...")
+    results = digester.sweep(scenarios, on_progress=lambda done, total: bar.progress(done / total))
+    bar.empty()
+    cells = pd.DataFrame({
+        "temperature": [r.scenario.temperature for r in results],
+        "hrt": [r.scenario.hrt for r in results],
+        "power": [round(r.steady(r.power_kw)) for r in results],
+    })
+    st.vega_lite_chart(cells, {
+        "mark": "rect",
+        "encoding": {
+            "x": {"field": "hrt", "type": "ordinal", "title": "HRT (days)"},
+            "y": {"field": "temperature", "type": "ordinal", "title": "Temperature (°C)", "sort": "descending"},
+            "color": {"field": "power", "type": "quantitative", "title": "Electrical (kW)"},
+            "tooltip": [{"field": name, "type": "quantitative"} for name in ("temperature", "hrt", "power")],
+        },
+        "height": 300,
+    }, use_container_width=True)
+
+
+@st.fragment
+@timed("blend tool")
+def render_blend_tool(system):
+    st.markdown("### 🧺 Feedstock Blending")
+    st.caption("Least-cost blend meeting the Feedstock Preparation spec (C/N 25-30:1, moisture 40-60%, "
+               "pH 6.8-7.2), solved as a linear program. Edit the library to try your own feedstocks.")
+
+    base = blend.DEFAULT_LIBRARY
+    library = st.data_editor(pd.DataFrame({
+        "name": base.names, "carbon": base.carbon, "nitrogen": base.nitrogen, "moisture": base.moisture,
+        "ph": base.ph, "methane": base.methane, "cost": base.cost, "available": base.available,
+    }), num_rows="dynamic", hide_index=True, column_config={
+        "name": "Feedstock",
+        "carbon": st.column_config.NumberColumn("C (kg/t)", min_value=0.0),
+        "nitrogen": st.column_config.NumberColumn("N (kg/t)", min_value=0.0),
+        "moisture": st.column_config.NumberColumn("Moisture", min_value=0.0, max_value=1.0),
+        "ph": st.column_config.NumberColumn("pH", min_value=0.0, max_value=14.0),
+        "methane": st.column_config.NumberColumn("CH₄ (m³/t)", min_value=0.0),
+        "cost": st.column_config.NumberColumn("Cost ($/t)"),
+        "available": st.column_config.NumberColumn("Available (t/day)", min_value=0.0),
+    }, key="blend_library")
+    library = blend.Library.from_records(library.dropna().to_dict("records"))
+
+    col1, col2 = st.columns(2)
+    with col1:
+        demand = st.slider("🚛 Blend demand (tonnes/day)", 10, 500, 100, step=10)
+    with col2:
+        methane_value = st.slider("💰 Value of methane ($/m³ CH₄)", 0.0, 1.0, 0.3, step=0.05)
+
+    try:
+        result = blend.solve(library, float(demand), methane_value)
+    except blend.Infeasible as exc:
+        st.error(f"❌ {exc}")
+        return
+
+    metrics = st.columns(5)
+    metrics[0].metric("Feed cost", f"${result.cost:,.0f}/day")
+    metrics[1].metric("Methane", f"{result.methane:,.0f} m³/day")
+    metrics[2].metric("C/N", f"{result.cn_ratio:.1f}:1")
+    metrics[3].metric("Moisture", f"{result.moisture:.0%}")
+    metrics[4].metric("pH", f"{result.ph:.2f}")
+    used = result.tonnes > 1e-6
+    st.dataframe(pd.DataFrame({
+        "Feedstock": np.array(library.names)[used],
+        "Tonnes/day": np.round(result.tonnes[used], 2),
+        "Share": [f"{share:.1%}" for share in result.tonnes[used] / demand],
+    }), hide_index=True, use_container_width=True)
+
+    # Demand scenarios solved as one warm-started batch
+    demands = np.linspace(10, max(float(library.available.sum()), 20.0), 60)
+    blends = blend.solve_batch(library, demands, methane_value)
+    curve = pd.DataFrame([
+        {"demand": b.demand, "cost": b.cost / b.demand, "methane": b.methane / b.demand}
+        for b in blends if b is not None
+    ])
+    if curve.empty:
+        return
+    st.vega_lite_chart(curve, {
+        "layer": [
+            {"mark": {"type": "line", "color": "#795548"},
+             "encoding": {"y": {"field": "cost", "type": "quantitative", "title": "Cost ($/t of blend)"}}},
+            {"mark": {"type": "line", "color": "#4CAF50", "strokeDash": [4, 3]},
+             "encoding": {"y": {"field": "methane", "type": "quantitative", "title": "CH₄ (m³/t of blend)"}}},
+        ],
+        "encoding": {"x": {"field": "demand", "type": "quantitative", "title": "Demand (tonnes/day)"}},
+        "resolve": {"scale": {"y": "independent"}},
+        "height": 260,
+    }, use_container_width=True)
+    st.caption(f"{sum(b is not None for b in blends)} of {len(blends)} demand scenarios are feasible.")
+
+
+@st.fragment
+def render_dispatch_tool():
+    """Home page tool: one year of hourly dispatch for a mix of all four systems."""
+    with section("app", "dispatch tool"):
+        st.caption("8760-hour dispatch against a 100 MW peak load: solar and wind first, then battery, "
+                   "hydro from its reservoir and biomass; costs from the catalog LCOE ranges.")
+        base = dispatch.Mix()
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            solar_mw = st.slider("☀️ Solar (MW)", 0, 300, int(base.solar_mw), step=5)
+            wind_mw = st.slider("🌪️ Wind (MW)", 0, 300, int(base.wind_mw), step=5)
+        with col2:
+            hydro_mw = st.slider("💧 Hydro (MW)", 0, 100, int(base.hydro_mw), step=5)
+            biomass_mw = st.slider("🌱 Biomass (MW)", 0, 100, int(base.biomass_mw), step=5)
+        with col3:
+            battery_mw = st.slider("🔋 Battery power (MW)", 0, 100, int(base.battery_mw), step=5)
+            battery_mwh = st.slider("🔋 Battery energy (MWh)", 0, 600, int(base.battery_mwh), step=10)
+
+        mix = dispatch.Mix(float(solar_mw), float(wind_mw), float(hydro_mw), float(biomass_mw),
+                           float(battery_mw), float(battery_mwh))
+        result = dispatch.dispatch(mix, hourly=True)
+        metrics = st.columns(4)
+        metrics[0].metric("Unmet load", f"{result.unmet_share[0]:.2%}")
+        metrics[1].metric("Curtailed", f"{result.curtailed[0] / result.load[0]:.1%} of load")
+        metrics[2].metric("Blended LCOE", f"${result.lcoe[0]:,.0f}/MWh")
+        metrics[3].metric("Battery losses", f"{result.battery_losses[0]:,.0f} MWh")
+
+        week = st.slider("📅 Week of the year", 1, 52, 2)
+        hours = slice((week - 1) * 168, week * 168)
+        names = {"solar": "Solar", "wind": "Wind", "hydro": "Hydro", "biomass": "Biomass", "battery": "Battery"}
+        frames = [
+            pd.DataFrame({"hour": np.arange(168), "source": label,
+                          "mw": np.maximum(result.hourly[key][hours, 0], 0)})
+            for key, label in names.items()
+        ]
+        load = pd.DataFrame({"hour": np.arange(168), "load": result.hourly["load"][hours, 0]})
+        st.vega_lite_chart(pd.concat(frames), {
+            "layer": [
+                {"mark": {"type": "area"},
+                 "encoding": {
+                     "y": {"field": "mw", "type": "quantitative", "stack": True, "title": "MW"},
+                     "color": {"field": "source", "type": "nominal", "title": None,
+                               "scale": {"domain": list(names.values()),
+                                         "range": ["#FFC107", "#03A9F4", "#3F51B5", "#4CAF50", "#9C27B0"]}},
+                 }},
+                {"data": {"values": load.to_dict("records")},
+                 "mark": {"type": "line", "color": "black", "strokeDash": [4, 3]},
+                 "encoding": {"y": {"field": "load", "type": "quantitative"}}},
+            ],
+            "encoding": {"x": {"field": "hour", "type": "quantitative", "title": "Hour of the week"}},
+            "height": 280,
+        }, use_container_width=True)
+
+        st.markdown("**📈 The whole year**")
+        hourly = result.hourly
+        charts.line_chart(np.arange(dispatch.HOURS), {
+            "Load": hourly["load"][:, 0],
+            "Solar + wind": hourly["solar"][:, 0] + hourly["wind"][:, 0],
+            "Unmet": hourly["unmet"][:, 0],
+        }, "dispatch_year", "Hour of the year", "MW",
+            colors={"Load": "black", "Solar + wind": "#03A9F4", "Unmet": "#F44336"})
+
+        if not st.toggle("🎲 Search 2,000 random capacity mixes"):
+            return
+        mixes, batch = dispatch.cached_search(2000)
+        best = dispatch.cheapest(batch, max_unmet=0.01)
+        scatter = pd.DataFrame({
+            "unmet": np.round(batch.unmet_share * 100, 2),
+            "lcoe": np.round(batch.lcoe, 1),
+        })
+        st.vega_lite_chart(scatter, {
+            "mark": {"type": "circle", "size": 12, "opacity": 0.5},
+            "encoding": {
+                "x": {"field": "unmet", "type": "quantitative", "title": "Unmet load (%)", "scale": {"type": "symlog"}},
+                "y": {"field": "lcoe", "type": "quantitative", "title": "Blended LCOE ($/MWh)"},
+            },
+            "height": 260,
+        }, use_container_width=True)
+        if best is None:
+            st.info("No sampled mix serves 99% of the load.")
+            return
+        st.success(
+            f"🏆 Cheapest mix serving 99% of load: ${batch.lcoe[best]:,.0f}/MWh with "
+            f"{mixes['solar_mw'][best]:.0f} MW solar, {mixes['wind_mw'][best]:.0f} MW wind, "
+            f"{mixes['hydro_mw'][best]:.0f} MW hydro, {mixes['biomass_mw'][best]:.0f} MW biomass and a "
+            f"{mixes['battery_mw'][best]:.0f} MW / {mixes['battery_mwh'][best]:.0f} MWh battery."
+        )
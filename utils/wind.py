@@ -0,0 +1,228 @@
+"""Wind turbine power curve and annual energy production (AEP).
+
+The power curve follows P = ½ρAV³Cp from the Wind page spec box: nothing
+below cut-in, optimal tip speed ratio tracking up to rated speed, pitch
+control holding rated power up to cut-out. Cp(λ, β) is the Heier / Slootweg
+analytical surface, and the pitch angle above rated speed is solved from it
+with a vectorized bisection.
+
+AEP comes either from a Weibull distribution (k, c) integrated over speed
+bins, or from a wind-speed time series. Series are read from a .npy file,
+raw float32 or a CSV log (cached as .npy by utils.ingest) through a memory
+map in fixed-size chunks, and each chunk
+is converted with one np.interp against a fine tabulated power curve, so
+memory stays flat however many years of 10-minute data the file holds.
+"""
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from utils import ingest
+
+HOURS_PER_YEAR = 8760.0
+CHUNK_SAMPLES = 1 << 20
+CURVE_STEP = 0.01  # m/s resolution of the tabulated power curve
+
+# Heier / Slootweg Cp(λ, β) coefficients
+C1, C2, C3, C4, C5, C6 = 0.5176, 116.0, 0.4, 5.0, 21.0, 0.0068
+
+
+@dataclass(frozen=True, slots=True)
+class Turbine:
+    """Turbine parameters; the defaults are the Wind page spec box.
+
+    An 80 m rotor at Cp_max reaches 2.4 MW right at the 12 m/s rated speed.
+    """
+
+    rated_kw: float = 2400.0
+    rotor_diameter: float = 80.0
+    hub_height: float = 100.0
+    cut_in: float = 3.0
+    rated_speed: float = 12.0
+    cut_out: float = 25.0
+    air_density: float = 1.225
+    drivetrain_efficiency: float = 0.94
+
+    @property
+    def swept_area(self):
+        return math.pi * self.rotor_diameter ** 2 / 4
+
+
+DEFAULT_TURBINE = Turbine()
+
+
+def cp(tsr, pitch):
+    """Power coefficient Cp(λ, β) for tip speed ratio λ and pitch β in degrees."""
+    tsr = np.asarray(tsr, dtype=np.float64)
+    pitch = np.asarray(pitch, dtype=np.float64)
+    inv = 1 / (tsr + 0.08 * pitch) - 0.035 / (pitch ** 3 + 1)
+    return np.maximum(C1 * (C2 * inv - C3 * pitch - C4) * np.exp(-C5 * inv) + C6 * tsr, 0.0)
+
+
+@lru_cache(maxsize=1)
+def optimal_tsr():
+    """(λ_opt, Cp_max) at zero pitch, from a fine grid."""
+    tsr = np.linspace(2, 14, 12001)
+    values = cp(tsr, 0.0)
+    best = values.argmax()
+    return float(tsr[best]), float(values[best])
+
+
+def rated_speed_for(turbine):
+    """Wind speed (m/s) where the rotor at Cp_max first reaches rated power."""
+    _, cp_max = optimal_tsr()
+    half_rho_a = 0.5 * turbine.air_density * turbine.swept_area
+    return (turbine.rated_kw * 1000 / (half_rho_a * cp_max * turbine.drivetrain_efficiency)) ** (1 / 3)
+
+
+def pitch_for_cp(tsr, target, max_pitch=45.0, iterations=40):
+    """Pitch angle giving Cp(λ, β) = target; Cp falls as β grows."""
+    lo = np.zeros(np.broadcast(tsr, target).shape)
+    hi = np.full_like(lo, max_pitch)
+    for _ in range(iterations):
+        mid = (lo + hi) / 2
+        above = cp(tsr, mid) > target
+        lo = np.where(above, mid, lo)
+        hi = np.where(above, hi, mid)
+    return (lo + hi) / 2
+
+
+def power_curve(speeds, turbine=DEFAULT_TURBINE, pitch_solver=pitch_for_cp):
+    """Electrical power (kW), rotor Cp and pitch (degrees) at each wind speed.
+
+    Below rated speed the rotor runs at λ_opt and β = 0. Above it the rotor
+    holds the speed it reaches at rated wind, and the pitch is opened until
+    the captured power equals rated power. ``pitch_solver(tsr, cp)`` only
+    affects the pitch output (e.g. utils.tables.pitch_for_cp).
+    """
+    v = np.asarray(speeds, dtype=np.float64)
+    tsr_opt, cp_max = optimal_tsr()
+    half_rho_a = 0.5 * turbine.air_density * turbine.swept_area
+    eta = turbine.drivetrain_efficiency
+
+    running = (v >= turbine.cut_in) & (v <= turbine.cut_out)
+    aero_kw = half_rho_a * v ** 3 * cp_max * eta / 1000
+    power = np.where(running, np.minimum(aero_kw, turbine.rated_kw), 0.0)
+
+    # Above rated: fixed rotor speed, so λ falls as 1/V
+    v_rated = np.maximum(v, 1e-6)
+    tsr = tsr_opt * turbine.rated_speed / v_rated
+    needed = turbine.rated_kw * 1000 / (half_rho_a * v_rated ** 3 * eta)
+    pitched = running & (aero_kw > turbine.rated_kw)
+    pitch = np.where(pitched, pitch_solver(tsr, needed), 0.0)
+    rotor_cp = np.where(running, np.where(pitched, needed, cp_max), 0.0)
+    return power, rotor_cp, pitch
+
+
+@lru_cache(maxsize=32)
+def curve_table(turbine=DEFAULT_TURBINE, max_speed=40.0):
+    """Power curve tabulated every CURVE_STEP m/s, for np.interp lookups."""
+    speeds = np.arange(0.0, max_speed + CURVE_STEP, CURVE_STEP)
+    power = power_curve(speeds, turbine)[0]
+    # Step edges exactly at cut-in and cut-out instead of interpolating a ramp
+    speeds = np.concatenate([speeds, [turbine.cut_in - 1e-9, turbine.cut_out + 1e-9]])
+    power = np.concatenate([power, [0.0, 0.0]])
+    order = np.argsort(speeds, kind="stable")
+    speeds, power = speeds[order], power[order]
+    speeds.setflags(write=False)
+    power.setflags(write=False)
+    return speeds, power
+
+
+def power_at(speeds, turbine=DEFAULT_TURBINE):
+    """Fast power lookup (kW) through the tabulated curve."""
+    table_v, table_p = curve_table(turbine)
+    return np.interp(speeds, table_v, table_p, right=0.0)
+
+
+def shear(speeds, measured_height, hub_height, alpha=0.143):
+    """Power-law extrapolation of measured speeds to hub height."""
+    return np.asarray(speeds) * (hub_height / measured_height) ** alpha
+
+
+def weibull_aep(k, c, turbine=DEFAULT_TURBINE, bin_width=0.05, max_speed=40.0):
+    """AEP (MWh) and capacity factor for Weibull shape ``k`` and scale ``c`` (m/s)."""
+    edges = np.arange(0.0, max_speed + bin_width, bin_width)
+    cdf = 1 - np.exp(-(edges / c) ** k)
+    probability = np.diff(cdf)
+    centres = (edges[:-1] + edges[1:]) / 2
+    mean_kw = float((power_at(centres, turbine) * probability).sum())
+    aep_mwh = mean_kw * HOURS_PER_YEAR / 1000
+    return aep_mwh, mean_kw / turbine.rated_kw
+
+
+def open_series(path):
+    """Memory-map a wind speed series: .npy, a CSV log, or raw little-endian float32."""
+    if str(path).endswith((".csv", ".txt")):
+        return ingest.ingest(path, "wind")["speed"]
+    if str(path).endswith(".npy"):
+        series = np.load(path, mmap_mode="r")
+    else:
+        series = np.memmap(path, dtype="<f4", mode="r")
+    if series.ndim != 1:
+        series = series.reshape(-1)
+    return series
+
+
+def series_aep(series, step_minutes=10.0, turbine=DEFAULT_TURBINE, chunk=CHUNK_SAMPLES,
+               measured_height=None, alpha=0.143):
+    """Energy statistics for a wind speed series, processed chunk by chunk.
+
+    ``series`` is any 1-D array, typically from open_series(). Missing values
+    (NaN) are skipped and the yield is scaled to a full year by the share of
+    valid samples. Returns a dict with aep_mwh, capacity_factor, mean_speed,
+    valid_samples and years covered.
+    """
+    step_hours = step_minutes / 60
+    energy_kwh = 0.0
+    speed_sum = 0.0
+    valid = 0
+    for start in range(0, len(series), chunk):
+        block = np.asarray(series[start:start + chunk], dtype=np.float64)
+        ok = np.isfinite(block) & (block >= 0)
+        block = block[ok]
+        if measured_height is not None:
+            block = shear(block, measured_height, turbine.hub_height, alpha)
+        energy_kwh += float(power_at(block, turbine).sum()) * step_hours
+        speed_sum += float(block.sum())
+        valid += int(block.size)
+
+    hours = valid * step_hours
+    if not hours:
+        return {"aep_mwh": 0.0, "capacity_factor": 0.0, "mean_speed": 0.0, "valid_samples": 0, "years": 0.0}
+    mean_kw = energy_kwh / hours
+    return {
+        "aep_mwh": mean_kw * HOURS_PER_YEAR / 1000,
+        "capacity_factor": mean_kw / turbine.rated_kw,
+        "mean_speed": speed_sum / valid,
+        "valid_samples": valid,
+        "years": len(series) * step_hours / HOURS_PER_YEAR,
+    }
+
+
+def fit_weibull(series, chunk=CHUNK_SAMPLES, measured_height=None, hub_height=None, alpha=0.143):
+    """Weibull (k, c) from the series mean and standard deviation (Justus).
+
+    With ``measured_height`` the speeds are first sheared to ``hub_height``,
+    as in series_aep(), so the fit describes the wind the rotor sees.
+    """
+    total = total_sq = 0.0
+    count = 0
+    for start in range(0, len(series), chunk):
+        block = np.asarray(series[start:start + chunk], dtype=np.float64)
+        block = block[np.isfinite(block) & (block >= 0)]
+        if measured_height is not None:
+            block = shear(block, measured_height, hub_height, alpha)
+        total += float(block.sum())
+        total_sq += float((block ** 2).sum())
+        count += block.size
+    if count < 2:
+        raise ValueError("need at least two valid wind speeds")
+    mean = total / count
+    std = math.sqrt(max(total_sq / count - mean ** 2, 1e-12))
+    k = (std / mean) ** -1.086
+    c = mean / math.gamma(1 + 1 / k)
+    return k, c
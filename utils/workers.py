@@ -0,0 +1,197 @@
+"""Process-wide simulation pool with single-flight request coalescing.
+
+Heavy model runs (digester sweeps, reservoir sweeps, dispatch searches) go
+to one bounded ProcessPoolExecutor shared by every session in the server
+process, instead of running in each session's script thread where they
+hold the GIL and serialize everyone's reruns.
+
+Requests are keyed by the function and its arguments, with floats
+quantized to SIGNIFICANT_DIGITS so slider values that differ only in float
+noise share a key; the function then runs on the quantized arguments. A
+request whose key is already in flight gets the existing Future instead of
+a new job, so 30 sessions on the same slider position cost one computation
+and all receive its result. The shared result must be treated as
+read-only. Finished jobs leave the in-flight table at once: reusing
+results is the job of each module's own cache.
+
+SUSTAINAPP_WORKERS sets the pool size (default: CPU count, at most 4); 0
+runs jobs in the calling thread, still coalesced. The pool starts with the
+first job and is shut down when the process exits, including processes
+started by multiprocessing. stats() reports queue depth and counters for
+the admin page and the Prometheus file.
+"""
+
+import atexit
+import dataclasses
+import functools
+import hashlib
+import multiprocessing
+import multiprocessing.util
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+MAX_WORKERS = int(os.environ.get("SUSTAINAPP_WORKERS", min(os.cpu_count() or 1, 4)))
+SIGNIFICANT_DIGITS = 6
+
+_lock = threading.Lock()
+_pool = None
+_pool_size = MAX_WORKERS
+_exit_hooked = False
+_inflight = {}  # key -> Future
+_counters = {"submitted": 0, "coalesced": 0, "completed": 0, "failed": 0, "peak_in_flight": 0}
+_latency_seconds = 0.0
+
+
+def quantize(value, digits=SIGNIFICANT_DIGITS):
+    """Round floats (also inside tuples, lists, dicts and dataclasses) to ``digits`` significant digits."""
+    if isinstance(value, (bool, int, str, bytes)) or value is None:
+        return value
+    if isinstance(value, (float, np.floating)):
+        return float(f"{float(value):.{digits}g}")
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, (tuple, list)):
+        return type(value)(quantize(v, digits) for v in value)
+    if isinstance(value, dict):
+        return {k: quantize(v, digits) for k, v in value.items()}
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.replace(value, **{
+            f.name: quantize(getattr(value, f.name), digits) for f in dataclasses.fields(value) if f.init
+        })
+    return value
+
+
+def _freeze(value):
+    """Hashable stand-in for an argument; arrays are keyed by their content."""
+    if isinstance(value, np.ndarray):
+        digest = hashlib.sha1(np.ascontiguousarray(value).view(np.uint8)).hexdigest()
+        return ("ndarray", value.dtype.str, value.shape, digest)
+    if isinstance(value, (tuple, list)):
+        return (type(value).__name__, *(_freeze(v) for v in value))
+    if isinstance(value, dict):
+        return ("dict", *sorted((k, _freeze(v)) for k, v in value.items()))
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return (type(value).__qualname__,
+                *((f.name, _freeze(getattr(value, f.name))) for f in dataclasses.fields(value)))
+    if isinstance(value, functools.partial):
+        return request_key(value.func, value.args, value.keywords)
+    return value
+
+
+def request_key(fn, args=(), kwargs=None):
+    if isinstance(fn, functools.partial):
+        return ("partial", _freeze(fn), _freeze(args), _freeze(kwargs or {}))
+    return (fn.__module__, fn.__qualname__, _freeze(args), _freeze(kwargs or {}))
+
+
+def configure(max_workers):
+    """Set the pool size; a running pool is replaced once its jobs finish."""
+    global _pool, _pool_size
+    with _lock:
+        old, _pool, _pool_size = _pool, None, max(int(max_workers), 0)
+    if old is not None:
+        old.shutdown(wait=False)
+
+
+def _executor():
+    global _pool, _exit_hooked
+    if _pool is None and _pool_size > 0:
+        # spawn: forking a threaded Streamlit server can deadlock the child
+        _pool = ProcessPoolExecutor(_pool_size, mp_context=multiprocessing.get_context("spawn"))
+        if not _exit_hooked:
+            # Idle workers wait for jobs forever, and exit waits for them. A
+            # multiprocessing child joins its children before atexit runs, so
+            # it needs the finalizer, ahead of the pool's queues closing
+            # theirs (priority 10); a plain interpreter runs the atexit hook
+            multiprocessing.util.Finalize(None, shutdown, exitpriority=20)
+            atexit.register(shutdown)
+            _exit_hooked = True
+    return _pool
+
+
+def _finished(key, started):
+    def callback(future):
+        global _latency_seconds
+        with _lock:
+            if _inflight.get(key) is future:
+                del _inflight[key]
+            _counters["failed" if future.cancelled() or future.exception() else "completed"] += 1
+            _latency_seconds += time.perf_counter() - started
+    return callback
+
+
+def submit_keyed(key, fn, *args, **kwargs):
+    """Run ``fn(*args, **kwargs)`` in the pool, sharing any in-flight job with the same ``key``."""
+    global _pool
+    with _lock:
+        future = _inflight.get(key)
+        if future is not None:
+            _counters["coalesced"] += 1
+            return future
+        _counters["submitted"] += 1
+        pool = _executor()
+        if pool is not None:
+            try:
+                future = pool.submit(fn, *args, **kwargs)
+            except BrokenProcessPool:
+                # A worker died (e.g. out of memory); start a fresh pool
+                _pool = None
+                future = _executor().submit(fn, *args, **kwargs)
+        else:
+            future = Future()
+        _inflight[key] = future
+        _counters["peak_in_flight"] = max(_counters["peak_in_flight"], len(_inflight))
+    future.add_done_callback(_finished(key, time.perf_counter()))
+
+    if pool is None and future.set_running_or_notify_cancel():
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+    return future
+
+
+def submit(fn, *args, **kwargs):
+    """Coalesced pool job for ``fn`` on quantized arguments; returns a Future.
+
+    ``fn`` and its arguments must be picklable: module-level functions and
+    functools.partial of them, not lambdas.
+    """
+    args, kwargs = quantize(args), quantize(kwargs)
+    return submit_keyed(request_key(fn, args, kwargs), fn, *args, **kwargs)
+
+
+def run(fn, *args, **kwargs):
+    """submit() and wait for the result."""
+    return submit(fn, *args, **kwargs).result()
+
+
+def stats():
+    """Queue depth and counters since the process started."""
+    with _lock:
+        futures = list(_inflight.values())
+        counters = dict(_counters)
+        latency = _latency_seconds
+    running = sum(f.running() for f in futures)
+    return {
+        "workers": _pool_size,
+        "in_flight": len(futures),
+        "running": running,
+        "queued": sum(not f.running() and not f.done() for f in futures),
+        **counters,
+        "latency_seconds": round(latency, 6),  # submit to result, summed over finished jobs
+    }
+
+
+def shutdown(wait=True):
+    """Stop the pool; the next submit() starts a new one."""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait)